@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+
+"""
+Benchmark the stages of voxel and label based graph cuts on synthetic images.
+
+Copyright (C) 2013 Oskar Maier
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# build-in modules
+import argparse
+import logging
+import os
+from argparse import RawTextHelpFormatter
+
+# own modules
+from medpy.core import ArgumentError, Logger
+from medpy.graphcut.benchmark import run_benchmarks
+
+# information
+__author__ = "Oskar Maier"
+__version__ = "r0.1.0, 2026-10-16"
+__email__ = "oskar.maier@googlemail.com"
+__status__ = "Release"
+__description__ = """
+                  Benchmark the graph cut implementation on synthetic images.
+
+                  For each of the supplied image shapes, a voxel based and a label
+                  based graph cut are executed. The time spent in the graph
+                  construction, the computation of the energy terms and the
+                  max-flow computation is measured separately, as well as the peak
+                  memory of each stage. The results are written as JSON.
+
+                  Copyright (C) 2013 Oskar Maier
+                  This program comes with ABSOLUTELY NO WARRANTY; This is free software,
+                  and you are welcome to redistribute it under certain conditions; see
+                  the LICENSE file or <http://www.gnu.org/licenses/> for details.
+                  """
+
+
+# code
+def main():
+    args = getArguments(getParser())
+
+    # prepare logger
+    logger = Logger.getInstance()
+    if args.debug:
+        logger.setLevel(logging.DEBUG)
+    elif args.verbose:
+        logger.setLevel(logging.INFO)
+
+    # check if output file exists
+    if not args.force:
+        if os.path.exists(args.output):
+            logger.warning(
+                "The output file {} already exists. Exiting.".format(args.output)
+            )
+            exit(-1)
+
+    logger.info("Running benchmarks for shapes {}...".format(args.shapes))
+    run_benchmarks(
+        shapes=args.shapes,
+        region_size=args.region_size,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        filename=args.output,
+    )
+
+    logger.info("Successfully terminated.")
+
+
+def getArguments(parser):
+    "Provides additional validation of the arguments collected by argparse."
+    args = parser.parse_args()
+    try:
+        args.shapes = [tuple(int(s) for s in shape.split("x")) for shape in args.shapes]
+    except ValueError:
+        raise ArgumentError(
+            "The shapes have to be given as e.g. 64x64x64, got {}.".format(args.shapes)
+        )
+    return args
+
+
+def getParser():
+    "Creates and returns the argparse parser object."
+    parser = argparse.ArgumentParser(
+        description=__description__, formatter_class=RawTextHelpFormatter
+    )
+    parser.add_argument("output", help="The JSON file to write the results to.")
+    parser.add_argument(
+        "--shapes",
+        nargs="+",
+        default=["32x32x32", "64x64x64"],
+        help="The shapes of the synthetic images, e.g. 64x64x64.",
+    )
+    parser.add_argument(
+        "--region-size",
+        dest="region_size",
+        type=int,
+        default=4,
+        help="The edge length of the regions of the label based benchmarks.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="The number of runs per benchmark; the fastest time is reported.",
+    )
+    parser.add_argument(
+        "--no-memory",
+        dest="no_memory",
+        action="store_true",
+        help="Set this flag to skip the additional run measuring the peak memory.",
+    )
+    parser.add_argument(
+        "-f",
+        dest="force",
+        action="store_true",
+        help="Set this flag to silently override files that exist.",
+    )
+    parser.add_argument(
+        "-v", dest="verbose", action="store_true", help="Display more information."
+    )
+    parser.add_argument(
+        "-d", dest="debug", action="store_true", help="Display debug information."
+    )
+
+    return parser
+
+
+if __name__ == "__main__":
+    main()
@@ -4,20 +4,126 @@
 	Yuri Boykov and Vladimir Kolmogorov. Simply wraps the constructor in a version not
 	taking an exception class pointer to avoid problems with the boost:python wrapper.
 
+	Additionally provides bulk versions of the edge adding methods, which read their
+	arguments from objects exposing the Python buffer protocol (e.g. numpy arrays)
+	instead of requiring one Python call per edge, and allows to reuse the search trees
+	of a previous max-flow computation.
+
 	Author: Oskar Maier
 */
 
 #ifndef __PYTHON_GRAPH_H__
 #define __PYTHON_GRAPH_H__
 
+#include <cstring>
+#include <boost/python.hpp>
 #include "graph.h"
 
+/**
+	View on a one-dimensional, C-contiguous buffer of a fixed item type, read-only
+	unless requested writable. The buffer is released again when the view goes out of
+	scope.
+*/
+template <typename T>
+class Buffer
+{
+public:
+	Buffer(boost::python::object obj, char format, const char* name, bool writable = false)
+	{
+		int flags = PyBUF_C_CONTIGUOUS | PyBUF_FORMAT | (writable ? PyBUF_WRITABLE : 0);
+		if (PyObject_GetBuffer(obj.ptr(), &view, flags) != 0)
+			boost::python::throw_error_already_set();
+		size_t length = view.format ? strlen(view.format) : 0;
+		if (view.itemsize != sizeof(T) || length == 0 || view.format[length - 1] != format)
+		{
+			PyBuffer_Release(&view);
+			PyErr_Format(PyExc_TypeError, "%s must be a contiguous buffer of item type '%c'.", name, format);
+			boost::python::throw_error_already_set();
+		}
+	};
+	~Buffer() { PyBuffer_Release(&view); };
+	Py_ssize_t size() const { return view.len / view.itemsize; };
+	T operator[](Py_ssize_t i) const { return static_cast<const T*>(view.buf)[i]; };
+	void set(Py_ssize_t i, T value) { static_cast<T*>(view.buf)[i] = value; };
+private:
+	Buffer(const Buffer&);
+	Buffer& operator=(const Buffer&);
+	Py_buffer view;
+};
+
 template <typename captype, typename tcaptype, typename flowtype>
 class Pythongraph : public Graph<captype, tcaptype, flowtype>
 {
 public:
-	Pythongraph(int node_num_max, int edge_num_max) : Graph<captype, tcaptype, flowtype>(node_num_max, edge_num_max, NULL) {};
-	flowtype maxflow() { Graph<captype, tcaptype, flowtype>::maxflow(); };
-	typename Graph<captype, tcaptype, flowtype>::termtype what_segment(int i) { Graph<captype, tcaptype, flowtype>::what_segment(i); };
+	Pythongraph(int node_num_max, int edge_num_max) : Graph<captype, tcaptype, flowtype>(node_num_max, edge_num_max, NULL), computed(false) {};
+	// Search trees can only be reused from a previous computation, hence reuse_trees
+	// is ignored in the first call instead of terminating the process.
+	flowtype maxflow(bool reuse_trees = false)
+	{
+		flowtype flow = Graph<captype, tcaptype, flowtype>::maxflow(reuse_trees && computed);
+		computed = true;
+		return flow;
+	};
+	void reset() { Graph<captype, tcaptype, flowtype>::reset(); computed = false; };
+	typename Graph<captype, tcaptype, flowtype>::termtype what_segment(int i) { return Graph<captype, tcaptype, flowtype>::what_segment(i); };
+
+	// Calls sum_edge(i[k], j[k], cap[k], rev_cap[k]) for all k. The node ids have to
+	// be passed as int32 and the capacities as float64 buffers of the same length.
+	void sum_edges(boost::python::object i, boost::python::object j, boost::python::object cap, boost::python::object rev_cap)
+	{
+		Buffer<int> is(i, 'i', "i"), js(j, 'i', "j");
+		Buffer<double> caps(cap, 'd', "cap"), rev_caps(rev_cap, 'd', "rev_cap");
+		Py_ssize_t n = is.size();
+		if (js.size() != n || caps.size() != n || rev_caps.size() != n)
+		{
+			PyErr_SetString(PyExc_ValueError, "i, j, cap and rev_cap must be of the same length.");
+			boost::python::throw_error_already_set();
+		}
+		for (Py_ssize_t k = 0; k < n; ++k)
+			this->sum_edge(is[k], js[k], static_cast<captype>(caps[k]), static_cast<captype>(rev_caps[k]));
+	};
+
+	// Calls add_tweights(i[k], cap_source[k], cap_sink[k]) for all k. The node ids
+	// have to be passed as int32 and the capacities as float64 buffers of the same
+	// length.
+	void add_tweights_array(boost::python::object i, boost::python::object cap_source, boost::python::object cap_sink)
+	{
+		Buffer<int> is(i, 'i', "i");
+		Buffer<double> cap_sources(cap_source, 'd', "cap_source"), cap_sinks(cap_sink, 'd', "cap_sink");
+		Py_ssize_t n = is.size();
+		if (cap_sources.size() != n || cap_sinks.size() != n)
+		{
+			PyErr_SetString(PyExc_ValueError, "i, cap_source and cap_sink must be of the same length.");
+			boost::python::throw_error_already_set();
+		}
+		for (Py_ssize_t k = 0; k < n; ++k)
+			this->add_tweights(is[k], static_cast<tcaptype>(cap_sources[k]), static_cast<tcaptype>(cap_sinks[k]));
+	};
+
+	// Calls mark_node(i[k]) for all k. The node ids have to be passed as int32 buffer.
+	void mark_nodes(boost::python::object i)
+	{
+		Buffer<int> is(i, 'i', "i");
+		for (Py_ssize_t k = 0; k < is.size(); ++k)
+			this->mark_node(is[k]);
+	};
+
+	// Sets segments[k] to what_segment(k) for all k, i.e. to 0 for nodes belonging
+	// to the source and to 1 for nodes belonging to the sink. The segments have to be
+	// passed as writable uint8 buffer of at most the number of nodes.
+	void what_segments(boost::python::object segments)
+	{
+		Buffer<unsigned char> ss(segments, 'B', "segments", true);
+		if (ss.size() > this->get_node_num())
+		{
+			PyErr_SetString(PyExc_ValueError, "segments must not be longer than the number of nodes.");
+			boost::python::throw_error_already_set();
+		}
+		for (Py_ssize_t k = 0; k < ss.size(); ++k)
+			ss.set(k, static_cast<unsigned char>(Graph<captype, tcaptype, flowtype>::what_segment(static_cast<int>(k))));
+	};
+
+private:
+	bool computed; // whether maxflow() has been called since the initialization or the last reset()
 };
 #endif
@@ -11,15 +11,15 @@ typedef Pythongraph<int, int, int> GraphInt;
 
 // Create thin-wrappers for overloading/default arguments
 BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(GraphDouble_add_node_overload, maxflow, 0, 1)
-BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(GraphDouble_maxflow_overload, maxflow, 0, 2)
+BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(GraphDouble_maxflow_overload, maxflow, 0, 1)
 BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(GraphDouble_what_segment_overload, what_segment, 1, 2)
 
 BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(GraphFloat_add_node_overload, maxflow, 0, 1)
-BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(GraphFloat_maxflow_overload, maxflow, 0, 2)
+BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(GraphFloat_maxflow_overload, maxflow, 0, 1)
 BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(GraphFloat_what_segment_overload, what_segment, 1, 2)
 
 BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(GraphInt_add_node_overload, maxflow, 0, 1)
-BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(GraphInt_maxflow_overload, maxflow, 0, 2)
+BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(GraphInt_maxflow_overload, maxflow, 0, 1)
 BOOST_PYTHON_MEMBER_FUNCTION_OVERLOADS(GraphInt_what_segment_overload, what_segment, 1, 2)
 
 
@@ -32,8 +32,10 @@ void wrap_scopegraphfloat()
         .def("add_node", &GraphFloat::add_node/*, GraphFloat_add_node_overload()*/) // "Add one or more nodes to the graph and returns the id of the first such created node. The total number of added nodes should never exceed the max node number passed to the initializer. Only nodes added with this function can be referenced in methods such as add_edge and add_tweights."
         .def("add_edge", &GraphFloat::add_edge, "Add an edge from i to j with the capacity cap and reversed capacity rev_cap. Node ids start from 0. Repeated calls lead to the addition of multiple arcs and therefore the allocate memory can be exceeded.")
         .def("sum_edge", &GraphFloat::sum_edge, "Add an edge from i to j with the capacity cap and reversed capacity rev_cap. Node ids start from 0. Repeated calls are summed to already existing edge weights. Requires less memory, but is slightly slower.")
+        .def("sum_edges", &GraphFloat::sum_edges, "Bulk version of sum_edge: adds the edges i[k]->j[k] with capacities cap[k] and rev_cap[k] for all k. Takes four buffers (e.g. numpy arrays) of the same length, the node ids of dtype int32 and the capacities of dtype float64.")
         .def("add_tweights", &GraphFloat::add_tweights, "Add a terminal weight from cap_source to i and from i to cap_sink. Can be called multiple times (add to the existing weights).")
-        .def("maxflow", &GraphFloat::maxflow/*, GraphFloat_maxflow_overload()*/, "Compute the min-cut/max-flow of the graph and return the maxflow value.")
+        .def("add_tweights_array", &GraphFloat::add_tweights_array, "Bulk version of add_tweights: adds the terminal weights cap_source[k] and cap_sink[k] to node i[k] for all k. Takes three buffers (e.g. numpy arrays) of the same length, the node ids of dtype int32 and the capacities of dtype float64.")
+        .def("maxflow", &GraphFloat::maxflow, GraphFloat_maxflow_overload(args("reuse_trees"), "Compute the min-cut/max-flow of the graph and return the maxflow value. If reuse_trees is True, the search trees of the previous computation are reused, which requires all nodes whose terminal weights or edges have changed since to be marked with mark_node. Ignored in the first call."))
         .def("what_segment", &GraphFloat::what_segment/*, GraphFloat_what_segment_overload()*/, "Returns the terminal the node i belongs to after executing the min-cut/max-flow. Returns either GraphFloat::SOURCE or GraphFloat::SINK.")
         .def("reset", &GraphFloat::reset, "Reset the whole graph to the state just after initialization. Save some time against deleting and creating a new one.")
 		.def("get_edge", &GraphFloat::get_edge, "Returns the weight of the directed edge i->j between two node. If not yet set, returns 0. If more than one arc, returns the weight of the first encountered.")
@@ -47,6 +49,8 @@ void wrap_scopegraphfloat()
         .def("set_trcap", &GraphFloat::set_trcap)
         .def("set_rcap", &GraphFloat::set_rcap)
         .def("mark_node", &GraphFloat::mark_node)
+        .def("what_segments", &GraphFloat::what_segments, "Bulk version of what_segment: sets segments[k] to the terminal node k belongs to after executing the min-cut/max-flow, i.e. to 0 for GraphFloat::SOURCE and to 1 for GraphFloat::SINK, for all k. Takes a writable buffer (e.g. numpy array) of dtype uint8.")
+        .def("mark_nodes", &GraphFloat::mark_nodes, "Bulk version of mark_node: marks the nodes i[k] for all k as changed. Takes a buffer (e.g. numpy array) of node ids of dtype int32.")
         .def("remove_from_changed_list", &GraphFloat::remove_from_changed_list)
 		;
 
@@ -64,8 +68,10 @@ void wrap_scopegraphdouble()
         .def("add_node", &GraphDouble::add_node/*, GraphDouble_add_node_overload()*/) // "Add one or more nodes to the graph and returns the id of the first such created node. The total number of added nodes should never exceed the max node number passed to the initializer. Only nodes added with this function can be referenced in methods such as add_edge and add_tweights."
         .def("add_edge", &GraphDouble::add_edge, "Add an edge from i to j with the capacity cap and reversed capacity rev_cap. Node ids start from 0. Repeated calls lead to the addition of multiple arcs and therefore the allocate memory can be exceeded.")
         .def("sum_edge", &GraphDouble::sum_edge, "Add an edge from i to j with the capacity cap and reversed capacity rev_cap. Node ids start from 0. Repeated calls are summed to already existing edge weights. Requires less memory, but is slightly slower.")
+        .def("sum_edges", &GraphDouble::sum_edges, "Bulk version of sum_edge: adds the edges i[k]->j[k] with capacities cap[k] and rev_cap[k] for all k. Takes four buffers (e.g. numpy arrays) of the same length, the node ids of dtype int32 and the capacities of dtype float64.")
         .def("add_tweights", &GraphDouble::add_tweights, "Add a terminal weight from cap_source to i and from i to cap_sink. Can be called multiple times (add to the existing weights).")
-        .def("maxflow", &GraphDouble::maxflow/*, GraphDouble_maxflow_overload()*/, "Compute the min-cut/max-flow of the graph and return the maxflow value.")
+        .def("add_tweights_array", &GraphDouble::add_tweights_array, "Bulk version of add_tweights: adds the terminal weights cap_source[k] and cap_sink[k] to node i[k] for all k. Takes three buffers (e.g. numpy arrays) of the same length, the node ids of dtype int32 and the capacities of dtype float64.")
+        .def("maxflow", &GraphDouble::maxflow, GraphDouble_maxflow_overload(args("reuse_trees"), "Compute the min-cut/max-flow of the graph and return the maxflow value. If reuse_trees is True, the search trees of the previous computation are reused, which requires all nodes whose terminal weights or edges have changed since to be marked with mark_node. Ignored in the first call."))
         .def("what_segment", &GraphDouble::what_segment/*, GraphDouble_what_segment_overload()*/, "Returns the terminal the node i belongs to after executing the min-cut/max-flow. Returns either GraphDouble::SOURCE or GraphDouble::SINK.")
         .def("reset", &GraphDouble::reset, "Reset the whole graph to the state just after initialization. Save some time against deleting and creating a new one.")
 		.def("get_edge", &GraphDouble::get_edge, "Returns the weight of the directed edge i->j between two node. If not yet set, returns 0. If more than one arc, returns the weight of the first encountered.")
@@ -79,6 +85,8 @@ void wrap_scopegraphdouble()
         .def("set_trcap", &GraphDouble::set_trcap)
         .def("set_rcap", &GraphDouble::set_rcap)
         .def("mark_node", &GraphDouble::mark_node)
+        .def("what_segments", &GraphDouble::what_segments, "Bulk version of what_segment: sets segments[k] to the terminal node k belongs to after executing the min-cut/max-flow, i.e. to 0 for GraphDouble::SOURCE and to 1 for GraphDouble::SINK, for all k. Takes a writable buffer (e.g. numpy array) of dtype uint8.")
+        .def("mark_nodes", &GraphDouble::mark_nodes, "Bulk version of mark_node: marks the nodes i[k] for all k as changed. Takes a buffer (e.g. numpy array) of node ids of dtype int32.")
         .def("remove_from_changed_list", &GraphDouble::remove_from_changed_list)
     	;
 
@@ -96,8 +104,10 @@ void wrap_scopegraphint()
 		  .def("add_node", &GraphInt::add_node/*, GraphInt_add_node_overload()*/) // "Add one or more nodes to the graph and returns the id of the first such created node. The total number of added nodes should never exceed the max node number passed to the initializer. Only nodes added with this function can be referenced in methods such as add_edge and add_tweights."
 	      .def("add_edge", &GraphInt::add_edge, "Add an edge from i to j with the capacity cap and reversed capacity rev_cap. Node ids start from 0. Repeated calls lead to the addition of multiple arcs and therefore the allocate memory can be exceeded.")
 	      .def("sum_edge", &GraphInt::sum_edge, "Add an edge from i to j with the capacity cap and reversed capacity rev_cap. Node ids start from 0. Repeated calls are summed to already existing edge weights. Requires less memory, but is slightly slower.")
+	      .def("sum_edges", &GraphInt::sum_edges, "Bulk version of sum_edge: adds the edges i[k]->j[k] with capacities cap[k] and rev_cap[k] for all k. Takes four buffers (e.g. numpy arrays) of the same length, the node ids of dtype int32 and the capacities of dtype float64.")
 		  .def("add_tweights", &GraphInt::add_tweights, "Add a terminal weight from cap_source to i and from i to cap_sink. Can be called multiple times (add to the existing weights).")
-		  .def("maxflow", &GraphInt::maxflow/*, GraphInt_maxflow_overload()*/, "Compute the min-cut/max-flow of the graph and return the maxflow value.")
+		  .def("add_tweights_array", &GraphInt::add_tweights_array, "Bulk version of add_tweights: adds the terminal weights cap_source[k] and cap_sink[k] to node i[k] for all k. Takes three buffers (e.g. numpy arrays) of the same length, the node ids of dtype int32 and the capacities of dtype float64.")
+		  .def("maxflow", &GraphInt::maxflow, GraphInt_maxflow_overload(args("reuse_trees"), "Compute the min-cut/max-flow of the graph and return the maxflow value. If reuse_trees is True, the search trees of the previous computation are reused, which requires all nodes whose terminal weights or edges have changed since to be marked with mark_node. Ignored in the first call."))
 		  .def("what_segment", &GraphInt::what_segment/*, GraphInt_what_segment_overload()*/, "Returns the terminal the node i belongs to after executing the min-cut/max-flow. Returns either GraphInt::SOURCE or GraphInt::SINK.")
 		  .def("reset", &GraphInt::reset, "Reset the whole graph to the state just after initialization. Save some time against deleting and creating a new one.")
 		  .def("get_edge", &GraphInt::get_edge, "Returns the weight of the directed edge i->j between two node. If not yet set, returns 0. If more than one arc, returns the weight of the first encountered.")
@@ -111,6 +121,8 @@ void wrap_scopegraphint()
 		  .def("set_trcap", &GraphInt::set_trcap)
 		  .def("set_rcap", &GraphInt::set_rcap)
 		  .def("mark_node", &GraphInt::mark_node)
+		  .def("what_segments", &GraphInt::what_segments, "Bulk version of what_segment: sets segments[k] to the terminal node k belongs to after executing the min-cut/max-flow, i.e. to 0 for GraphInt::SOURCE and to 1 for GraphInt::SINK, for all k. Takes a writable buffer (e.g. numpy array) of dtype uint8.")
+		  .def("mark_nodes", &GraphInt::mark_nodes, "Bulk version of mark_node: marks the nodes i[k] for all k as changed. Takes a buffer (e.g. numpy array) of node ids of dtype int32.")
 		  .def("remove_from_changed_list", &GraphInt::remove_from_changed_list)
 	 	;
 
@@ -29,6 +29,7 @@ Binary image manipulation.
     size_threshold
     largest_connected_component
     bounding_box
+    PackedMask
 
 Image :mod:`medpy.filter.image`
 =================================
@@ -124,6 +125,7 @@ A learning method to align the intensity ranges of images.
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from .binary import PackedMask as PackedMask
 from .binary import bounding_box as bounding_box
 from .binary import largest_connected_component as largest_connected_component
 from .binary import size_threshold as size_threshold
@@ -162,6 +164,7 @@ __all__ = [
     "largest_connected_component",
     "size_threshold",
     "bounding_box",
+    "PackedMask",
     "sls",
     "ssd",
     "average_filter",
@@ -42,7 +42,7 @@ def size_threshold(img, thr, comp="lt", structure=None):
 
     Parameters
     ----------
-    img : array_like
+    img : array_like or PackedMask
         An array containing connected objects. Will be cast to type `bool`.
     thr : int
         Integer defining the threshold size of the binary objects to remove.
@@ -61,18 +61,23 @@ def size_threshold(img, thr, comp="lt", structure=None):
 
     Returns
     -------
-    binary_image : ndarray
+    binary_image : ndarray or PackedMask
         The supplied binary image with all objects removed that positively compare
         to the threshold ``thr`` using the comparison operator defined with ``comp``.
+        A `PackedMask` if ``img`` was one.
 
     Notes
     -----
     If your voxel size is no isotrop i.e. of side-length 1 for all dimensions, simply
     divide the supplied threshold through the real voxel size.
+
+    A `PackedMask` is unpacked for the labelling of the objects, i.e. the memory
+    savings of the packed representation do not apply during the call.
     """
 
     operators = {"lt": lt, "le": le, "gt": gt, "ge": ge, "eq": eq, "ne": ne}
 
+    packed = isinstance(img, PackedMask)
     img = numpy.asarray(img).astype(numpy.bool_)
     if comp not in operators:
         raise ValueError("comp must be one of {}".format(list(operators.keys())))
@@ -84,7 +89,7 @@ def size_threshold(img, thr, comp="lt", structure=None):
         if comp(numpy.count_nonzero(omask), thr):
             img[omask] = False
 
-    return img
+    return PackedMask(img) if packed else img
 
 
 def largest_connected_component(img, structure=None):
@@ -97,7 +102,7 @@ def largest_connected_component(img, structure=None):
 
     Parameters
     ----------
-    img : array_like
+    img : array_like or PackedMask
         An array containing connected objects. Will be cast to type `bool`.
     structure : array_like
         A structuring element that defines the connectivity. Structure must be symmetric.
@@ -106,9 +111,17 @@ def largest_connected_component(img, structure=None):
 
     Returns
     -------
-    binary_image : ndarray
+    binary_image : ndarray or PackedMask
         The supplied binary image with only the largest connected component remaining.
+        A `PackedMask` if ``img`` was one.
+
+    Notes
+    -----
+    A `PackedMask` is unpacked for the labelling of the components, i.e. the memory
+    savings of the packed representation do not apply during the call.
     """
+    packed = isinstance(img, PackedMask)
+    img = numpy.asarray(img)
     labeled_array, num_features = label(img, structure)
     component_sizes = [
         numpy.count_nonzero(labeled_array == label_idx)
@@ -118,7 +131,7 @@ def largest_connected_component(img, structure=None):
 
     out = numpy.zeros(img.shape, numpy.bool_)
     out[labeled_array == largest_component_idx] = True
-    return out
+    return PackedMask(out) if packed else out
 
 
 def bounding_box(img):
@@ -138,3 +151,224 @@ def bounding_box(img):
     mins = locations.min(0)
     maxs = locations.max(0) + 1
     return tuple([slice(x, y) for x, y in zip(mins, maxs)])
+
+
+class PackedMask(object):
+    r"""
+    A binary mask stored bit-packed, i.e. with eight voxels per byte.
+
+    Compared to a `numpy.bool_` array, a packed mask requires only an eighth of the
+    memory. The voxel counts required by the overlap metrics of
+    :mod:`medpy.metric.binary` are obtained by population counts directly on the
+    packed bytes, without unpacking. Functions accepting a packed mask natively
+    include :func:`~medpy.metric.binary.dc`, :func:`~medpy.metric.binary.jc` and
+    all other overlap metrics, and the surface distance metrics (which unpack only
+    the part of the image containing objects). :func:`size_threshold` and
+    :func:`largest_connected_component` accept packed masks as well, but unpack
+    them completely.
+
+    The voxels are packed in C-order over the flattened mask. Packed masks can be
+    combined with the binary operators ``&``, ``|``, ``^`` and ``~``, and converted
+    back to a boolean array with `unpack` or `numpy.asarray`.
+
+    Parameters
+    ----------
+    mask : array_like
+        The binary mask to pack. Will be converted into binary: background where 0,
+        object everywhere else.
+
+    Examples
+    --------
+    >>> mask = numpy.zeros((512, 512, 100), dtype=numpy.bool_)
+    >>> mask[100:200, 100:200, 20:30] = True
+    >>> packed = PackedMask(mask)
+    >>> packed.nbytes, mask.nbytes
+    (3276800, 26214400)
+    >>> packed.count_nonzero()
+    100000
+    >>> numpy.array_equal(packed.unpack(), mask)
+    True
+    """
+
+    # @var __POPCOUNT Lookup table with the number of set bits of each byte value.
+    __POPCOUNT = numpy.unpackbits(
+        numpy.arange(256, dtype=numpy.uint8)[:, numpy.newaxis], axis=1
+    ).sum(axis=1, dtype=numpy.uint8)
+
+    def __init__(self, mask):
+        mask = numpy.asarray(mask)
+        self.shape = mask.shape
+        self.data = numpy.packbits(mask.astype(numpy.bool_, copy=False), axis=None)
+
+    @classmethod
+    def from_packed(cls, data, shape):
+        r"""
+        Create a packed mask from already packed data.
+
+        Parameters
+        ----------
+        data : array_like
+            The packed bytes as returned by ``numpy.packbits(mask, axis=None)``.
+        shape : sequence of ints
+            The shape of the unpacked mask.
+
+        Returns
+        -------
+        packed : PackedMask
+            The packed mask.
+
+        Raises
+        ------
+        ValueError
+            If the number of bytes does not fit the shape.
+        """
+        data = numpy.asarray(data, dtype=numpy.uint8).ravel()
+        shape = tuple(int(s) for s in shape)
+        if not len(data) == (int(numpy.prod(shape)) + 7) // 8:
+            raise ValueError(
+                "{} bytes can not hold a packed mask of shape {}.".format(
+                    len(data), shape
+                )
+            )
+        packed = cls.__new__(cls)
+        packed.shape = shape
+        packed.data = data
+        return packed
+
+    @staticmethod
+    def popcount(data):
+        r"""
+        The number of set bits in an array of bytes.
+
+        Parameters
+        ----------
+        data : ndarray
+            Array of type `numpy.uint8`.
+
+        Returns
+        -------
+        count : int
+            The total number of set bits.
+        """
+        if hasattr(numpy, "bitwise_count"):  # numpy >= 2.0
+            return int(numpy.bitwise_count(data).sum(dtype=numpy.int64))
+        return int(PackedMask.__POPCOUNT[data].sum(dtype=numpy.int64))
+
+    @property
+    def size(self):
+        r"""The number of voxels of the mask."""
+        return int(numpy.prod(self.shape))
+
+    @property
+    def ndim(self):
+        r"""The number of dimensions of the mask."""
+        return len(self.shape)
+
+    @property
+    def nbytes(self):
+        r"""The number of bytes consumed by the packed data."""
+        return self.data.nbytes
+
+    def count_nonzero(self):
+        r"""
+        The number of object voxels.
+
+        Returns
+        -------
+        count : int
+            The number of voxels set in the mask.
+        """
+        return self.popcount(self.data)
+
+    def unpack(self, window=None):
+        r"""
+        Unpack the mask into a boolean array.
+
+        Parameters
+        ----------
+        window : sequence of slices, optional
+            If supplied, only the part of the mask covered by this window is
+            unpacked. Only the rows along the first axis covered by the window are
+            decoded, hence windows restricted along the first axis are cheap.
+
+        Returns
+        -------
+        mask : ndarray
+            The unpacked mask (or its window) of type `numpy.bool_`.
+        """
+        if window is None or 0 == self.ndim:
+            return (
+                numpy.unpackbits(self.data, count=self.size)
+                .reshape(self.shape)
+                .view(numpy.bool_)
+            )
+        window = tuple(window) + (slice(None),) * (self.ndim - len(window))
+        rows = range(*window[0].indices(self.shape[0]))
+        stride = int(numpy.prod(self.shape[1:]))
+        start = rows.start * stride
+        stop = max(rows.start, rows.stop) * stride
+        offset = start % 8
+        bits = numpy.unpackbits(self.data[start // 8 : (stop + 7) // 8])
+        block = bits[offset : offset + stop - start].reshape(
+            (-1,) + tuple(self.shape[1:])
+        )
+        return block[(slice(None, None, rows.step),) + window[1:]].view(numpy.bool_)
+
+    def row_extent(self):
+        r"""
+        The rows along the first axis, which contain object voxels.
+
+        Determined from the packed data without unpacking, hence the extent can be
+        slightly larger than the tight one.
+
+        Returns
+        -------
+        extent : slice or None
+            Slice along the first axis covering all object voxels, None if the mask
+            is empty.
+        """
+        nonzero = self.data != 0
+        if 0 == self.ndim or not nonzero.any():
+            return None
+        stride = max(1, self.size // self.shape[0])
+        first = int(nonzero.argmax()) * 8
+        last = (len(nonzero) - int(nonzero[::-1].argmax())) * 8 - 1
+        return slice(first // stride, min(self.shape[0], last // stride + 1))
+
+    def __array__(self, dtype=None, copy=None):
+        mask = self.unpack()
+        return mask if dtype is None else mask.astype(dtype)
+
+    def __repr__(self):
+        return "PackedMask(shape={}, nbytes={})".format(self.shape, self.nbytes)
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedMask):
+            return NotImplemented
+        return self.shape == other.shape and numpy.array_equal(self.data, other.data)
+
+    def __and__(self, other):
+        return self.__combine(other, numpy.bitwise_and)
+
+    def __or__(self, other):
+        return self.__combine(other, numpy.bitwise_or)
+
+    def __xor__(self, other):
+        return self.__combine(other, numpy.bitwise_xor)
+
+    def __invert__(self):
+        data = numpy.invert(self.data)
+        if self.size % 8:  # keep the padding bits of the last byte unset
+            data[-1] &= numpy.uint8((0xFF << (8 - self.size % 8)) & 0xFF)
+        return PackedMask.from_packed(data, self.shape)
+
+    def __combine(self, other, operator):
+        if not isinstance(other, PackedMask):
+            return NotImplemented
+        if not self.shape == other.shape:
+            raise ValueError(
+                "The packed masks differ in shape: {} vs {}.".format(
+                    self.shape, other.shape
+                )
+            )
+        return PackedMask.from_packed(operator(self.data, other.data), self.shape)
@@ -35,7 +35,8 @@ def relabel_map(label_image, mapping, key=lambda x, y: x[y]):
     The ``mapping`` can be any kind of subscriptable object. The respective region id is used
     to access the new value from the ``mapping``. The ``key`` keyword parameter can be used to
     supply another access function. The ``key`` function must have the signature
-    key(mapping, region-id) and return the new region-id to assign.
+    key(mapping, region-id) and return the new region-id to assign. It is called once
+    per distinct region id.
 
     Parameters
     ----------
@@ -68,9 +69,11 @@ def relabel_map(label_image, mapping, key=lambda x, y: x[y]):
                 )
             )
 
-    vmap = numpy.vectorize(_map, otypes=[label_image.dtype])
+    # map each distinct region id once and apply the result as lookup-table
+    labels, inverse = numpy.unique(label_image, return_inverse=True)
+    lut = numpy.asarray([_map(x) for x in labels.tolist()], dtype=label_image.dtype)
 
-    return vmap(label_image)
+    return lut[inverse].reshape(label_image.shape)
 
 
 def relabel(label_image, start=1):
@@ -95,14 +98,13 @@ def relabel(label_image, start=1):
     relabel_non_zero
     """
     label_image = numpy.asarray(label_image)
-    mapping = {}
-    rav = label_image.ravel()
-    for i in range(len(rav)):
-        if not rav[i] in mapping:
-            mapping[rav[i]] = start
-            start += 1
-        rav[i] = mapping[rav[i]]
-    return rav.reshape(label_image.shape)
+    labels, first, inverse = numpy.unique(
+        label_image, return_index=True, return_inverse=True
+    )
+    # assign the new ids in the order of the labels' first occurrence
+    lut = numpy.empty(len(labels), dtype=label_image.dtype)
+    lut[numpy.argsort(first)] = numpy.arange(start, start + len(labels))
+    return lut[inverse].reshape(label_image.shape)
 
 
 def relabel_non_zero(label_image, start=1):
@@ -130,15 +132,13 @@ def relabel_non_zero(label_image, start=1):
     if start <= 0:
         raise ArgumentError("The starting value can not be 0 or lower.")
 
-    l = list(numpy.unique(label_image))
-    if 0 in l:
-        l.remove(0)
-    mapping = dict()
-    mapping[0] = 0
-    for key, item in zip(l, list(range(start, len(l) + start))):
-        mapping[key] = item
+    label_image = numpy.array(label_image)
+    labels, inverse = numpy.unique(label_image, return_inverse=True)
+    lut = numpy.zeros(len(labels), dtype=label_image.dtype)
+    non_zero = labels != 0
+    lut[non_zero] = numpy.arange(start, start + numpy.count_nonzero(non_zero))
 
-    return relabel_map(label_image, mapping)
+    return lut[inverse].reshape(label_image.shape)
 
 
 def fit_labels_to_mask(label_image, mask):
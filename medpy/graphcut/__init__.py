@@ -78,6 +78,27 @@ Regional energy terms
 
     regional_atlas
 
+Region adjacency
+----------------
+.. autosummary::
+    :toctree: generated/
+
+    region_adjacency
+    boundary_statistics
+
+Graph topology :mod:`medpy.graphcut.topology`
+=============================================
+Weight-independent structure of voxel based graphs, optionally cached, to speed up
+repeated graph-cuts over the same image grid.
+
+.. module:: medpy.graphcut.topology
+.. autosummary::
+    :toctree: generated/
+
+    voxel_topology
+    VoxelTopology
+    neighbour_slicers
+
 Persist a graph :mod:`medpy.graphcut.write`
 ===========================================
 Functions to persist a graph in file formats like Dimacs [5]_, which can be read by external graph-cut algorithms.
@@ -88,6 +109,16 @@ Functions to persist a graph in file formats like Dimacs [5]_, which can be read
 
     graph_to_dimacs
 
+Load a graph :mod:`medpy.graphcut.read`
+=======================================
+Functions to load a graph persisted in file formats like Dimacs [5]_.
+
+.. module:: medpy.graphcut.read
+.. autosummary::
+    :toctree: generated/
+
+    graph_from_dimacs
+
 Graph :mod:`medpy.graphcut.graph`
 =================================
 Graph objects that can be used to generate a custom graph and execute a graph-cut over it.
@@ -98,6 +129,7 @@ Graph objects that can be used to generate a custom graph and execute a graph-cu
 
     GCGraph
     Graph
+    ArrayGraph
 
 Maxflow :mod:`medpy.graphcut.maxflow`
 =====================================
@@ -124,6 +156,24 @@ Wrappers for executing graph cuts in a memory-friendly way and other convenience
     graphcut_split
     graphcut_subprocesses
     graphcut_stawiaski
+    graphcut_multiresolution
+    GraphcutExecutor
+
+Benchmark :mod:`medpy.graphcut.benchmark`
+=========================================
+Measure the time and peak memory of the graph construction, energy computation and
+max-flow stages on synthetic voxel and label images.
+
+.. module:: medpy.graphcut.benchmark
+.. autosummary::
+    :toctree: generated/
+
+    run_benchmarks
+    benchmark_voxel_graphcut
+    benchmark_label_graphcut
+    synthetic_voxel_image
+    synthetic_label_image
+    StageRecorder
 
 Example of voxel based graph cut
 --------------------------------
@@ -199,13 +249,20 @@ References
 
 from . import energy_label as energy_label
 from . import energy_voxel as energy_voxel
+from .energy_label import boundary_statistics as boundary_statistics
+from .energy_label import region_adjacency as region_adjacency
 from .generate import graph_from_labels as graph_from_labels
 from .generate import graph_from_voxels as graph_from_voxels
+from .graph import ArrayGraph as ArrayGraph
 from .graph import GCGraph as GCGraph
 from .graph import Graph as Graph
 from .maxflow import GraphDouble as GraphDouble  # compiled C++ Python
 from .maxflow import GraphFloat as GraphFloat  # compiled C++ Python
 from .maxflow import GraphInt as GraphInt  # compiled C++ Python
+from .read import graph_from_dimacs as graph_from_dimacs
+from .topology import VoxelTopology as VoxelTopology
+from .topology import neighbour_slicers as neighbour_slicers
+from .topology import voxel_topology as voxel_topology
 from .write import graph_to_dimacs as graph_to_dimacs
 
 __all__ = [
@@ -213,10 +270,17 @@ __all__ = [
     "GraphFloat",
     "GraphInt",
     "Graph",
+    "ArrayGraph",
     "GCGraph",
     "graph_to_dimacs",
+    "graph_from_dimacs",
     "graph_from_labels",
     "graph_from_voxels",
+    "region_adjacency",
+    "boundary_statistics",
+    "VoxelTopology",
+    "voxel_topology",
+    "neighbour_slicers",
     "energy_label",
     "energy_voxel",
 ]
@@ -0,0 +1,396 @@
+# Copyright (C) 2013 Oskar Maier
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# author Oskar Maier
+# version r0.1.0
+# since 2026-10-16
+# status Release
+
+# build-in modules
+import json
+import platform
+import time
+import tracemalloc
+
+# third-party modules
+import numpy
+
+# own modules
+from .energy_label import boundary_difference_of_means
+from .energy_voxel import boundary_difference_exponential
+from .generate import graph_from_labels, graph_from_voxels
+from .topology import voxel_topology
+
+
+# code
+class StageRecorder(object):
+    r"""
+    Records the execution time and peak memory of the stages of a computation.
+
+    Stages can be nested, e.g. the computation of the energy terms inside the
+    construction of the graph. The time recorded for a stage excludes the time spent
+    in its nested stages, while its peak memory includes them.
+
+    Parameters
+    ----------
+    memory : bool
+        Whether to record the peak memory of the stages. Requires `tracemalloc` to be
+        tracing, which slows down the execution considerably; time and memory are
+        therefore best measured in separate runs.
+
+    Notes
+    -----
+    The peak memory is the maximum of the memory allocated by Python and NumPy during
+    the stage, relative to the allocated memory at its start. Memory allocated by the
+    C++ max-flow implementation is not traced.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.stages = {}
+        self.__active = []
+
+    def measure(self, name, function, *args, **kwargs):
+        r"""
+        Call a function and record its execution as a stage.
+
+        Calling the method repeatedly with the same stage name accumulates the times
+        and keeps the highest peak memory.
+
+        Parameters
+        ----------
+        name : string
+            The name of the stage.
+        function : function
+            The function to execute.
+        *args, **kwargs
+            The arguments to pass to the function.
+
+        Returns
+        -------
+        result : object
+            The return value of the function.
+        """
+        stage = self.stages.setdefault(
+            name, {"time": 0.0, "calls": 0, "peak_memory": 0}
+        )
+        tracing = self.memory and tracemalloc.is_tracing()
+        current = 0
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.__active:  # keep the enclosing stage's peak before resetting it
+                self.__active[-1]["peak"] = max(self.__active[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+        self.__active.append({"peak": 0, "nested": 0.0})
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            active = self.__active.pop()
+            stage["time"] += elapsed - active["nested"]
+            stage["calls"] += 1
+            if self.__active:
+                self.__active[-1]["nested"] += elapsed
+            if tracing:
+                peak = max(active["peak"], tracemalloc.get_traced_memory()[1])
+                stage["peak_memory"] = max(stage["peak_memory"], peak - current)
+                if self.__active:
+                    self.__active[-1]["peak"] = max(self.__active[-1]["peak"], peak)
+
+
+def synthetic_voxel_image(shape, seed=0):
+    r"""
+    Create a synthetic voxel segmentation problem.
+
+    The image shows a noisy ellipsoid in the centre of the volume. The foreground
+    markers lie inside the ellipsoid, the background markers cover the borders of
+    the volume.
+
+    Parameters
+    ----------
+    shape : sequence of ints
+        The shape of the image.
+    seed : int
+        The seed of the random noise.
+
+    Returns
+    -------
+    image : ndarray
+        The image.
+    fg_markers : ndarray
+        The foreground markers.
+    bg_markers : ndarray
+        The background markers.
+    """
+    shape = tuple(shape)
+    grid = numpy.ogrid[tuple(slice(0, s) for s in shape)]
+    distance = sum(((g - (s - 1) / 2.0) / (0.3 * s)) ** 2 for g, s in zip(grid, shape))
+    rng = numpy.random.default_rng(seed)
+    image = (distance < 1).astype(numpy.float64) + rng.normal(0, 0.2, shape)
+    fg_markers = distance < 0.1
+    fg_markers[tuple(s // 2 for s in shape)] = True
+    bg_markers = numpy.ones(shape, dtype=numpy.bool_)
+    bg_markers[tuple(slice(1, -1) for _ in shape)] = False
+    return image, fg_markers, bg_markers
+
+
+def synthetic_label_image(shape, region_size=4, seed=0):
+    r"""
+    Create a synthetic label based segmentation problem.
+
+    Based on `synthetic_voxel_image`, with the volume divided into cubic regions,
+    as e.g. produced by an over-segmenting watershed.
+
+    Parameters
+    ----------
+    shape : sequence of ints
+        The shape of the image.
+    region_size : int
+        The edge length of the regions in voxels.
+    seed : int
+        The seed of the random noise.
+
+    Returns
+    -------
+    image : ndarray
+        The image.
+    label_image : ndarray
+        The label image, with labels starting from 1 and being continuous.
+    fg_markers : ndarray
+        The foreground markers.
+    bg_markers : ndarray
+        The background markers.
+    """
+    shape = tuple(shape)
+    image, fg_markers, bg_markers = synthetic_voxel_image(shape, seed)
+    regions = [-(-s // region_size) for s in shape]
+    indices = numpy.indices(shape) // region_size
+    label_image = numpy.ravel_multi_index(tuple(indices), regions) + 1
+    return image, label_image, fg_markers, bg_markers
+
+
+def benchmark_voxel_graphcut(
+    shape,
+    boundary_term=boundary_difference_exponential,
+    boundary_term_args=None,
+    repeat=3,
+    memory=True,
+    seed=0,
+):
+    r"""
+    Benchmark a voxel based graph-cut on a synthetic image.
+
+    Records the stages *construction* (`~medpy.graphcut.generate.graph_from_voxels`
+    without the energy terms), *energy* (the boundary term) and *maxflow*.
+
+    Parameters
+    ----------
+    shape : sequence of ints
+        The shape of the synthetic image, see `synthetic_voxel_image`.
+    boundary_term : function
+        The boundary term to benchmark.
+    boundary_term_args : tuple, optional
+        The arguments of the boundary term. Defaults to ``(image, 0.5, False)``.
+    repeat : int
+        The number of runs; the fastest time of each stage is reported.
+    memory : bool
+        Whether to record the peak memory of the stages in an additional run.
+    seed : int
+        The seed of the synthetic image.
+
+    Returns
+    -------
+    result : dict
+        The benchmark result, with the stages' times in seconds and peak memory in
+        bytes.
+    """
+    image, fg_markers, bg_markers = synthetic_voxel_image(shape, seed)
+    if boundary_term_args is None:
+        boundary_term_args = (image, 0.5, False)
+
+    def run(recorder):
+        def energy(graph, boundary_term_args):
+            return recorder.measure("energy", boundary_term, graph, boundary_term_args)
+
+        graph = recorder.measure(
+            "construction",
+            graph_from_voxels,
+            fg_markers,
+            bg_markers,
+            boundary_term=energy,
+            boundary_term_args=boundary_term_args,
+        )
+        return graph, recorder.measure("maxflow", graph.maxflow)
+
+    result = __benchmark(run, repeat, memory)
+    result.update(problem="voxel", shape=list(image.shape))
+    return result
+
+
+def benchmark_label_graphcut(
+    shape,
+    region_size=4,
+    boundary_term=boundary_difference_of_means,
+    boundary_term_args=None,
+    repeat=3,
+    memory=True,
+    seed=0,
+):
+    r"""
+    Benchmark a label based graph-cut on a synthetic image.
+
+    Records the stages *construction* (`~medpy.graphcut.generate.graph_from_labels`
+    without the energy terms), *energy* (the boundary term) and *maxflow*.
+
+    Parameters
+    ----------
+    shape : sequence of ints
+        The shape of the synthetic image, see `synthetic_label_image`.
+    region_size : int
+        The edge length of the regions in voxels.
+    boundary_term : function
+        The boundary term to benchmark.
+    boundary_term_args : object, optional
+        The arguments of the boundary term. Defaults to the image.
+    repeat : int
+        The number of runs; the fastest time of each stage is reported.
+    memory : bool
+        Whether to record the peak memory of the stages in an additional run.
+    seed : int
+        The seed of the synthetic image.
+
+    Returns
+    -------
+    result : dict
+        The benchmark result, with the stages' times in seconds and peak memory in
+        bytes.
+    """
+    image, label_image, fg_markers, bg_markers = synthetic_label_image(
+        shape, region_size, seed
+    )
+    if boundary_term_args is None:
+        boundary_term_args = image
+
+    def run(recorder):
+        def energy(graph, label_image, boundary_term_args):
+            return recorder.measure(
+                "energy", boundary_term, graph, label_image, boundary_term_args
+            )
+
+        graph = recorder.measure(
+            "construction",
+            graph_from_labels,
+            label_image,
+            fg_markers,
+            bg_markers,
+            boundary_term=energy,
+            boundary_term_args=boundary_term_args,
+        )
+        return graph, recorder.measure("maxflow", graph.maxflow)
+
+    result = __benchmark(run, repeat, memory)
+    result.update(problem="label", shape=list(image.shape), region_size=region_size)
+    return result
+
+
+def run_benchmarks(
+    shapes=((32, 32, 32), (64, 64, 64)),
+    region_size=4,
+    repeat=3,
+    memory=True,
+    filename=None,
+):
+    r"""
+    Run the voxel and label based graph-cut benchmarks for a number of image sizes.
+
+    Parameters
+    ----------
+    shapes : sequence of sequences of ints
+        The shapes of the synthetic images.
+    region_size : int
+        The edge length of the regions of the label based benchmarks.
+    repeat : int
+        The number of runs per benchmark; the fastest time of each stage is reported.
+    memory : bool
+        Whether to record the peak memory of the stages in an additional run.
+    filename : string, optional
+        If supplied, the report is written to this file as JSON.
+
+    Returns
+    -------
+    report : dict
+        The benchmark results together with information about the environment.
+    """
+    from .. import __version__
+
+    results = []
+    for shape in shapes:
+        results.append(benchmark_voxel_graphcut(shape, repeat=repeat, memory=memory))
+        results.append(
+            benchmark_label_graphcut(
+                shape, region_size=region_size, repeat=repeat, memory=memory
+            )
+        )
+    report = {
+        "medpy": __version__,
+        "numpy": numpy.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if filename is not None:
+        with open(filename, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def __benchmark(run, repeat, memory):
+    r"""
+    Execute a benchmark run repeatedly and combine the stages' records.
+
+    The topology cache is emptied before each run, such that the construction of the
+    voxel topology is part of every measurement.
+    """
+    stages = {}
+    for _ in range(max(1, repeat)):
+        recorder = StageRecorder()
+        voxel_topology.cache_clear()
+        graph, maxflow = run(recorder)
+        for name, stage in list(recorder.stages.items()):
+            stages[name] = min(stages.get(name, stage["time"]), stage["time"])
+    stages = {name: {"time": t, "peak_memory": None} for name, t in stages.items()}
+
+    if memory:
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            recorder = StageRecorder(memory=True)
+            voxel_topology.cache_clear()
+            run(recorder)
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+        for name, stage in list(recorder.stages.items()):
+            stages[name]["peak_memory"] = stage["peak_memory"]
+
+    return {
+        "nodes": graph.get_node_num(),
+        "edges": graph.get_arc_num() // 2,
+        "maxflow": float(maxflow),
+        "repeat": max(1, repeat),
+        "stages": stages,
+    }
@@ -19,7 +19,6 @@
 # status Release
 
 # build-in modules
-import math
 import sys
 
 # third-party modules
@@ -27,6 +26,7 @@ import numpy
 import scipy.ndimage
 
 # own modules
+from .topology import neighbour_slicers
 
 
 # code
@@ -96,28 +96,23 @@ def boundary_difference_of_means(
     # compute the maximum possible intensity difference
     max_difference = float(abs(min(means) - max(means)))
 
-    # create a lookup table that relates region ids to their respective intensity values
-    means = dict(list(zip(labels_unique, means)))
-
     # get the adjuncancy of the labels
-    edges = __compute_edges(label_image)
+    edges = region_adjacency(label_image)
 
-    # compute the difference of means for each adjunct region and add it as a tuple to the dictionary
+    # compute the difference of means for each adjunct region
     if (
         0.0 == max_difference
     ):  # special case when the divider is zero and therefore all values can be assured to equal zero
-        for edge in edges:
-            graph.set_nweight(
-                edge[0] - 1, edge[1] - 1, sys.float_info.min, sys.float_info.min
-            )
+        weights = sys.float_info.min
     else:
-        # compute the difference of means for each adjunct region and add it as a tuple to the dictionary
-        for edge in edges:
-            value = max(
-                1.0 - abs(means[edge[0]] - means[edge[1]]) / max_difference,
-                sys.float_info.min,
-            )
-            graph.set_nweight(edge[0] - 1, edge[1] - 1, value, value)
+        # Note: the labels are consecutive starting from 1, hence means[label - 1]
+        weights = numpy.maximum(
+            1.0
+            - numpy.abs(means[edges[:, 0] - 1] - means[edges[:, 1] - 1])
+            / max_difference,
+            sys.float_info.min,
+        )
+    graph.set_nweights_array(edges[:, 0] - 1, edges[:, 1] - 1, weights, weights)
 
 
 def boundary_stawiaski(
@@ -186,32 +181,12 @@ def boundary_stawiaski(
 
     __check_label_image(label_image)
 
-    for dim in range(label_image.ndim):
-        # prepare slicer for all minus last and all minus first "row"
-        slicer_from = [slice(None)] * label_image.ndim
-        slicer_to = [slice(None)] * label_image.ndim
-        slicer_from[dim] = slice(None, -1)
-        slicer_to[dim] = slice(1, None)
-        # slice views of keys
-        keys_from = label_image[tuple(slicer_from)]
-        keys_to = label_image[tuple(slicer_to)]
-        # determine not equal keys
-        valid_edges = keys_from != keys_to
-        # determine largest gradient
-        gradient_max = numpy.maximum(
-            numpy.abs(gradient_image[tuple(slicer_from)]),
-            numpy.abs(gradient_image[tuple(slicer_to)]),
-        )[valid_edges]
-        # determine key order
-        keys_max = numpy.maximum(keys_from, keys_to)[valid_edges]
-        keys_min = numpy.minimum(keys_from, keys_to)[valid_edges]
-        # set edges / nweights
-        for k1, k2, val in zip(keys_min, keys_max, gradient_max):
-            weight = math.pow(
-                1.0 / (1.0 + val), 2
-            )  # weight contribution of a single pixel
-            weight = max(weight, sys.float_info.min)
-            graph.set_nweight(k1 - 1, k2 - 1, weight, weight)
+    # sum the weight contributions of all boundary voxel pairs of each region pair
+    edges, statistics = boundary_statistics(
+        label_image, gradient_image, pair_function=__stawiaski_weight
+    )
+    weights = statistics["sum"]
+    graph.set_nweights_array(edges[:, 0] - 1, edges[:, 1] - 1, weights, weights)
 
 
 def boundary_stawiaski_directed(
@@ -301,55 +276,42 @@ def boundary_stawiaski_directed(
 
     beta = abs(directedness)
 
-    def addition_directed_ltd(key1, key2, v1, v2, dic):  # for light-to-dark # tested
-        "Takes a key defined by two uints, two voxel intensities and a dict to which it adds g(v1, v2)."
-        if (
-            not key1 == key2
-        ):  # do not process voxel pairs which belong to the same region
-            # The function used to compute the weight contribution of each voxel pair
-            weight = math.pow(1.0 / (1.0 + max(abs(v1), abs(v2))), 2)
-            # ensure that no value is zero; this can occur due to rounding errors
-            weight = max(weight, sys.float_info.min)
-            # add weighted values to already existing edge
-            if v1 > v2:
-                graph.set_nweight(key1 - 1, key2 - 1, min(1, weight + beta), weight)
-            else:
-                graph.set_nweight(key1 - 1, key2 - 1, weight, min(1, weight + beta))
-
-    def addition_directed_dtl(key1, key2, v1, v2):  # for dark-to-light # tested
-        "Takes a key defined by two uints, two voxel intensities and a dict to which it adds g(v1, v2)."
-        if (
-            not key1 == key2
-        ):  # do not process voxel pairs which belong to the same region
-            # The function used to compute the weight contribution of each voxel pair
-            weight = math.pow(1.0 / (1.0 + max(abs(v1), abs(v2))), 2)
-            # ensure that no value is zero; this can occur due to rounding errors
-            weight = max(weight, sys.float_info.min)
-            # add weighted values to already existing edge
-            if v1 > v2:
-                graph.set_nweight(key1 - 1, key2 - 1, weight, min(1, weight + beta))
-            else:
-                graph.set_nweight(key1 - 1, key2 - 1, min(1, weight + beta), weight)
-
-    # pick and vectorize the function to achieve a speedup
-    if 0 > directedness:
-        vaddition = numpy.vectorize(addition_directed_dtl)
-    else:
-        vaddition = numpy.vectorize(addition_directed_ltd)
-
-    # iterate over each dimension
-    for dim in range(label_image.ndim):
-        slices_x = []
-        slices_y = []
-        for di in range(label_image.ndim):
-            slices_x.append(slice(None, -1 if di == dim else None))
-            slices_y.append(slice(1 if di == dim else None, None))
-        vaddition(
-            label_image[tuple(slices_x)],
-            label_image[tuple(slices_y)],
-            gradient_image[tuple(slices_x)],
-            gradient_image[tuple(slices_y)],
-        )
+    # collect the weight contributions of all boundary voxel pairs in both directions
+    keys = []
+    weights_there = []
+    weights_back = []
+    for slicer_from, slicer_to, valid_edges in __boundary_voxel_pairs(label_image, 1):
+        labels_from = label_image[slicer_from][valid_edges]
+        labels_to = label_image[slicer_to][valid_edges]
+        values_from = gradient_image[slicer_from][valid_edges]
+        values_to = gradient_image[slicer_to][valid_edges]
+        weight = __stawiaski_weight(values_from, values_to)
+        weight_directed = numpy.minimum(1, weight + beta)
+        # light-to-dark resp. dark-to-light transitions from the first to the second
+        # voxel receive the additional directed weight
+        if 0 > directedness:  # for dark-to-light
+            favoured = values_from <= values_to
+        else:  # for light-to-dark
+            favoured = values_from > values_to
+        there = numpy.where(favoured, weight_directed, weight)
+        back = numpy.where(favoured, weight, weight_directed)
+        # orient all voxel pairs from the lower to the higher label
+        swapped = labels_from > labels_to
+        keys.append(__edge_keys(label_image, labels_from, labels_to))
+        weights_there.append(numpy.where(swapped, back, there))
+        weights_back.append(numpy.where(swapped, there, back))
+    edges, inverse, _ = __group_edges(label_image, keys)
+
+    # sum the weight contributions of each region pair
+    weights_there = numpy.bincount(
+        inverse, weights=numpy.concatenate(weights_there), minlength=len(edges)
+    )
+    weights_back = numpy.bincount(
+        inverse, weights=numpy.concatenate(weights_back), minlength=len(edges)
+    )
+    graph.set_nweights_array(
+        edges[:, 0] - 1, edges[:, 1] - 1, weights_there, weights_back
+    )
 
 
 def regional_atlas(
@@ -389,73 +351,267 @@ def regional_atlas(
     probability_map = numpy.asarray(probability_map)
     __check_label_image(label_image)
 
-    # finding the objects in the label image (bounding boxes around regions)
-    objects = scipy.ndimage.find_objects(label_image)
+    # compute the sums of atlas values of all regions at once
+    weights = numpy.bincount(
+        label_image.ravel(), weights=probability_map.ravel(), minlength=2
+    )[1:]
+    graph.set_tweights_array(
+        numpy.arange(len(weights)), alpha * weights, -1.0 * alpha * weights
+    )  # rids start from 1, node ids inside the graph from 0
+
 
-    # iterate over regions and compute the respective sums of atlas values
-    for rid in range(1, len(objects) + 1):
-        weight = numpy.sum(
-            probability_map[objects[rid - 1]][label_image[objects[rid - 1]] == rid]
+def region_adjacency(label_image, connectivity=1, return_counts=False):
+    r"""
+    Adjacency of the regions of a label image.
+
+    Two regions are adjacent, if at least one of their voxels are neighbours under the
+    given connectivity. The computation is fully vectorized and suitable for label
+    images holding a large number of regions.
+
+    Parameters
+    ----------
+    label_image : array_like
+        The label image. Other than for the energy terms, the labels are not required
+        to be consecutive or to start from 1.
+    connectivity : int
+        The neighbourhood connectivity, as used by
+        `scipy.ndimage.generate_binary_structure`, i.e. ``1`` for the :math:`ndim*2`
+        direct neighbours and ``label_image.ndim`` for the full neighbourhood.
+    return_counts : bool
+        If `True`, also return the number of neighbouring voxel pairs forming the
+        boundary between each two adjacent regions.
+
+    Returns
+    -------
+    edges : ndarray
+        The pairs of adjacent region labels as array of shape ``(n, 2)``, with the
+        lower label first and sorted in ascending order. Contains neither duplicates
+        nor self-references.
+    counts : ndarray
+        The number of voxel pairs on the boundary of each region pair. Only provided
+        if ``return_counts`` is `True`.
+
+    Raises
+    ------
+    ValueError
+        If the connectivity is lower than 1.
+
+    Examples
+    --------
+    >>> region_adjacency([[1, 1, 2], [3, 3, 2]], return_counts=True)
+    (array([[1, 2],
+           [1, 3],
+           [2, 3]]), array([1, 2, 1]))
+    """
+    label_image = numpy.asarray(label_image)
+    keys = [
+        __edge_keys(
+            label_image,
+            label_image[slicer_from][valid_edges],
+            label_image[slicer_to][valid_edges],
         )
-        graph.set_tweight(
-            rid - 1, alpha * weight, -1.0 * alpha * weight
-        )  # !TODO: rid's inside the graph start from 0 or 1? => seems to start from 0
-        # !TODO: I can exclude source and sink nodes from this!
-        # !TODO: I only have to do this in the range of the atlas objects!
+        for slicer_from, slicer_to, valid_edges in __boundary_voxel_pairs(
+            label_image, connectivity
+        )
+    ]
+    edges, _, counts = __group_edges(label_image, keys)
+
+    if return_counts:
+        return edges, counts
+    return edges
 
 
-def __compute_edges(label_image):
+def boundary_statistics(
+    label_image, boundary_image, connectivity=1, pair_function=None
+):
+    r"""
+    Statistics of the boundary values between all adjacent regions of a label image.
+
+    Each two neighbouring voxels belonging to different regions form a boundary voxel
+    pair, to which a boundary value is assigned by ``pair_function``. For each two
+    adjacent regions, the sum, mean, minimum, maximum and count of the boundary values
+    of all their boundary voxel pairs is then computed in a single vectorized pass.
+
+    Parameters
+    ----------
+    label_image : array_like
+        The label image. The labels are not required to be consecutive or to start
+        from 1.
+    boundary_image : array_like
+        The image holding the values from which the boundary values are computed,
+        e.g. a gradient magnitude image. Must be of the same shape as ``label_image``.
+    connectivity : int
+        The neighbourhood connectivity, see `region_adjacency`.
+    pair_function : function
+        A function taking two arrays with the values of the first and the second
+        voxel of the boundary voxel pairs and returning an array with their boundary
+        values. Defaults to the maximum of the two absolute values.
+
+    Returns
+    -------
+    edges : ndarray
+        The pairs of adjacent region labels as array of shape ``(n, 2)``, see
+        `region_adjacency`.
+    statistics : dict
+        A dictionary holding an array of length ``n`` for each of the keys
+        "sum", "mean", "min", "max" and "count".
+
+    Raises
+    ------
+    ValueError
+        If the two images are not of the same shape or the connectivity is lower than
+        1.
+
+    See also
+    --------
+    region_adjacency
     """
-    Computes the region neighbourhood defined by a star shaped n-dimensional structuring
-    element (as returned by scipy.ndimage.generate_binary_structure(ndim, 1)) for the
-    supplied region/label image.
-    Note The returned set contains neither duplicates, nor self-references
-    (i.e. (id_1, id_1)), nor reversed references (e.g. (id_1, id_2) and (id_2, id_1).
-
-    @param label_image An image with labeled regions (nD).
-    @param return A set with tuples denoting the edge neighbourhood.
+    label_image = numpy.asarray(label_image)
+    boundary_image = numpy.asarray(boundary_image)
+    if not label_image.shape == boundary_image.shape:
+        raise ValueError(
+            "The label image of shape {} and the boundary image of shape {} must be of the same shape.".format(
+                label_image.shape, boundary_image.shape
+            )
+        )
+    if pair_function is None:
+        pair_function = __maximum_magnitude
+
+    keys = []
+    values = []
+    for slicer_from, slicer_to, valid_edges in __boundary_voxel_pairs(
+        label_image, connectivity
+    ):
+        keys.append(
+            __edge_keys(
+                label_image,
+                label_image[slicer_from][valid_edges],
+                label_image[slicer_to][valid_edges],
+            )
+        )
+        values.append(
+            numpy.asarray(
+                pair_function(
+                    boundary_image[slicer_from][valid_edges],
+                    boundary_image[slicer_to][valid_edges],
+                ),
+                dtype=numpy.float64,
+            )
+        )
+    edges, inverse, counts = __group_edges(label_image, keys)
+    values = numpy.concatenate(values) if values else numpy.zeros(0)
+
+    # group-by over the sorted edge ids
+    sums = numpy.bincount(inverse, weights=values, minlength=len(edges)).astype(
+        numpy.float64
+    )
+    minima = numpy.zeros(len(edges))
+    maxima = numpy.zeros(len(edges))
+    if 0 != len(edges):
+        values = values[numpy.argsort(inverse, kind="stable")]
+        starts = numpy.concatenate([[0], numpy.cumsum(counts)[:-1]])
+        minima = numpy.minimum.reduceat(values, starts)
+        maxima = numpy.maximum.reduceat(values, starts)
+    statistics = {
+        "sum": sums,
+        "mean": sums / numpy.maximum(counts, 1),
+        "min": minima,
+        "max": maxima,
+        "count": counts,
+    }
+    return edges, statistics
+
+
+def __boundary_voxel_pairs(label_image, connectivity):
+    """
+    For each neighbourhood offset of the connectivity, the pair of slicers selecting
+    the neighbouring voxels and the mask of the voxel pairs lying on a region boundary.
+    """
+    for slicer_from, slicer_to in neighbour_slicers(label_image.shape, connectivity):
+        yield slicer_from, slicer_to, label_image[slicer_from] != label_image[slicer_to]
+
+
+def __group_edges(label_image, keys):
+    """
+    Joins the edge keys of multiple boundary voxel pair selections and groups them by
+    edge. Returns the edges, the index of the edge of each key and the key counts.
     """
-    return __compute_edges_nd(label_image)
+    keys = numpy.concatenate(keys) if keys else numpy.zeros(0, dtype=numpy.int64)
+    keys, inverse, counts = numpy.unique(keys, return_inverse=True, return_counts=True)
+    return __edge_labels(label_image, keys), inverse.ravel(), counts
 
 
-def __compute_edges_nd(label_image):
+def __maximum_magnitude(values_from, values_to):
     """
-    Computes the region neighbourhood defined by a star shaped n-dimensional structuring
-    element (as returned by scipy.ndimage.generate_binary_structure(ndim, 1)) for the
-    supplied region/label image.
-    Note The returned set contains neither duplicates, nor self-references
-    (i.e. (id_1, id_1)), nor reversed references (e.g. (id_1, id_2) and (id_2, id_1).
-
-    @param label_image An image with labeled regions (nD).
-    @param return A set with tuples denoting the edge neighbourhood.
+    The maximum of the absolute values of each voxel pair.
     """
-    Er = set()
+    return numpy.maximum(numpy.abs(values_from), numpy.abs(values_to))
 
-    def append(v1, v2):
-        if v1 != v2:
-            Er.update([(min(v1, v2), max(v1, v2))])
 
-    vappend = numpy.vectorize(append)
+def __stawiaski_weight(values_from, values_to):
+    """
+    The strictly positive weight contribution of each voxel pair to the boundary
+    between two regions as defined by Stawiaski et al.
+    """
+    weights = numpy.power(1.0 / (1.0 + __maximum_magnitude(values_from, values_to)), 2)
+    # ensure that no value is zero; this can occur due to rounding errors
+    return numpy.maximum(weights, sys.float_info.min)
 
-    for dim in range(label_image.ndim):
-        slices_x = []
-        slices_y = []
-        for di in range(label_image.ndim):
-            slices_x.append(slice(None, -1 if di == dim else None))
-            slices_y.append(slice(1 if di == dim else None, None))
-        vappend(label_image[tuple(slices_x)], label_image[tuple(slices_y)])
 
-    return Er
+def __edge_keys(label_image, labels_from, labels_to):
+    """
+    Packs pairs of labels of label_image, order independent, into single 64-bit keys.
+    """
+    offset, base = __edge_key_base(label_image)
+    labels_min = numpy.minimum(labels_from, labels_to).astype(numpy.int64) - offset
+    labels_max = numpy.maximum(labels_from, labels_to).astype(numpy.int64) - offset
+    return labels_min * base + labels_max
+
+
+def __edge_labels(label_image, keys):
+    """
+    Unpacks keys created by __edge_keys into label pairs of shape (n, 2).
+    """
+    offset, base = __edge_key_base(label_image)
+    edges = numpy.stack(numpy.divmod(keys, base), axis=1) + offset
+    return edges.astype(label_image.dtype)
+
+
+def __edge_key_base(label_image):
+    """
+    The offset and base used to pack the labels of label_image into 64-bit keys.
+    """
+    if 0 == label_image.size:
+        return 0, 1
+    offset = int(label_image.min())
+    base = int(label_image.max()) - offset + 1
+    if base > __MAX_EDGE_KEY_BASE:
+        raise ValueError(
+            "The range of labels ({} to {}) is too large to be processed.".format(
+                offset, offset + base - 1
+            )
+        )
+    return offset, base
 
 
 def __check_label_image(label_image):
     """Check the label image for consistent labelling starting from 1."""
-    encountered_indices = numpy.unique(label_image)
-    expected_indices = numpy.arange(1, label_image.max() + 1)
-    if (
-        not encountered_indices.size == expected_indices.size
-        or not (encountered_indices == expected_indices).all()
-    ):
+    if numpy.issubdtype(label_image.dtype, numpy.integer) and label_image.size:
+        # consecutive labels can not exceed the number of voxels, which bounds the
+        # memory required by the linear time check
+        consecutive = 1 == label_image.min() and label_image.max() <= label_image.size
+        if consecutive:
+            consecutive = numpy.bincount(label_image.ravel())[1:].all()
+    else:
+        encountered_indices = numpy.unique(label_image)
+        consecutive = encountered_indices.size and numpy.array_equal(
+            encountered_indices, numpy.arange(1, encountered_indices.size + 1)
+        )
+    if not consecutive:
         raise AttributeError(
             "The supplied label image does either not contain any regions or they are not labeled consecutively starting from 1."
         )
+
+
+# the largest label range for which label pairs can be packed into signed 64-bit keys
+__MAX_EDGE_KEY_BASE = 3037000499
@@ -27,6 +27,7 @@ import sys
 import numpy
 
 # own modules
+from .topology import voxel_topology
 
 
 # code
@@ -59,10 +60,15 @@ def regional_probability_map(graph, xxx_todo_changeme):
     """
     (probability_map, alpha) = xxx_todo_changeme
     probability_map = numpy.asarray(probability_map)
-    probabilities = numpy.vstack(
-        [(probability_map * alpha).flat, ((1 - probability_map) * alpha).flat]
-    ).T
-    graph.set_tweights_all(probabilities)
+    # restricted to a region of interest, only its voxels are nodes
+    topology = graph.get_topology()
+    if topology is not None and topology.shape == probability_map.shape:
+        probability_map = topology.node_values(probability_map)
+    graph.set_tweights_array(
+        numpy.arange(probability_map.size),
+        (probability_map * alpha).ravel(),
+        ((1 - probability_map) * alpha).ravel(),
+    )
 
 
 def boundary_maximum_linear(graph, xxx_todo_changeme1):
@@ -148,7 +154,8 @@ def boundary_difference_linear(graph, xxx_todo_changeme2):
     When the created edge weights should be weighted according to the slice distance,
     provide the list of slice thicknesses via the ``spacing`` parameter. Then all weights
     computed for the corresponding direction are divided by the respective slice
-    thickness. Set this parameter to `False` for equally weighted edges.
+    thickness. Set this parameter to `False` for a unit spacing, which weights the edges
+    of direct neighbours equally.
 
     Parameters
     ----------
@@ -263,7 +270,8 @@ def boundary_difference_exponential(graph, xxx_todo_changeme4):
     When the created edge weights should be weighted according to the slice distance,
     provide the list of slice thicknesses via the ``spacing`` parameter. Then all weights
     computed for the corresponding direction are divided by the respective slice
-    thickness. Set this parameter to `False` for equally weighted edges.
+    thickness. Set this parameter to `False` for a unit spacing, which weights the edges
+    of direct neighbours equally.
 
     Parameters
     ----------
@@ -372,7 +380,8 @@ def boundary_difference_division(graph, xxx_todo_changeme6):
     When the created edge weights should be weighted according to the slice distance,
     provide the list of slice thicknesses via the ``spacing`` parameter. Then all weights
     computed for the corresponding direction are divided by the respective slice
-    thickness. Set this parameter to `False` for equally weighted edges.
+    thickness. Set this parameter to `False` for a unit spacing, which weights the edges
+    of direct neighbours equally.
 
     Parameters
     ----------
@@ -479,7 +488,8 @@ def boundary_difference_power(graph, xxx_todo_changeme8):
     When the created edge weights should be weighted according to the slice distance,
     provide the list of slice thicknesses via the ``spacing`` parameter. Then all weights
     computed for the corresponding direction are divided by the respective slice
-    thickness. Set this parameter to `False` for equally weighted edges.
+    thickness. Set this parameter to `False` for a unit spacing, which weights the edges
+    of direct neighbours equally.
 
     Parameters
     ----------
@@ -626,52 +636,84 @@ def __skeleton_base(graph, image, boundary_term, neighbourhood_function, spacing
                                   returned as a single array of the same shape
     @type neighbourhood_function function
     @param spacing A sequence containing the slice spacing used for weighting the
-                   computed neighbourhood weight value for different dimensions. If
-                   False, no distance based weighting of the graph edges is performed.
+                   computed neighbourhood weight value by the physical distance
+                   between the neighbours. If False or None, a spacing of 1 along all
+                   axes is assumed, such that only diagonal neighbours receive a distance
+                   based weighting.
     @param spacing sequence | False
+
+    The neighbourhood connectivity is taken from the topology of the graph, if it has
+    been created for one, otherwise the direct neighbours along the image axes are used.
     """
     image = numpy.asarray(image)
-    image = image.astype(float)
-
-    # iterate over the image dimensions and for each create the appropriate edges and compute the associated weights
-    for dim in range(image.ndim):
-        # construct slice-objects for the current dimension
-        slices_exclude_last = [slice(None)] * image.ndim
-        slices_exclude_last[dim] = slice(-1)
-        slices_exclude_first = [slice(None)] * image.ndim
-        slices_exclude_first[dim] = slice(1, None)
+
+    # the node ids of all neighbouring voxel pairs, shared between graph constructions
+    topology = graph.get_topology()
+    if topology is None:
+        topology = voxel_topology(image.shape)
+    elif not topology.shape == image.shape:
+        topology = voxel_topology(image.shape, topology.connectivity)
+
+    # restricted to a region of interest, the terms are computed for its voxels only
+    if topology.roi is None:
+        image = image.astype(float)
+    else:
+        values = topology.node_values(image).astype(float)
+        flat_image = image.ravel()
+
+    borders = topology.borders or [None] * len(topology.offsets)
+
+    # iterate over the neighbourhood offsets and for each create the appropriate edges and compute the associated weights
+    for (
+        (slicer_from, slicer_to),
+        nodes_from,
+        nodes_to,
+        distance,
+        border,
+    ) in zip(
+        topology.slicers,
+        topology.nodes_from,
+        topology.nodes_to,
+        topology.distances(spacing),
+        borders,
+    ):
         # compute difference between all layers in the current dimensions direction
-        neighbourhood_intensity_term = neighbourhood_function(
-            image[tuple(slices_exclude_last)], image[tuple(slices_exclude_first)]
-        )
+        if topology.roi is None:
+            neighbourhood_intensity_term = neighbourhood_function(
+                image[slicer_from], image[slicer_to]
+            ).ravel()
+        else:
+            neighbourhood_intensity_term = neighbourhood_function(
+                values[nodes_from], values[nodes_to]
+            )
         # apply boundary term
         neighbourhood_intensity_term = boundary_term(neighbourhood_intensity_term)
-        # compute key offset for relative key difference
-        offset_key = [1 if i == dim else 0 for i in range(image.ndim)]
-        offset = __flatten_index(offset_key, image.shape)
-        # generate index offset function for index dependent offset
-        idx_offset_divider = (image.shape[dim] - 1) * offset
-        idx_offset = lambda x: int(x / idx_offset_divider) * offset
-
-        # weight the computed distanced in dimension dim by the corresponding slice spacing provided
-        if spacing:
-            neighbourhood_intensity_term /= spacing[dim]
 
-        for key, value in enumerate(neighbourhood_intensity_term.ravel()):
-            # apply index dependent offset
-            key += idx_offset(key)
-            # add edges and set the weight
-            graph.set_nweight(key, key + offset, value, value)
-
-
-def __flatten_index(pos, shape):
-    """
-    Takes a three dimensional index (x,y,z) and computes the index required to access the
-    same element in the flattened version of the array.
-    """
-    res = 0
-    acc = 1
-    for pi, si in zip(reversed(pos), reversed(shape)):
-        res += pi * acc
-        acc *= si
-    return res
+        # weight the computed distanced by the physical distance between the neighbours,
+        # which also counters the metrication bias of diagonal neighbourhoods
+        neighbourhood_intensity_term /= distance
+
+        # restricted to a region of interest, the voxel pairs crossing its border
+        # connect the inner voxel to the terminal the outer voxel is fixed to
+        if border is not None:
+            voxels_from, voxels_to, nodes, foreground = border
+            border_term = boundary_term(
+                neighbourhood_function(
+                    flat_image[voxels_from].astype(float),
+                    flat_image[voxels_to].astype(float),
+                )
+            )
+            border_term /= distance
+            graph.set_tweights_array(
+                nodes,
+                numpy.where(foreground, border_term, 0),
+                numpy.where(foreground, 0, border_term),
+            )
+
+        # add edges and set the weights, all at once
+        graph.set_nweights_array(
+            nodes_from,
+            nodes_to,
+            neighbourhood_intensity_term,
+            neighbourhood_intensity_term,
+        )
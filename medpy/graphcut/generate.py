@@ -26,8 +26,8 @@ import numpy
 
 # own modules
 from ..core import Logger
-from .energy_label import __check_label_image
 from .graph import GCGraph
+from .topology import voxel_topology
 
 
 def graph_from_voxels(
@@ -37,6 +37,9 @@ def graph_from_voxels(
     boundary_term=False,
     regional_term_args=False,
     boundary_term_args=False,
+    connectivity=1,
+    graph=None,
+    roi_mask=None,
 ):
     """
     Create a graph-cut ready graph to segment a nD image using the voxel neighbourhood.
@@ -88,6 +91,24 @@ def graph_from_voxels(
         Use this to pass some additional parameters to the ``regional_term`` function.
     boundary_term_args : tuple
         Use this to pass some additional parameters to the ``boundary_term`` function.
+    connectivity : int or sequence of sequences of ints
+        The voxel neighbourhood, either as connectivity (e.g. ``1``, ``2`` or ``3``
+        for 6, 18 or 26 neighbours in 3D) or as custom stencil of offsets. See
+        `~medpy.graphcut.topology.voxel_topology` for details. Larger neighbourhoods
+        reduce the metrication artifacts of the cut at the cost of graph size.
+    graph : `~medpy.graphcut.graph.GCGraph`
+        An existing graph to reuse instead of creating a new one, as obtained from
+        `~medpy.graphcut.topology.VoxelTopology.graph`. It is reset before the weights
+        are added, but keeps its allocated memory. Its topology is used as is, i.e. a
+        graph of a restricted topology is not restricted again, but ``connectivity``
+        and ``roi_mask`` have to match it.
+    roi_mask : ndarray
+        Restrict the graph to a region of interest, e.g. a band around the expected
+        object boundary. Only voxels inside the mask become nodes. Voxels outside are
+        fixed to the foreground where covered by ``fg_markers`` and to the background
+        otherwise. See `~medpy.graphcut.topology.VoxelTopology.restrict` and use
+        `~medpy.graphcut.topology.VoxelTopology.segmentation` to obtain the result in
+        full image size.
 
     Returns
     -------
@@ -107,17 +128,39 @@ def graph_from_voxels(
     is given higher priority.
 
     All arcs whose weight is not explicitly set are assumed to carry a weight of zero.
+
+    The node ids of the neighbouring voxels are obtained from
+    `~medpy.graphcut.topology.voxel_topology` and released with the graph. To share
+    them between repeated calls for images of the same shape, pass the graph of a
+    previous call via ``graph``. The boundary terms of
+    :mod:`~medpy.graphcut.energy_voxel` create edges for all neighbours of the
+    chosen connectivity and divide their weights by the physical distance between the
+    neighbours, assuming a unit spacing if none is passed.
     """
     # prepare logger
     logger = Logger.getInstance()
 
-    # prepare result graph
+    # prepare result graph, reusing the (restricted) topology of a supplied graph
+    if graph is None:
+        topology = voxel_topology(fg_markers.shape, connectivity)
+        if roi_mask is not None:
+            topology = topology.restrict(roi_mask, fg_markers)
+        graph = topology.graph()
+    elif not __matching_topology(
+        graph.get_topology(), fg_markers, connectivity, roi_mask
+    ):
+        raise AttributeError(
+            "The supplied graph does not match the image of shape {} and the "
+            "connectivity {}.".format(fg_markers.shape, connectivity)
+        )
+    else:
+        topology = graph.get_topology()
+        graph.reset()
     logger.debug(
         "Assuming {} nodes and {} edges for image of shape {}".format(
-            fg_markers.size, __voxel_4conectedness(fg_markers.shape), fg_markers.shape
+            topology.node_count, topology.edge_count, fg_markers.shape
         )
     )
-    graph = GCGraph(fg_markers.size, __voxel_4conectedness(fg_markers.shape))
 
     logger.info("Performing attribute tests...")
 
@@ -147,7 +190,7 @@ def graph_from_voxels(
 
     logger.debug(
         "#nodes={}, #hardwired-nodes source/sink={}/{}".format(
-            fg_markers.size,
+            topology.node_count,
             len(fg_markers.ravel().nonzero()[0]),
             len(bg_markers.ravel().nonzero()[0]),
         )
@@ -166,10 +209,12 @@ def graph_from_voxels(
     # collect all voxels that are under the foreground resp. background markers i.e.
     # collect all nodes that are connected to the source resp. sink
     logger.info("Setting terminal weights for the markers...")
-    if not 0 == numpy.count_nonzero(fg_markers):
-        graph.set_source_nodes(fg_markers.ravel().nonzero()[0])
-    if not 0 == numpy.count_nonzero(bg_markers):
-        graph.set_sink_nodes(bg_markers.ravel().nonzero()[0])
+    fg_nodes = numpy.flatnonzero(topology.node_values(fg_markers))
+    bg_nodes = numpy.flatnonzero(topology.node_values(bg_markers))
+    if not 0 == fg_nodes.size:
+        graph.set_source_nodes(fg_nodes)
+    if not 0 == bg_nodes.size:
+        graph.set_sink_nodes(bg_nodes)
 
     return graph.get_graph()
 
@@ -209,9 +254,9 @@ def graph_from_labels(
     Parameters
     ----------
     label_image: ndarray
-        The label image as an array cwhere each voxel carries the id of the region it
-        belongs to. Note that the region labels have to start from 1 and be continuous
-        (can be achieved with `~medpy.filter.label.relabel`).
+        The label image as an array where each voxel carries the id of the region it
+        belongs to. The region ids can be arbitrary, e.g. the direct output of a
+        watershed, see the notes for how they relate to the graph's nodes.
     fg_markers : ndarray
         The foreground markers as binary array of the same shape as the original image.
     bg_markers : ndarray
@@ -256,6 +301,13 @@ def graph_from_labels(
     is given higher priority.
 
     All arcs whose weight is not explicitly set are assumed to carry a weight of zero.
+
+    The regions are internally relabelled to be consecutive starting from 1 in the
+    order of their ids, and the ``regional_term`` and ``boundary_term`` functions
+    receive this relabelled image. Hence the region with the i-th smallest id is
+    represented by the node i - 1 of the graph, i.e. the node ids map to the region
+    ids through ``numpy.unique(label_image)``. Label images that are already labelled
+    consecutively starting from 1 are passed through unchanged.
     """
     # prepare logger
     logger = Logger.getInstance()
@@ -267,7 +319,16 @@ def graph_from_labels(
     fg_markers = numpy.asarray(fg_markers, dtype=numpy.bool_)
     bg_markers = numpy.asarray(bg_markers, dtype=numpy.bool_)
 
-    __check_label_image(label_image)
+    if 0 == label_image.size:
+        raise AttributeError("The supplied label image does not contain any regions.")
+
+    # compact the region ids to be consecutive, starting from 1
+    labels, inverse = numpy.unique(label_image, return_inverse=True)
+    if not (1 == labels[0] and len(labels) == labels[-1]):
+        logger.debug("Relabelling {} regions.".format(len(labels)))
+        inverse += 1
+        label_image = inverse.reshape(label_image.shape)
+    del inverse
 
     # set dummy functions if not supplied
     if not regional_term:
@@ -277,13 +338,13 @@ def graph_from_labels(
 
     # check supplied functions and their signature
     if not hasattr(regional_term, "__call__") or not 3 == len(
-        inspect.getargspec(regional_term)[0]
+        inspect.getfullargspec(regional_term)[0]
     ):
         raise AttributeError(
             "regional_term has to be a callable object which takes three parameters."
         )
     if not hasattr(boundary_term, "__call__") or not 3 == len(
-        inspect.getargspec(boundary_term)[0]
+        inspect.getfullargspec(boundary_term)[0]
     ):
         raise AttributeError(
             "boundary_term has to be a callable object which takes three parameters."
@@ -292,12 +353,12 @@ def graph_from_labels(
     logger.info("Determining number of nodes and edges.")
 
     # compute number of nodes and edges
-    nodes = len(numpy.unique(label_image))
+    nodes = len(labels)
     # POSSIBILITY 1: guess the number of edges (in the best situation is faster but requires a little bit more memory. In the worst is slower.)
     edges = 10 * nodes
     logger.debug("guessed: #nodes={} nodes / #edges={}".format(nodes, edges))
     # POSSIBILITY 2: compute the edges (slow)
-    # edges = len(__compute_edges(label_image))
+    # edges = len(region_adjacency(label_image))
     # logger.debug('computed: #nodes={} nodes / #edges={}'.format(nodes, edges))
 
     # prepare result graph
@@ -360,24 +421,18 @@ def __boundary_term_label(graph, label_image, boundary_term_args):
     return {}
 
 
-def __voxel_4conectedness(shape):
+def __matching_topology(topology, fg_markers, connectivity, roi_mask):
     """
-    Returns the number of edges for the supplied image shape assuming 4-connectedness.
-
-    The name of the function has historical reasons. Essentially it returns the number
-    of edges assuming 4-connectedness only for 2D. For 3D it assumes 6-connectedness,
-    etc.
-
-    @param shape the shape of the image
-    @type shape sequence
-    @return the number of edges
-    @rtype int
+    Whether a voxel topology describes the graph structure for the given markers,
+    connectivity and region of interest.
     """
-    shape = list(shape)
-    while 1 in shape:
-        shape.remove(
-            1
-        )  # empty resp. 1-sized dimensions have to be removed (equal to numpy.squeeze on the array)
-    return int(
-        round(sum([(dim - 1) / float(dim) for dim in shape]) * numpy.prod(shape))
+    if topology is None or not topology.shape == numpy.shape(fg_markers):
+        return False
+    if not topology.offsets == voxel_topology(topology.shape, connectivity).offsets:
+        return False
+    if roi_mask is None or topology.roi is None:
+        return roi_mask is None and topology.roi is None
+    roi = numpy.asarray(roi_mask, dtype=numpy.bool_)
+    return numpy.array_equal(topology.roi, roi) and numpy.array_equal(
+        topology.exterior, numpy.asarray(fg_markers, dtype=numpy.bool_) & ~roi
     )
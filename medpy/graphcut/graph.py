@@ -21,6 +21,7 @@
 # build-in modules
 
 # third-party modules
+import numpy
 
 # own modules
 from .maxflow import GraphDouble
@@ -264,6 +265,504 @@ class Graph(object):
             return messages
 
 
+class ArrayGraph(object):
+    r"""
+    Array-backed, memory-efficient counterpart of `Graph`.
+
+    Offers the same public interface as `Graph`, but stores the n-weights in
+    parallel, growable int32 (node-ids) and float64 (weights) arrays and the
+    t-weights in arrays indexed by the node-ids. This reduces the memory
+    requirements from a few hundred to 24 bytes per edge and allows for a fast
+    conversion into a `GCGraph` with `to_gcgraph`. Objects of this class pickle
+    compactly and can therefore be cheaply passed between processes.
+
+    Notes
+    -----
+    The node-ids used by the graph are assumed to start with 1 and be
+    continuous. Other than in `Graph`, n-weights can be appended with
+    `add_nweights`, in which case the same edge may occur multiple times; their
+    weights are summed by `to_gcgraph`.
+    """
+
+    __slots__ = (
+        "__nodes",
+        "__snodes",
+        "__tnodes",
+        "__edges",
+        "__nodes_from",
+        "__nodes_to",
+        "__weights_there",
+        "__weights_back",
+        "__tweights",
+        "__tweights_set",
+    )
+
+    # @var __UINT_16_BIT: The maximum value of unsigned int 16bit.
+    __UINT_16_BIT = 65535
+    # @var MAX The maximum value a weight can take.
+    MAX = __UINT_16_BIT
+
+    def __init__(self, nodes=0, edges=0):
+        r"""
+        Initialize.
+
+        Parameters
+        ----------
+        nodes : int
+            The number of nodes in the graph.
+        edges : int
+            The number of edges to reserve memory for. The arrays grow as
+            required, but a good estimate avoids reallocations.
+        """
+        self.__nodes = int(nodes)
+        self.__snodes = numpy.zeros(0, dtype=numpy.int32)
+        self.__tnodes = numpy.zeros(0, dtype=numpy.int32)
+        self.__edges = 0
+        self.__nodes_from = numpy.zeros(edges, dtype=numpy.int32)
+        self.__nodes_to = numpy.zeros(edges, dtype=numpy.int32)
+        self.__weights_there = numpy.zeros(edges, dtype=numpy.float64)
+        self.__weights_back = numpy.zeros(edges, dtype=numpy.float64)
+        self.__tweights = numpy.zeros((self.__nodes, 2), dtype=numpy.float64)
+        self.__tweights_set = numpy.zeros(self.__nodes, dtype=numpy.bool_)
+
+    def __getstate__(self):
+        return (
+            self.__nodes,
+            self.__snodes,
+            self.__tnodes,
+            self.get_nweights_arrays(),
+            self.get_tweights_arrays(),
+        )
+
+    def __setstate__(self, state):
+        nodes, snodes, tnodes, nweights, tweights = state
+        self.__init__(nodes, len(nweights[0]))
+        self.__snodes = snodes
+        self.__tnodes = tnodes
+        self.add_nweights(*nweights)
+        self.add_tweights_array(*tweights)
+
+    def set_nodes(self, nodes):
+        r"""
+        Set the number of graph nodes (starting from node-id = 1),
+        excluding sink and source.
+
+        Parameters
+        ----------
+        nodes : int
+            Number of nodes
+        """
+        self.__nodes = int(nodes)
+        self.__reserve_nodes(self.__nodes)
+
+    def set_source_nodes(self, source_nodes):
+        r"""
+        Set the source nodes and compute their t-weights.
+
+        Parameters
+        ----------
+        source_nodes : sequence of integers
+            Declare the source nodes via their ids.
+
+        Notes
+        -----
+        See `Graph.set_source_nodes`.
+        """
+        self.__snodes = self.__node_array(source_nodes)
+        self.add_tweights_array(self.__snodes, self.MAX, 0)
+
+    def set_sink_nodes(self, sink_nodes):
+        r"""
+        Set the sink nodes and compute their t-weights.
+
+        Parameters
+        ----------
+        sink_nodes : sequence of integers
+            Declare the sink nodes via their ids.
+
+        Notes
+        -----
+        See `Graph.set_sink_nodes`.
+        """
+        self.__tnodes = self.__node_array(sink_nodes)
+        self.add_tweights_array(self.__tnodes, 0, self.MAX)
+
+    def set_nweights(self, nweights):
+        r"""
+        Sets all n-weights, replacing the existing ones.
+
+        Parameters
+        ----------
+        nweights : dict
+            A dictionary with (node-id, node-id) tuples as keys and (weight-a-to-b, weight-b-to-a) as values.
+        """
+        self.__edges = 0
+        if 0 == len(nweights):
+            return
+        edges = numpy.asarray(list(nweights.keys())).reshape(-1, 2)
+        weights = numpy.asarray(list(nweights.values()), dtype=numpy.float64)
+        self.add_nweights(edges[:, 0], edges[:, 1], weights[:, 0], weights[:, 1])
+
+    def add_nweights(self, nodes_from, nodes_to, weights_there, weights_back):
+        r"""
+        Appends multiple n-weights given as arrays.
+
+        Parameters
+        ----------
+        nodes_from : array_like of integers
+            Node-ids from the first nodes of the edges.
+        nodes_to : array_like of integers
+            Node-ids from the second nodes of the edges.
+        weights_there : array_like of floats or float
+            Weights from first to second nodes.
+        weights_back : array_like of floats or float
+            Weights from second to first nodes.
+
+        Raises
+        ------
+        ValueError
+            If the arrays can not be broadcast to the same shape.
+        ValueError
+            If a node-id is lower than one.
+        """
+        nodes_from, nodes_to, weights_there, weights_back = numpy.broadcast_arrays(
+            self.__node_array(nodes_from),
+            self.__node_array(nodes_to),
+            numpy.asarray(weights_there, dtype=numpy.float64).ravel(),
+            numpy.asarray(weights_back, dtype=numpy.float64).ravel(),
+        )
+        start, stop = self.__edges, self.__edges + nodes_from.size
+        if stop > self.__nodes_from.size:
+            capacity = max(stop, 2 * self.__nodes_from.size)
+            self.__nodes_from = self.__resize(self.__nodes_from, capacity)
+            self.__nodes_to = self.__resize(self.__nodes_to, capacity)
+            self.__weights_there = self.__resize(self.__weights_there, capacity)
+            self.__weights_back = self.__resize(self.__weights_back, capacity)
+        self.__nodes_from[start:stop] = nodes_from
+        self.__nodes_to[start:stop] = nodes_to
+        self.__weights_there[start:stop] = weights_there
+        self.__weights_back[start:stop] = weights_back
+        self.__edges = stop
+
+    def add_tweights(self, tweights):
+        r"""
+        Adds t-weights to the current collection of t-weights, overwriting already
+        existing ones.
+
+        Parameters
+        ----------
+        tweights : dict
+            A dictionary with node_ids as keys and (weight-to-source, weight-to-sink) tuples as values.
+
+        Notes
+        -----
+        See `Graph.add_tweights`.
+        """
+        if 0 == len(tweights):
+            return
+        weights = numpy.asarray(list(tweights.values()), dtype=numpy.float64)
+        self.add_tweights_array(list(tweights.keys()), weights[:, 0], weights[:, 1])
+
+    def add_tweights_array(self, nodes, weights_source, weights_sink):
+        r"""
+        Adds t-weights given as arrays, overwriting already existing ones.
+
+        Parameters
+        ----------
+        nodes : array_like of integers
+            Node-ids for which to set the terminal weights.
+        weights_source : array_like of floats or float
+            Weights to source terminal.
+        weights_sink : array_like of floats or float
+            Weights to sink terminal.
+
+        Raises
+        ------
+        ValueError
+            If the arrays can not be broadcast to the same shape.
+        ValueError
+            If a node-id is lower than one.
+        """
+        nodes, weights_source, weights_sink = numpy.broadcast_arrays(
+            self.__node_array(nodes),
+            numpy.asarray(weights_source, dtype=numpy.float64).ravel(),
+            numpy.asarray(weights_sink, dtype=numpy.float64).ravel(),
+        )
+        if 0 == nodes.size:
+            return
+        self.__reserve_nodes(nodes.max())
+        self.__tweights[nodes - 1, 0] = weights_source
+        self.__tweights[nodes - 1, 1] = weights_sink
+        self.__tweights_set[nodes - 1] = True
+
+    def get_node_count(self):
+        r"""
+        Get the number of nodes.
+
+        Returns
+        -------
+        node_count : int
+            The number of nodes (excluding sink and source).
+        """
+        return self.__nodes
+
+    def get_nodes(self):
+        r"""
+        Get the nodes.
+
+        Returns
+        -------
+        nodes : list
+            All nodes as an ordered list.
+        """
+        return list(range(1, self.__nodes + 1))
+
+    def get_source_nodes(self):
+        r"""
+        Get the source nodes.
+
+        Returns
+        -------
+        source_nodes : list
+            All nodes that are connected with the source as an unordered list (excluding sink and source).
+        """
+        return self.__snodes.tolist()
+
+    def get_sink_nodes(self):
+        r"""
+        Get the sink nodes.
+
+        Returns
+        -------
+        sink_nodes : list
+            All nodes that are connected with the sink as an unordered list (excluding sink and source).
+        """
+        return self.__tnodes.tolist()
+
+    def get_edge_count(self):
+        r"""
+        Get the number of edges.
+
+        Returns
+        -------
+        edge_count : int
+            The number of edges.
+        """
+        return self.__edges
+
+    def get_edges(self):
+        r"""
+        Get the edges.
+
+        Returns
+        -------
+        edges : list
+            All edges as ordered list of tuples (i.e. [(node_id1, node_id2), (..), ...].
+        """
+        nodes_from, nodes_to, _, _ = self.get_nweights_arrays()
+        return list(zip(nodes_from.tolist(), nodes_to.tolist()))
+
+    def get_nweights(self):
+        r"""
+        Get the nweights.
+
+        Returns
+        -------
+        nweights : dict
+            All n-weights (inter-node weights) as {edge-tuple: (weight, weight_reverersed)...} dict.
+
+        Notes
+        -----
+        The dictionary is created on each call, use `get_nweights_arrays` for
+        large graphs.
+        """
+        _, _, weights_there, weights_back = self.get_nweights_arrays()
+        return dict(
+            zip(self.get_edges(), zip(weights_there.tolist(), weights_back.tolist()))
+        )
+
+    def get_nweights_arrays(self):
+        r"""
+        Get the nweights as arrays.
+
+        Returns
+        -------
+        nodes_from : ndarray
+            The node-ids of the first nodes of the edges.
+        nodes_to : ndarray
+            The node-ids of the second nodes of the edges.
+        weights_there : ndarray
+            The weights from the first to the second nodes.
+        weights_back : ndarray
+            The weights from the second to the first nodes.
+        """
+        return (
+            self.__nodes_from[: self.__edges],
+            self.__nodes_to[: self.__edges],
+            self.__weights_there[: self.__edges],
+            self.__weights_back[: self.__edges],
+        )
+
+    def get_tweights(self):
+        r"""
+        Get the tweights.
+
+        Returns
+        -------
+        tweights : dict
+            All t-weights (terminal-node weights) as {node_id: (weight-source-node, weight-node-sink), ...} dict.
+
+        Notes
+        -----
+        Returns only the t-weights that have been set so far. For nodes with unset t-weight, no entry is returned.
+        """
+        nodes, weights_source, weights_sink = self.get_tweights_arrays()
+        return dict(
+            zip(nodes.tolist(), zip(weights_source.tolist(), weights_sink.tolist()))
+        )
+
+    def get_tweights_arrays(self):
+        r"""
+        Get the tweights as arrays.
+
+        Returns
+        -------
+        nodes : ndarray
+            The ids of all nodes with a t-weight set, in ascending order.
+        weights_source : ndarray
+            Their weights to the source terminal.
+        weights_sink : ndarray
+            Their weights to the sink terminal.
+        """
+        indices = numpy.flatnonzero(self.__tweights_set)
+        return (
+            (indices + 1).astype(numpy.int32),
+            self.__tweights[indices, 0],
+            self.__tweights[indices, 1],
+        )
+
+    def inconsistent(self):
+        r"""
+        Perform some consistency tests on the graph represented by this object
+
+        Returns
+        -------
+        consistent : bool or list
+            False if consistent, else a list of inconsistency messages.
+        """
+        messages = []
+        tnodes, _, _ = self.get_tweights_arrays()
+        for node in tnodes[tnodes > self.__nodes]:
+            messages.append("Node {} in t-weights but not in nodes.".format(node))
+        for node in self.__snodes[self.__snodes > self.__nodes]:
+            messages.append("Node {} in s-nodes but not in nodes.".format(node))
+        for node in self.__tnodes[self.__tnodes > self.__nodes]:
+            messages.append("Node {} in t-nodes but not in nodes.".format(node))
+        nodes_from, nodes_to, _, _ = self.get_nweights_arrays()
+        invalid_from = nodes_from > self.__nodes
+        invalid_to = nodes_to > self.__nodes
+        # look up the reversed edges among the sorted unique edges
+        base = max(self.__nodes, nodes_from.max(initial=0), nodes_to.max(initial=0))
+        keys = numpy.unique(nodes_from.astype(numpy.int64) * (base + 1) + nodes_to)
+        reversed_keys = nodes_to.astype(numpy.int64) * (base + 1) + nodes_from
+        positions = numpy.searchsorted(keys, reversed_keys)
+        reversed_present = positions < keys.size
+        reversed_present[reversed_present] = (
+            keys[positions[reversed_present]] == reversed_keys[reversed_present]
+        )
+        # only the offending edges are visited to compose the messages
+        for idx in numpy.flatnonzero(invalid_from | invalid_to | reversed_present):
+            e = (int(nodes_from[idx]), int(nodes_to[idx]))
+            if invalid_from[idx]:
+                messages.append("Node {} in edge {} but not in nodes.".format(e[0], e))
+            if invalid_to[idx]:
+                messages.append("Node {} in edge {} but not in nodes.".format(e[1], e))
+            if reversed_present[idx]:
+                messages.append(
+                    "The reversed edges of {} is also in the n-weights.".format(e)
+                )
+
+        if 0 == len(messages):
+            return False
+        else:
+            return messages
+
+    def to_gcgraph(self):
+        r"""
+        Convert into a `GCGraph` that can be cut directly.
+
+        The node-ids are shifted by one to start with zero, as required by `GCGraph`.
+        Edges with both weights zero are omitted.
+
+        Returns
+        -------
+        gcgraph : GCGraph
+            The graph-cut graph.
+
+        Raises
+        ------
+        ValueError
+            If a node-id exceeds the number of nodes.
+        ValueError
+            If an edge connects a node with itself.
+        ValueError
+            If a n-weight is negative.
+        """
+        nodes_from, nodes_to, weights_there, weights_back = self.get_nweights_arrays()
+        mask = (weights_there != 0) | (weights_back != 0)
+        nodes_from, nodes_to = nodes_from[mask] - 1, nodes_to[mask] - 1
+        weights_there, weights_back = weights_there[mask], weights_back[mask]
+        for nodes in (nodes_from, nodes_to):
+            if nodes.size and nodes.max() >= self.__nodes:
+                raise ValueError(
+                    "Invalid node id {}. Valid values are 1 to {}.".format(
+                        nodes.max() + 1, self.__nodes
+                    )
+                )
+        if numpy.any(nodes_from == nodes_to):
+            raise ValueError(
+                "The nodes_from can not be equal to the nodes_to (self-connections are forbidden in graph cuts)."
+            )
+        if numpy.any(weights_there < 0) or numpy.any(weights_back < 0):
+            raise ValueError("Negative weights are not allowed.")
+
+        gcgraph = GCGraph(self.__nodes, len(nodes_from))
+        if len(nodes_from):
+            gcgraph.get_graph().sum_edges(
+                numpy.ascontiguousarray(nodes_from, dtype=numpy.int32),
+                numpy.ascontiguousarray(nodes_to, dtype=numpy.int32),
+                numpy.ascontiguousarray(weights_there),
+                numpy.ascontiguousarray(weights_back),
+            )
+        nodes, weights_source, weights_sink = self.get_tweights_arrays()
+        gcgraph.set_tweights_array(nodes - 1, weights_source, weights_sink)
+        return gcgraph
+
+    def __reserve_nodes(self, nodes):
+        r"""Grow the t-weight arrays to hold at least the passed number of nodes."""
+        if nodes > len(self.__tweights_set):
+            capacity = max(nodes, 2 * len(self.__tweights_set))
+            self.__tweights = self.__resize(self.__tweights, capacity)
+            self.__tweights_set = self.__resize(self.__tweights_set, capacity)
+
+    @staticmethod
+    def __resize(array, capacity):
+        r"""Return a zero-padded copy of the array with the first dimension of size capacity."""
+        resized = numpy.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+        resized[: len(array)] = array[:capacity]
+        return resized
+
+    @staticmethod
+    def __node_array(nodes):
+        r"""Convert node-ids into a flat int32 array, making sure they are valid."""
+        nodes = numpy.asarray(nodes, dtype=numpy.int32).ravel()
+        if nodes.size and nodes.min() < 1:
+            raise ValueError(
+                "Invalid node id {}. Node ids start with 1.".format(nodes.min())
+            )
+        return nodes
+
+
 class GCGraph:
     r"""
     A graph representation that works directly with the maxflow.GraphDouble graph as
@@ -283,6 +782,7 @@ class GCGraph:
     underlying C++ implementation and to convert them into catchable and meaningful
     error messages.
     """
+
     # @var __INT_16_BIT The maximum value of signed int 16bit.
     __INT_16_BIT = 32767
     # @var __UINT_16_BIT: The maximum value of unsigned int 16bit.
@@ -291,7 +791,7 @@ class GCGraph:
     MAX = __UINT_16_BIT
     """The maximum value a terminal weight can take."""
 
-    def __init__(self, nodes, edges):
+    def __init__(self, nodes, edges, topology=None):
         r"""
         Initialize.
 
@@ -301,11 +801,14 @@ class GCGraph:
             The number of nodes in the graph.
         edges : int
             The number of edges in the graph.
+        topology : `~medpy.graphcut.topology.VoxelTopology`, optional
+            The voxel topology the graph has been created for, if any.
         """
         self.__graph = GraphDouble(nodes, edges)
         self.__graph.add_node(nodes)
         self.__nodes = nodes
         self.__edges = edges
+        self.__topology = topology
 
     def set_source_nodes(self, source_nodes):
         r"""
@@ -331,17 +834,10 @@ class GCGraph:
         case the order of setting the terminal nodes can affect the graph and therefore
         the graph-cut result.
         """
-        if max(source_nodes) >= self.__nodes or min(source_nodes) < 0:
-            raise ValueError(
-                "Invalid node id of {} or {}. Valid values are 0 to {}.".format(
-                    max(source_nodes), min(source_nodes), self.__nodes - 1
-                )
-            )
         # set the source-to-node weights (t-weights)
-        for snode in source_nodes:
-            self.__graph.add_tweights(
-                int(snode), self.MAX, 0
-            )  # (weight-to-source, weight-to-sink)
+        self.set_tweights_array(
+            source_nodes, self.MAX, 0
+        )  # (weight-to-source, weight-to-sink)
 
     def set_sink_nodes(self, sink_nodes):
         r"""
@@ -367,17 +863,10 @@ class GCGraph:
         case the order of setting the terminal nodes can affect the graph and therefore
         the graph-cut result.
         """
-        if max(sink_nodes) >= self.__nodes or min(sink_nodes) < 0:
-            raise ValueError(
-                "Invalid node id of {} or {}. Valid values are 0 to {}.".format(
-                    max(sink_nodes), min(sink_nodes), self.__nodes - 1
-                )
-            )
         # set the node-to-sink weights (t-weights)
-        for snode in sink_nodes:
-            self.__graph.add_tweights(
-                int(snode), 0, self.MAX
-            )  # (weight-to-source, weight-to-sink)
+        self.set_tweights_array(
+            sink_nodes, 0, self.MAX
+        )  # (weight-to-source, weight-to-sink)
 
     def set_nweight(self, node_from, node_to, weight_there, weight_back):
         r"""
@@ -459,6 +948,76 @@ class GCGraph:
         for edge, weight in list(nweights.items()):
             self.set_nweight(edge[0], edge[1], weight[0], weight[1])
 
+    def set_nweights_array(self, nodes_from, nodes_to, weights_there, weights_back):
+        r"""
+        Set multiple n-weights / edge-weights given as arrays.
+
+        Other than `set_nweights`, all edges are passed to the underlying C++
+        implementation in a single call, which makes this the method of choice for
+        large numbers of edges.
+
+        Parameters
+        ----------
+        nodes_from : array_like of integers
+            Node-ids from the first nodes of the edges.
+        nodes_to : array_like of integers
+            Node-ids from the second nodes of the edges.
+        weights_there : array_like of floats or float
+            Weights from first to second nodes (>0).
+        weights_back : array_like of floats or float
+            Weights from second to first nodes (>0).
+
+        Raises
+        ------
+        ValueError
+            If the arrays can not be broadcast to the same shape.
+        ValueError
+            If a passed node id does not refer to any node of the graph
+            (i.e. it is either higher than the initially set number of
+            nodes or lower than zero).
+        ValueError
+            If the two node-ids of an edge are the same (graph cut does
+            not allow self-edges).
+        ValueError
+            If one of the passed weights is <= 0.
+
+        Notes
+        -----
+        The object does not check if the number of supplied edges in total exceeds
+        the number passed to the init-method. If this is the case, the underlying
+        C++ implementation will double the memory, which is very inefficient.
+
+        See `set_nweight` for details.
+        """
+        nodes_from, nodes_to, weights_there, weights_back = numpy.broadcast_arrays(
+            *[
+                numpy.asarray(x).ravel()
+                for x in (nodes_from, nodes_to, weights_there, weights_back)
+            ]
+        )
+        if 0 == nodes_from.size:
+            return
+        for name, nodes in (("nodes_from", nodes_from), ("nodes_to", nodes_to)):
+            invalid = nodes.max() if nodes.max() >= self.__nodes else nodes.min()
+            if invalid >= self.__nodes or invalid < 0:
+                raise ValueError(
+                    "Invalid node id {} in {}. Valid values are 0 to {}.".format(
+                        invalid, name, self.__nodes - 1
+                    )
+                )
+        if numpy.any(nodes_from == nodes_to):
+            raise ValueError(
+                "The nodes_from can not be equal to the nodes_to (self-connections are forbidden in graph cuts)."
+            )
+        if numpy.any(weights_there <= 0) or numpy.any(weights_back <= 0):
+            raise ValueError("Negative or zero weights are not allowed.")
+        self.__graph.sum_edges(
+            numpy.ascontiguousarray(nodes_from, dtype=numpy.int32),
+            numpy.ascontiguousarray(nodes_to, dtype=numpy.int32),
+            numpy.ascontiguousarray(weights_there, dtype=numpy.float64),
+            numpy.ascontiguousarray(weights_back, dtype=numpy.float64),
+        )
+
     def set_tweight(self, node, weight_source, weight_sink):
         r"""
         Set a single t-weight / terminal-weight.
@@ -524,10 +1083,12 @@ class GCGraph:
         are best set using `set_source_nodes` or `set_sink_nodes` to ensure
         consistency of their maximum values.
         """
-        for node, weight in list(tweights.items()):
-            self.set_tweight(
-                node, weight[0], weight[1]
-            )  # (weight-to-source, weight-to-sink)
+        if 0 == len(tweights):
+            return
+        weights = numpy.asarray(list(tweights.values()), dtype=numpy.float64)
+        self.set_tweights_array(
+            list(tweights.keys()), weights[:, 0], weights[:, 1]
+        )  # (weight-to-source, weight-to-sink)
 
     def set_tweights_all(self, tweights):
         r"""
@@ -548,8 +1109,133 @@ class GCGraph:
         are best set using `set_source_nodes` or `set_sink_nodes` to ensure
         consistency of their maximum values.
         """
-        for node, (twsource, twsink) in enumerate(tweights):
-            self.set_tweight(node, twsource, twsink)  # source = FG, sink = BG
+        if not isinstance(tweights, numpy.ndarray):
+            tweights = list(tweights)
+        tweights = numpy.asarray(tweights, dtype=numpy.float64).reshape(-1, 2)
+        self.set_tweights_array(
+            numpy.arange(len(tweights)), tweights[:, 0], tweights[:, 1]
+        )  # source = FG, sink = BG
+
+    def set_tweights_array(self, nodes, weights_source, weights_sink):
+        r"""
+        Set multiple t-weights / terminal-weights given as arrays.
+
+        Other than `set_tweights`, all weights are passed to the underlying C++
+        implementation in a single call, which makes this the method of choice for
+        large numbers of nodes.
+
+        Parameters
+        ----------
+        nodes : array_like of integers
+            Node-ids for which to set the terminal weights.
+        weights_source : array_like of floats or float
+            Weights to source terminal.
+        weights_sink : array_like of floats or float
+            Weights to sink terminal.
+
+        Raises
+        ------
+        ValueError
+            If the arrays can not be broadcast to the same shape.
+        ValueError
+            If a passed node id does not refer to any node of the graph
+            (i.e. it is either higher than the initially set number of
+            nodes or lower than zero).
+
+        Notes
+        -----
+        As with `set_tweight`, terminal weights can be zero or negative and are
+        added to already existing ones.
+        """
+        nodes, weights_source, weights_sink = numpy.broadcast_arrays(
+            *[numpy.asarray(x).ravel() for x in (nodes, weights_source, weights_sink)]
+        )
+        if 0 == nodes.size:
+            return
+        invalid = nodes.max() if nodes.max() >= self.__nodes else nodes.min()
+        if invalid >= self.__nodes or invalid < 0:
+            raise ValueError(
+                "Invalid node id {} in nodes. Valid values are 0 to {}.".format(
+                    invalid, self.__nodes - 1
+                )
+            )
+        self.__graph.add_tweights_array(
+            numpy.ascontiguousarray(nodes, dtype=numpy.int32),
+            numpy.ascontiguousarray(weights_source, dtype=numpy.float64),
+            numpy.ascontiguousarray(weights_sink, dtype=numpy.float64),
+        )
+
+    def update_tweights(self, nodes, weights_source, weights_sink):
+        r"""
+        Add t-weights / terminal-weights after a cut, to re-cut incrementally.
+
+        Works like `set_tweights_array`, but additionally marks the nodes as changed,
+        such that a subsequent ``maxflow(reuse_trees=True)`` only recomputes the part
+        of the flow affected by the changed terminal weights. Use e.g. to add new
+        foreground or background markers in interactive segmentation.
+
+        Parameters
+        ----------
+        nodes : array_like of integers
+            Node-ids for which to add the terminal weights.
+        weights_source : array_like of floats or float
+            Weights to source terminal.
+        weights_sink : array_like of floats or float
+            Weights to sink terminal.
+
+        Raises
+        ------
+        ValueError
+            If the arrays can not be broadcast to the same shape.
+        ValueError
+            If a passed node id does not refer to any node of the graph
+            (i.e. it is either higher than the initially set number of
+            nodes or lower than zero).
+
+        Notes
+        -----
+        The weights are added to the residual terminal capacities left by the
+        previous cut. To turn a node into a hard source node, pass a source weight
+        of `MAX`.
+        """
+        self.set_tweights_array(nodes, weights_source, weights_sink)
+        self.__graph.mark_nodes(
+            numpy.ascontiguousarray(numpy.asarray(nodes).ravel(), dtype=numpy.int32)
+        )
+
+    def maxflow(self, reuse_trees=False):
+        r"""
+        Compute the min-cut/max-flow of the graph.
+
+        Parameters
+        ----------
+        reuse_trees : bool
+            Reuse the search trees of the previous computation, such that only the
+            part of the graph marked as changed by `update_tweights` is processed.
+            Ignored in the first computation after initialization or `reset`.
+
+        Returns
+        -------
+        maxflow : float
+            The value of the maximum flow, i.e. the cost of the minimum cut.
+
+        Notes
+        -----
+        To which terminal a node has been assigned can be queried with the
+        ``what_segment`` method of the underlying graph (see `get_graph`).
+        """
+        return self.__graph.maxflow(bool(reuse_trees))
+
+    def reset(self):
+        r"""
+        Remove all n- and t-weights from the graph.
+
+        The graph returns to the state just after initialization, with all nodes
+        declared, but keeps its allocated memory. Cheaper than creating a new graph
+        when cutting repeatedly over the same nodes and edges.
+        """
+        self.__graph.reset()
+        self.__graph.add_node(self.__nodes)
 
     def get_graph(self):
         r"""
@@ -584,6 +1270,18 @@ class GCGraph:
         """
         return list(range(0, self.__nodes))
 
+    def get_topology(self):
+        r"""
+        Get the voxel topology.
+
+        Returns
+        -------
+        topology : `~medpy.graphcut.topology.VoxelTopology` or None
+            The voxel topology the graph has been created for, or `None` if the graph
+            has not been created for a voxel grid.
+        """
+        return self.__topology
+
     def get_edge_count(self):
         r"""
         Get the number of edges.
@@ -0,0 +1,198 @@
+# Copyright (C) 2013 Oskar Maier
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# author Oskar Maier
+# version r0.1.0
+# since 2026-10-16
+# status Release
+
+# build-in modules
+import gzip
+import io
+import os
+
+# third-party modules
+import numpy
+
+# own modules
+from .graph import ArrayGraph
+
+# code
+# descriptors of the non-arc lines of a dimacs file
+__DESCRIPTORS = ("c", "p", "n")
+
+
+def graph_from_dimacs(f, gcgraph=False, buffersize=4194304):
+    r"""
+    Reads a graph persisted in dimacs max-flow format.
+
+    The file is parsed in blocks of about ``buffersize`` characters, each of which is
+    converted with NumPy, which makes reading graphs with millions of edges feasible.
+
+    Parameters
+    ----------
+    f : file or str
+        A file-like object or the path of the file to read. Gzip compressed files
+        are detected and decompressed automatically.
+    gcgraph : bool
+        Whether to return a `~medpy.graphcut.graph.GCGraph`, ready to be cut,
+        instead of an `~medpy.graphcut.graph.ArrayGraph`.
+    buffersize : int
+        The approximate number of characters to parse at once.
+
+    Returns
+    -------
+    graph : `~medpy.graphcut.graph.ArrayGraph` or `~medpy.graphcut.graph.GCGraph`
+        The graph.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a valid dimacs max-flow file.
+
+    Notes
+    -----
+    The nodes are numbered in the order of their dimacs ids, skipping the source
+    and the sink. For files written by `~medpy.graphcut.write.graph_to_dimacs`, the
+    node ids of the original graph are therefore retained.
+
+    Arcs between the same two nodes are combined into a single edge and the
+    weights of terminal arcs are summed. Arcs into the source or out of the sink
+    can not carry any flow and are dropped, while the capacity of arcs from the
+    source directly to the sink is added to both t-weights of the first node, which
+    retains the max-flow. As the dimacs format does not distinguish
+    the source and sink nodes from other nodes with terminal weights,
+    `~medpy.graphcut.graph.ArrayGraph.get_source_nodes` and
+    `~medpy.graphcut.graph.ArrayGraph.get_sink_nodes` of the returned graph are
+    empty.
+    """
+    if isinstance(f, (str, os.PathLike)):
+        with open(f, "rb") as fh:
+            compressed = b"\x1f\x8b" == fh.read(2)
+        opener = gzip.open if compressed else open
+        with opener(f, "rt") as fh:
+            return graph_from_dimacs(fh, gcgraph, buffersize)
+
+    problem = None
+    terminals = {}
+    arcs = []
+    while True:
+        block = f.read(buffersize)
+        if not block:
+            break
+        block += f.readline()
+        if not block.startswith("a") or any("\n" + d in block for d in __DESCRIPTORS):
+            lines = block.splitlines(True)
+            for line in lines:
+                if line.startswith("p"):
+                    problem = line.split()
+                elif line.startswith("n"):
+                    _, node, terminal = line.split()
+                    terminals[terminal] = int(node)
+            block = "".join(line for line in lines if line.startswith("a"))
+        if block:
+            arcs.append(__parse_arcs(block))
+
+    if problem is None or len(problem) != 4 or "max" != problem[1]:
+        raise ValueError("The file contains no valid max-flow problem line.")
+    if "s" not in terminals or "t" not in terminals:
+        raise ValueError("The file does not denote the source and sink nodes.")
+    nodes = int(problem[2]) - 2
+    source, sink = terminals["s"], terminals["t"]
+
+    arcs = numpy.concatenate(arcs) if arcs else numpy.zeros((0, 3))
+    tails, heads = arcs[:, 0].astype(numpy.int64), arcs[:, 1].astype(numpy.int64)
+    weights = arcs[:, 2]
+
+    # terminal arcs (t-weights), with the terminals possibly on either end
+    tail_terminal = (tails == source) | (tails == sink)
+    head_terminal = (heads == source) | (heads == sink)
+    from_source = (tails == source) & ~head_terminal
+    to_sink = (heads == sink) & ~tail_terminal
+    tnodes = __node_ids(
+        numpy.concatenate((heads[from_source], tails[to_sink])), source, sink
+    )
+    weights_source = numpy.concatenate(
+        (weights[from_source], numpy.zeros(numpy.count_nonzero(to_sink)))
+    )
+    weights_sink = numpy.concatenate(
+        (numpy.zeros(numpy.count_nonzero(from_source)), weights[to_sink])
+    )
+    # arcs from the source directly to the sink always carry their full capacity,
+    # just as equal source and sink t-weights of a node do
+    direct = weights[(tails == source) & (heads == sink)].sum()
+    if 0 != direct and 0 < nodes:
+        tnodes = numpy.append(tnodes, 1)
+        weights_source = numpy.append(weights_source, direct)
+        weights_sink = numpy.append(weights_sink, direct)
+    tnodes, weights_source, weights_sink = __combine(
+        [tnodes], [weights_source, weights_sink]
+    )
+
+    # inter-node arcs (n-weights), combined to one edge per pair of nodes
+    # Note: arcs into the source or out of the sink never cross a cut from the
+    #       source to the sink side and are hence dropped
+    internal = ~(tail_terminal | head_terminal)
+    tails = __node_ids(tails[internal], source, sink)
+    heads = __node_ids(heads[internal], source, sink)
+    weights = weights[internal]
+    forward = tails < heads
+    nodes_from = numpy.where(forward, tails, heads)
+    nodes_to = numpy.where(forward, heads, tails)
+    nodes_from, nodes_to, weights_there, weights_back = __combine(
+        [nodes_from, nodes_to],
+        [numpy.where(forward, weights, 0), numpy.where(forward, 0, weights)],
+    )
+
+    graph = ArrayGraph(nodes, len(nodes_from))
+    graph.add_nweights(nodes_from, nodes_to, weights_there, weights_back)
+    graph.add_tweights_array(tnodes, weights_source, weights_sink)
+    return graph.to_gcgraph() if gcgraph else graph
+
+
+def __parse_arcs(block):
+    r"""
+    Parse a block of arc descriptor lines into a (n, 3) array.
+    """
+    try:
+        return numpy.loadtxt(io.StringIO(block), usecols=(1, 2, 3), ndmin=2)
+    except ValueError as e:
+        raise ValueError("Invalid arc descriptor in file: {}".format(e))
+
+
+def __node_ids(ids, source, sink):
+    r"""
+    Convert dimacs node ids into graph node ids, starting at 1 and skipping the terminals.
+    """
+    return ids - (ids > source) - (ids > sink)
+
+
+def __combine(keys, values):
+    r"""
+    Combine entries with the same keys, summing their values.
+    """
+    keys = [numpy.asarray(k, dtype=numpy.int64) for k in keys]
+    base = max([k.max(initial=0) for k in keys]) + 1
+    linear = numpy.zeros(len(keys[0]), dtype=numpy.int64)
+    for k in keys:
+        linear = linear * base + k
+    unique, inverse = numpy.unique(linear, return_inverse=True)
+    combined = []
+    for _ in keys:
+        combined.insert(0, unique % base)
+        unique = unique // base
+    return combined + [
+        numpy.bincount(inverse, weights=v, minlength=len(combined[0])) for v in values
+    ]
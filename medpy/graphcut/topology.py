@@ -0,0 +1,514 @@
+# Copyright (C) 2013 Oskar Maier
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# author Oskar Maier
+# version r0.1.0
+# since 2026-10-16
+# status Release
+
+# build-in modules
+import functools
+
+# third-party modules
+import numpy
+
+# own modules
+from .graph import GCGraph
+
+
+# code
+class VoxelTopology(object):
+    r"""
+    The structure of a voxel based graph, independent of its weights.
+
+    Holds, for each neighbourhood offset, the node ids of all neighbouring voxel pairs
+    of an image of a given shape, ready to be passed to
+    `~medpy.graphcut.graph.GCGraph.set_nweights_array`. Node ids follow the C-order
+    of the voxels, as used by `~medpy.graphcut.generate.graph_from_voxels`.
+
+    Do not create instances directly, but obtain them via `voxel_topology`. The node
+    ids of an unrestricted topology are computed on first access of ``nodes_from`` or
+    ``nodes_to`` and are read-only, as topologies can be shared.
+
+    Parameters
+    ----------
+    shape : tuple of ints
+        The image shape.
+    connectivity : int or tuple of tuples
+        The neighbourhood connectivity or the offsets of a custom stencil.
+    offsets : list of tuples
+        The neighbourhood offsets, each covering one direction of the voxel pairs.
+    slicers : list of tuples
+        For each offset, the pair of slicers selecting the first and the second
+        voxels of all voxel pairs from an image.
+    nodes_from : list of ndarrays, optional
+        For each offset, the node ids of the first voxels as int32 array. Computed
+        from the slicers if not supplied.
+    nodes_to : list of ndarrays, optional
+        For each offset, the node ids of the second voxels as int32 array. Computed
+        from the slicers if not supplied.
+    roi : ndarray, optional
+        A boolean mask of the voxels that are represented by nodes. If `None`, all
+        voxels are. See `restrict`.
+    exterior : ndarray, optional
+        A boolean mask of the voxels outside of the ``roi`` that belong to the
+        foreground.
+    borders : list of tuples, optional
+        For each offset, the voxel pairs with only one voxel inside the ``roi``: the
+        flat indices of their first and second voxels, the node ids of the voxels
+        inside and whether the voxels outside belong to the foreground.
+
+    Examples
+    --------
+    >>> topology = voxel_topology((2, 3))
+    >>> topology.node_count, topology.edge_count
+    (6, 7)
+    >>> topology.offsets
+    [(1, 0), (0, 1)]
+    >>> topology.nodes_from[0], topology.nodes_to[0]
+    (array([0, 1, 2], dtype=int32), array([3, 4, 5], dtype=int32))
+    """
+
+    def __init__(
+        self,
+        shape,
+        connectivity,
+        offsets,
+        slicers,
+        nodes_from=None,
+        nodes_to=None,
+        roi=None,
+        exterior=None,
+        borders=None,
+    ):
+        self.shape = shape
+        self.connectivity = connectivity
+        self.offsets = offsets
+        self.slicers = slicers
+        self.__nodes_from = nodes_from
+        self.__nodes_to = nodes_to
+        self.roi = roi
+        self.exterior = exterior
+        self.borders = borders
+
+    @property
+    def nodes_from(self):
+        r"""
+        For each offset, the node ids of the first voxels of the voxel pairs.
+        """
+        if self.__nodes_from is None:
+            self.__compute_nodes()
+        return self.__nodes_from
+
+    @property
+    def nodes_to(self):
+        r"""
+        For each offset, the node ids of the second voxels of the voxel pairs.
+        """
+        if self.__nodes_to is None:
+            self.__compute_nodes()
+        return self.__nodes_to
+
+    @property
+    def node_count(self):
+        r"""
+        The number of nodes, i.e. voxels inside the region of interest.
+        """
+        if self.roi is None:
+            return int(numpy.prod(self.shape))
+        return int(numpy.count_nonzero(self.roi))
+
+    @property
+    def edge_count(self):
+        r"""
+        The number of edges, i.e. neighbouring voxel pairs.
+        """
+        if self.__nodes_from is not None:
+            return int(sum(len(nodes) for nodes in self.__nodes_from))
+        return int(
+            sum(
+                numpy.prod([len(range(self.shape[i])[s]) for i, s in enumerate(slicer)])
+                for slicer, _ in self.slicers
+            )
+        )
+
+    def distances(self, spacing=False):
+        r"""
+        The length of the neighbourhood offsets.
+
+        Parameters
+        ----------
+        spacing : sequence of floats, False or None
+            The voxel spacing. If `False` or `None`, a spacing of 1 is assumed along
+            all axes.
+
+        Returns
+        -------
+        distances : list of floats
+            For each offset, the euclidean distance between the voxels of a pair.
+        """
+        if spacing is None or spacing is False:
+            spacing = numpy.ones(len(self.shape))
+        spacing = numpy.asarray(spacing, dtype=numpy.float64)
+        return [
+            float(numpy.sqrt(numpy.sum(numpy.square(numpy.multiply(offset, spacing)))))
+            for offset in self.offsets
+        ]
+
+    def restrict(self, roi_mask, foreground=None):
+        r"""
+        Restrict the topology to a region of interest.
+
+        Only the voxels inside the region of interest become nodes, numbered
+        consecutively in C-order, and only voxel pairs with both voxels inside are
+        connected by edges. The voxels outside are fixed to a terminal: to the source,
+        if marked as foreground, otherwise to the sink. The voxel pairs crossing the
+        border of the region therefore turn into terminal edges of their inner voxel.
+
+        The edges are built from the voxels of the region of interest only, such that
+        the memory required besides the masks grows with the size of the region
+        rather than with the size of the image.
+
+        Parameters
+        ----------
+        roi_mask : array_like
+            A boolean mask of the image shape, `True` for the voxels to segment.
+        foreground : array_like, optional
+            A boolean mask of the image shape, marking the voxels outside of the
+            region of interest that belong to the foreground. Usually the foreground
+            markers.
+
+        Returns
+        -------
+        topology : VoxelTopology
+            A new, uncached topology object.
+
+        Raises
+        ------
+        ValueError
+            If the masks do not match the topology shape or the region of interest is
+            empty.
+        """
+        roi = numpy.asarray(roi_mask, dtype=numpy.bool_)
+        if foreground is None:
+            foreground = numpy.zeros(self.shape, dtype=numpy.bool_)
+        exterior = numpy.asarray(foreground, dtype=numpy.bool_) & ~roi
+        if not roi.shape == self.shape or not exterior.shape == self.shape:
+            raise ValueError(
+                "The masks must be of the topology shape {}.".format(self.shape)
+            )
+        if not numpy.any(roi):
+            raise ValueError("The region of interest must not be empty.")
+
+        # work on the voxels of the region only, such that the memory requirements
+        # grow with its size rather than with the image size
+        voxels = numpy.flatnonzero(roi)
+        coordinates = numpy.stack(numpy.unravel_index(voxels, self.shape), axis=1)
+        nodes = numpy.arange(len(voxels), dtype=numpy.int32)
+        strides = numpy.cumprod((1,) + self.shape[:0:-1])[::-1]
+        inside, exterior_flat = roi.ravel(), exterior.ravel()
+        nodes_from, nodes_to, borders = [], [], []
+        for offset in self.offsets:
+            offset = numpy.asarray(offset)
+            stride = int(numpy.dot(offset, strides))
+
+            # the voxel pairs with a voxel of the region as first voxel
+            second = coordinates + offset
+            valid = numpy.all((second >= 0) & (second < self.shape), axis=1)
+            first_nodes, second_voxels = nodes[valid], voxels[valid] + stride
+            second_inside = inside[second_voxels]
+            nodes_from.append(first_nodes[second_inside])
+            nodes_to.append(
+                numpy.searchsorted(voxels, second_voxels[second_inside]).astype(
+                    numpy.int32
+                )
+            )
+
+            # the voxel pairs with a voxel of the region as second voxel only
+            first = coordinates - offset
+            valid = numpy.all((first >= 0) & (first < self.shape), axis=1)
+            first_voxels = voxels[valid] - stride
+            first_outside = ~inside[first_voxels]
+
+            # the border pairs, given by the flat indices of their first and second
+            # voxel, the node of their inner voxel and the label of their outer voxel
+            second_outside = ~second_inside
+            outer_second = second_voxels[second_outside]
+            outer_first = first_voxels[first_outside]
+            borders.append(
+                (
+                    numpy.concatenate((outer_second - stride, outer_first)),
+                    numpy.concatenate((outer_second, outer_first + stride)),
+                    numpy.concatenate(
+                        (first_nodes[second_outside], nodes[valid][first_outside])
+                    ),
+                    numpy.concatenate(
+                        (exterior_flat[outer_second], exterior_flat[outer_first])
+                    ),
+                )
+            )
+        return VoxelTopology(
+            self.shape,
+            self.connectivity,
+            self.offsets,
+            self.slicers,
+            nodes_from,
+            nodes_to,
+            roi,
+            exterior,
+            borders,
+        )
+
+    def node_values(self, image):
+        r"""
+        The values of an image at the voxels of the nodes.
+
+        Parameters
+        ----------
+        image : array_like
+            An image of the topology shape.
+
+        Returns
+        -------
+        values : ndarray
+            A one-dimensional array holding the value of each node's voxel, ordered by
+            node id.
+        """
+        image = numpy.asarray(image)
+        if self.roi is None:
+            return image.ravel()
+        return image[self.roi]
+
+    def segmentation(self, graph):
+        r"""
+        The result of a graph-cut as image.
+
+        Parameters
+        ----------
+        graph : `~medpy.graphcut.graph.GCGraph` or `~medpy.graphcut.maxflow.GraphDouble`
+            A graph of this topology, after executing the graph-cut.
+
+        Returns
+        -------
+        segmentation : ndarray
+            A boolean image of the topology shape with `True` for the voxels assigned
+            to the source, i.e. the foreground. Voxels outside of the region of
+            interest keep the terminal they have been fixed to.
+        """
+        if hasattr(graph, "get_graph"):
+            graph = graph.get_graph()
+        segments = numpy.empty(self.node_count, dtype=numpy.uint8)
+        graph.what_segments(segments)
+        segments = segments == int(graph.termtype.SOURCE)
+        if self.roi is None:
+            return segments.reshape(self.shape)
+        segmentation = self.exterior.copy()
+        segmentation[self.roi] = segments
+        return segmentation
+
+    def __compute_nodes(self):
+        r"""
+        Compute the node ids of the voxel pairs of the unrestricted topology. The ids
+        of the second voxels follow from the first ones by the stride of the offset.
+        """
+        node_ids = numpy.arange(numpy.prod(self.shape), dtype=numpy.int32)
+        node_ids = node_ids.reshape(self.shape)
+        strides = numpy.cumprod((1,) + self.shape[:0:-1])[::-1]
+        nodes_from, nodes_to = [], []
+        for offset, (slicer_from, _) in zip(self.offsets, self.slicers):
+            ids = node_ids[slicer_from].ravel()
+            nodes_from.append(ids)
+            nodes_to.append(ids + numpy.int32(numpy.dot(offset, strides)))
+        for nodes in nodes_from + nodes_to:
+            nodes.setflags(write=False)
+        self.__nodes_from, self.__nodes_to = nodes_from, nodes_to
+
+    def graph(self):
+        r"""
+        Create a new, empty graph of this topology.
+
+        Returns
+        -------
+        graph : `~medpy.graphcut.graph.GCGraph`
+            A graph with one node per voxel, allocated for exactly the number of
+            edges of this topology. The topology is available through its
+            ``get_topology`` method.
+        """
+        return GCGraph(self.node_count, self.edge_count, topology=self)
+
+
+def voxel_topology(shape, connectivity=1, cache=False):
+    r"""
+    The structure of a voxel based graph for an image shape.
+
+    The node ids of the neighbouring voxels are large: each offset of the stencil
+    holds two int32 node ids per voxel, i.e. about 24 bytes per voxel for the
+    6-neighbourhood (3.2 GB for a :math:`512^3` volume) and 104 bytes per voxel for
+    the 26-neighbourhood. They are therefore only computed when first accessed, and
+    only kept beyond the lifetime of the returned object if ``cache`` is set.
+
+    Parameters
+    ----------
+    shape : sequence of ints
+        The image shape.
+    connectivity : int or sequence of sequences of ints
+        The neighbourhood connectivity, as used by
+        `scipy.ndimage.generate_binary_structure`, i.e. ``1`` for the :math:`ndim*2`
+        direct neighbours (6 in 3D), ``2`` for 18 and ``3`` for 26 neighbours in 3D.
+        Alternatively, a custom stencil given as sequence of offsets, e.g.
+        ``[(1, 0, 0), (0, 1, 0), (0, 0, 2)]``. An offset and its mirrored
+        counterpart denote the same neighbourhood relation.
+    cache : bool
+        Whether to keep the topology in a module-level cache, such that repeated
+        requests (e.g. graph constructions with changing markers or weights) share
+        it. Only the most recently cached topology is kept; the cache can be emptied
+        with ``voxel_topology.cache_clear()`` to release its memory. Alternatively,
+        reuse a graph via the ``graph`` parameter of
+        `~medpy.graphcut.generate.graph_from_voxels`.
+
+    Returns
+    -------
+    topology : VoxelTopology
+        The topology object. Must not be modified, as it may be shared.
+
+    Raises
+    ------
+    ValueError
+        If the connectivity is lower than 1 or the stencil contains invalid offsets.
+
+    Examples
+    --------
+    >>> len(voxel_topology((10, 10, 10), connectivity=3).offsets)
+    13
+    >>> voxel_topology((10, 10), [(0, 2), (-1, 0), (1, 0)]).offsets
+    [(0, 2), (1, 0)]
+    """
+    shape = tuple(int(s) for s in shape)
+    if not numpy.isscalar(connectivity):
+        connectivity = __stencil_offsets(len(shape), connectivity)
+    else:
+        connectivity = int(connectivity)
+    if cache:
+        return __cached_voxel_topology(shape, connectivity)
+    return __voxel_topology(shape, connectivity)
+
+
+def __voxel_topology(shape, connectivity):
+    """
+    Creation of VoxelTopology objects by shape and connectivity.
+    """
+    if isinstance(connectivity, tuple):
+        offsets = list(connectivity)
+    else:
+        offsets = __neighbour_offsets(len(shape), connectivity)
+    slicers = [__offset_slicers(shape, offset) for offset in offsets]
+    return VoxelTopology(shape, connectivity, offsets, slicers)
+
+
+@functools.lru_cache(maxsize=1)
+def __cached_voxel_topology(shape, connectivity):
+    """
+    Cached creation of VoxelTopology objects by shape and connectivity.
+    """
+    return __voxel_topology(shape, connectivity)
+
+
+voxel_topology.cache_clear = __cached_voxel_topology.cache_clear
+voxel_topology.cache_info = __cached_voxel_topology.cache_info
+
+
+def neighbour_slicers(shape, connectivity=1):
+    r"""
+    Pairs of slicers selecting all neighbouring voxels of an image.
+
+    Each voxel pair is covered exactly once, i.e. mirrored offsets are omitted.
+    Applying the first slicer of a pair to an image yields the first voxels, the
+    second slicer the neighbours at the same positions.
+
+    Parameters
+    ----------
+    shape : sequence of ints
+        The image shape.
+    connectivity : int or sequence of sequences of ints
+        The neighbourhood connectivity or a custom stencil, see `voxel_topology`.
+
+    Returns
+    -------
+    slicers : list of tuples
+        For each neighbourhood offset, the pair of slicers.
+
+    Examples
+    --------
+    >>> image = numpy.arange(6).reshape(2, 3)
+    >>> [(image[a].ravel(), image[b].ravel()) for a, b in neighbour_slicers((2, 3))]
+    [(array([0, 1, 2]), array([3, 4, 5])), (array([0, 1, 3, 4]), array([1, 2, 4, 5]))]
+    """
+    return voxel_topology(shape, connectivity).slicers
+
+
+def __neighbour_offsets(ndim, connectivity):
+    """
+    The offsets to all neighbours under the given connectivity, excluding the center
+    and the mirrored half of the offsets, such that each voxel pair is covered once.
+    The offsets along the first axes come first.
+    """
+    if connectivity < 1:
+        raise ValueError(
+            "The connectivity must be at least 1, got {}.".format(connectivity)
+        )
+    offsets = []
+    for offset in reversed(list(numpy.ndindex(*([3] * ndim)))):
+        offset = tuple(o - 1 for o in offset)
+        nonzero = [o for o in offset if 0 != o]
+        if 0 == len(nonzero) or len(nonzero) > connectivity or nonzero[0] < 0:
+            continue
+        offsets.append(offset)
+    return offsets
+
+
+def __stencil_offsets(ndim, stencil):
+    """
+    The offsets of a custom stencil as hashable tuple, with each offset turned to
+    point in positive direction along its first non-zero axis and duplicates removed.
+    """
+    offsets = []
+    for offset in stencil:
+        offset = tuple(int(o) for o in offset)
+        if not ndim == len(offset):
+            raise ValueError(
+                "The offset {} does not match the image dimensionality {}.".format(
+                    offset, ndim
+                )
+            )
+        nonzero = [o for o in offset if 0 != o]
+        if 0 == len(nonzero):
+            raise ValueError("The stencil must not contain the zero offset.")
+        if nonzero[0] < 0:
+            offset = tuple(-o for o in offset)
+        if offset not in offsets:
+            offsets.append(offset)
+    return tuple(offsets)
+
+
+def __offset_slicers(shape, offset):
+    """
+    The pair of slicers selecting the first and the second voxels of all voxel pairs
+    of an image of the given shape that are neighbours under the offset. Offsets
+    exceeding the image extent select no voxels.
+    """
+    return (
+        tuple(slice(max(0, -o), max(0, n - max(0, o))) for o, n in zip(offset, shape)),
+        tuple(slice(max(0, o), max(0, n - max(0, -o))) for o, n in zip(offset, shape)),
+    )
@@ -23,16 +23,21 @@ import itertools
 # build-in modules
 import math
 import multiprocessing
+import os
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
 
 # third-party modules
 import numpy
+import scipy.ndimage
 
 from ..core import ArgumentError, Logger
 from ..filter import relabel, relabel_map
 
 # own modules
 from .energy_label import boundary_stawiaski
-from .generate import graph_from_labels
+from .generate import graph_from_labels, graph_from_voxels
+from .topology import voxel_topology
 
 
 # code
@@ -78,6 +83,8 @@ def graphcut_split(
     minimal_edge_length=100,
     overlap=10,
     processes=None,
+    executor=None,
+    seam_cut=False,
 ):
     """
     Executes a graph cut by splitting the original volume into a number of sub-volumes of
@@ -105,12 +112,32 @@ def graphcut_split(
         The overlap (in voxels) between the generated sub-volumes.
     processes : integer or None
         The number of processes to run simultaneously, if not supplied, will be the same
-        as the number of processors.
+        as the number of processors. Ignored if an ``executor`` is supplied.
+    executor : GraphcutExecutor or None
+        A persistent pool of worker processes to use, e.g. when calling this function
+        repeatedly. If not supplied, a temporary one is created.
+    seam_cut : bool
+        Whether to optimize the seams between the sub-volumes with a second graph cut.
+        Otherwise, the overlapping results are merged using a logical-and.
 
     Returns
     -------
     segmentation : ndarray
         The graph-cut segmentation result as boolean array.
+
+    Notes
+    -----
+    The images are placed in shared memory once and the workers only receive the
+    slicers of their sub-volumes. They write their results into a shared output
+    buffer, such that no image data is pickled between the processes.
+
+    With ``seam_cut``, the overlaps between the sub-volumes are cut again, one
+    dimension after another. Each of these seam cuts only covers the overlap band
+    and the adjacent layer of voxels, which is fixed to the merged result as
+    foreground resp. background markers. The seams are hence placed along the image
+    content instead of the sub-volume borders. As long as the overlap exceeds the
+    depth to which the sub-volume borders distort the single cuts, the result closely
+    matches the one of a cut over the whole image.
     """
     # initialize logger
     logger = Logger.getInstance()
@@ -142,7 +169,7 @@ def graphcut_split(
     stepsizes = [math.ceil(x / y) for x, y in zip(shape, steps)]
     logger.debug(
         "Using a minimal edge length of {}, a sub-volume size of {} was determined from the shape {}, which means {} sub-volumes.".format(
-            minimal_edge_length, stepsizes, shape, reduce(lambda x, y: x * y, steps)
+            minimal_edge_length, stepsizes, shape, int(numpy.prod(steps))
         )
     )
 
@@ -164,20 +191,23 @@ def graphcut_split(
         ]
         for slicer_step in itertools.product(*slicer_steps)
     ]
-    subvolumes_input = [
-        (
-            img_region[tuple(slicer)],
-            img_gradient[tuple(slicer)],
-            img_fg[tuple(slicer)],
-            img_bg[tuple(slicer)],
-        )
-        for slicer in slicers
-    ]
 
     # execute the graph cuts and collect results
-    subvolumes_output = graphcut_subprocesses(
-        graphcut_function, subvolumes_input, processes
-    )
+    if executor is None:
+        with GraphcutExecutor(processes) as executor:
+            return graphcut_split(
+                graphcut_function,
+                img_region,
+                img_gradient,
+                img_fg,
+                img_bg,
+                minimal_edge_length,
+                overlap,
+                executor=executor,
+                seam_cut=seam_cut,
+            )
+    volumes = (img_region, img_gradient, img_fg, img_bg)
+    subvolumes_output = __map_shared(executor, graphcut_function, volumes, slicers)
 
     # put back data together
     img_result = numpy.zeros(img_region.shape, dtype=numpy.bool_)
@@ -201,10 +231,19 @@ def graphcut_split(
             tuple(sslicer_antioverlap)
         ]
 
+    # optimize the seams between the sub-volumes
+    if seam_cut and overlap > 0:
+        for dim in range(img_result.ndim):
+            img_result = __cut_seams(
+                executor, graphcut_function, volumes, img_result, slicers, overlap, dim
+            )
+
     return img_result.astype(numpy.bool_)
 
 
-def graphcut_subprocesses(graphcut_function, graphcut_arguments, processes=None):
+def graphcut_subprocesses(
+    graphcut_function, graphcut_arguments, processes=None, executor=None
+):
     """
     Executes multiple graph cuts in parallel.
     This can result in a significant speed-up.
@@ -217,31 +256,98 @@ def graphcut_subprocesses(graphcut_function, graphcut_arguments, processes=None)
         List of arguments to pass to the respective subprocesses resp. the ``graphcut_function``.
     processes : integer or None
         The number of processes to run simultaneously, if not supplied, will be the same
-        as the number of processors.
+        as the number of processors. Ignored if an ``executor`` is supplied.
+    executor : GraphcutExecutor or None
+        A persistent pool of worker processes to use, which saves their start-up when
+        calling this function repeatedly. If not supplied, a temporary one is created.
 
     Returns
     -------
     segmentations : tuple of ndarray
         The graph-cut segmentation results as list of boolean arraya.
     """
-    # initialize logger
-    logger = Logger.getInstance()
+    if executor is None:
+        with GraphcutExecutor(processes) as executor:
+            return executor.map(graphcut_function, graphcut_arguments)
+    return executor.map(graphcut_function, graphcut_arguments)
 
-    # check and eventually enhance input parameters
-    if not processes:
-        processes = multiprocessing.cpu_count()
-    if not int == type(processes) or processes <= 0:
-        raise ArgumentError("The number processes can not be zero or negative.")
 
-    logger.debug(
-        "Executing graph cuts in {} subprocesses.".format(multiprocessing.cpu_count())
-    )
+class GraphcutExecutor(object):
+    r"""
+    A persistent pool of worker processes to execute graph cuts in.
+
+    Creating worker processes is expensive. Pass an executor to `graphcut_split`
+    or `graphcut_subprocesses` to reuse the same workers over multiple calls. Use
+    as context manager or call `close` when done.
+
+    Parameters
+    ----------
+    processes : integer or None
+        The number of worker processes, if not supplied, will be the same as the
+        number of processors.
 
-    # creates subprocess pool and execute
-    pool = multiprocessing.Pool(processes)
-    results = pool.map(graphcut_function, graphcut_arguments)
+    Raises
+    ------
+    ArgumentError
+        If the number of processes is zero or negative.
+
+    Examples
+    --------
+    >>> with GraphcutExecutor(4) as executor:
+    ...     for gradient in gradients:
+    ...         results.append(graphcut_split(graphcut_stawiaski, regions, gradient,
+    ...                                       foreground, background,
+    ...                                       executor=executor))
+    """
 
-    return results
+    def __init__(self, processes=None):
+        # initialize logger
+        logger = Logger.getInstance()
+
+        # check and eventually enhance input parameters
+        if not processes:
+            processes = multiprocessing.cpu_count()
+        if not int == type(processes) or processes <= 0:
+            raise ArgumentError("The number processes can not be zero or negative.")
+
+        logger.debug("Starting {} graph cut subprocesses.".format(processes))
+        self.processes = processes
+        # the workers have to share the tracker of the shared memory blocks, otherwise
+        # they clean up the blocks created by this process when terminating
+        if "posix" == os.name:
+            resource_tracker.ensure_running()
+        self.__pool = multiprocessing.Pool(processes)
+
+    def map(self, function, arguments):
+        r"""
+        Executes a function for each of the arguments in the worker processes.
+
+        Parameters
+        ----------
+        function : function
+            A picklable function taking a single argument.
+        arguments : sequence
+            The arguments to call the function with.
+
+        Returns
+        -------
+        results : list
+            The results of the function calls in the order of the arguments.
+        """
+        return self.__pool.map(function, arguments)
+
+    def close(self):
+        r"""
+        Stops the worker processes after they finished their pending work.
+        """
+        self.__pool.close()
+        self.__pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
 def graphcut_stawiaski(regions, gradient=False, foreground=False, background=False):
@@ -318,3 +424,303 @@ def graphcut_stawiaski(regions, gradient=False, foreground=False, background=Fal
     img_results = relabel_map(img_region, mapping)
 
     return img_results.astype(numpy.bool_)
+
+
+def graphcut_multiresolution(
+    image,
+    foreground,
+    background,
+    boundary_term,
+    boundary_term_args=(),
+    spacing=False,
+    regional_term=False,
+    regional_term_args=False,
+    levels=2,
+    factor=2,
+    band=4,
+    connectivity=1,
+):
+    r"""
+    Executes a voxel based graph cut coarse-to-fine over an image pyramid.
+
+    The graph cut is first executed over the image downsampled ``levels`` times by
+    ``factor``. Each result is then upsampled to the next finer level, where only a
+    narrow band around its boundary is cut again, while the voxels outside of the band
+    keep their assignment (see the ``roi_mask`` of
+    `~medpy.graphcut.generate.graph_from_voxels`). The largest graph hence
+    only covers the object surface instead of the whole image, which drastically
+    reduces the memory requirements and run-time for large images.
+
+    Parameters
+    ----------
+    image : ndarray
+        The image to segment.
+    foreground : ndarray
+        The foreground markers.
+    background : ndarray
+        The background markers.
+    boundary_term : function
+        A voxel based boundary term, e.g. one of :mod:`~medpy.graphcut.energy_voxel`.
+        It is called at each level with the arguments
+        ``(image, *boundary_term_args, spacing)``, using the image and voxel spacing
+        of the level.
+    boundary_term_args : tuple
+        The additional arguments of the boundary term, e.g. ``(sigma,)``.
+    spacing : sequence of floats or False
+        The voxel spacing of the image, passed to the boundary term.
+    regional_term : function
+        A voxel based regional term, e.g.
+        `~medpy.graphcut.energy_voxel.regional_probability_map`.
+    regional_term_args : tuple
+        The arguments of the regional term. The first one has to be an image of the
+        same shape as ``image`` (e.g. the probability map), which is downsampled along.
+    levels : integer
+        The number of coarser levels. Stops earlier, if the image gets too small.
+    factor : integer
+        The downsampling factor between two levels.
+    band : integer
+        The half-width (in voxels) of the band around the upsampled boundary that is
+        cut again at each finer level. Should be at least ``factor``.
+    connectivity : int or sequence of sequences of ints
+        The voxel neighbourhood, see `~medpy.graphcut.generate.graph_from_voxels`.
+
+    Returns
+    -------
+    segmentation : ndarray
+        The graph-cut segmentation result as boolean array.
+
+    Raises
+    ------
+    ArgumentError
+        When the supplied data is erroneous.
+
+    Notes
+    -----
+    Lower levels are obtained by subsampling the image, which other than smoothing
+    preserves the contrast of edges the boundary terms rely on, and by marking a
+    block as foreground resp. background if any of its voxels is marked and the other
+    label is not. Structures thinner than the coarsest voxels can get lost, which
+    the band can only partially recover. The result usually matches a full
+    resolution cut closely, but is not guaranteed to be identical.
+    """
+    # initialize logger
+    logger = Logger.getInstance()
+
+    # ensure that input images are scipy arrays
+    img = numpy.asarray(image, dtype=numpy.float64)
+    img_fg = numpy.asarray(foreground, dtype=numpy.bool_)
+    img_bg = numpy.asarray(background, dtype=numpy.bool_)
+    img_regional = numpy.asarray(regional_term_args[0]) if regional_term else None
+
+    # ensure correctness of supplied images and parameters
+    if not (img.shape == img_fg.shape == img_bg.shape):
+        raise ArgumentError("All supplied images must be of the same shape.")
+    if img_regional is not None and not img_regional.shape == img.shape:
+        raise ArgumentError("All supplied images must be of the same shape.")
+    if levels < 0:
+        raise ArgumentError("A negative number of levels is not supported.")
+    if factor < 2:
+        raise ArgumentError("A downsampling factor smaller than 2 is not supported.")
+    if band < 1:
+        raise ArgumentError("A band width smaller than 1 is not supported.")
+
+    # build the image pyramid, finest level first
+    pyramid = [(img, img_fg, img_bg, spacing, img_regional)]
+    while len(pyramid) <= levels and min(pyramid[-1][0].shape) >= 2 * factor:
+        img, img_fg, img_bg, spacing, img_regional = pyramid[-1]
+        fg, bg = __downsample_any(img_fg, factor), __downsample_any(img_bg, factor)
+        pyramid.append(
+            (
+                __downsample(img, factor),
+                fg & ~bg,
+                bg & ~fg,
+                False if spacing is False else [s * factor for s in spacing],
+                None if img_regional is None else __downsample(img_regional, factor),
+            )
+        )
+    logger.debug(
+        "Executing the graph cut over a pyramid of the shapes {}.".format(
+            [level[0].shape for level in pyramid]
+        )
+    )
+
+    # cut the coarsest level completely, then refine the boundary level by level
+    img_result = None
+    for img, img_fg, img_bg, spacing, img_regional in reversed(pyramid):
+        if img_result is None:
+            roi = numpy.ones(img.shape, dtype=numpy.bool_)
+        else:
+            img_result = __upsample(img_result, factor, img.shape)
+            structure = scipy.ndimage.generate_binary_structure(img.ndim, 1)
+            roi = scipy.ndimage.binary_dilation(
+                img_result, structure, iterations=band
+            ) & ~scipy.ndimage.binary_erosion(
+                img_result, structure, iterations=band, border_value=1
+            )
+            # markers contradicting the upsampled result have to be cut again
+            roi |= (img_fg & ~img_result) | (img_bg & img_result)
+            img_fg = img_fg | (img_result & ~roi)
+            if not numpy.any(roi):
+                continue
+
+        # restrict once; graph_from_voxels reuses the graph's restricted topology
+        topology = voxel_topology(img.shape, connectivity).restrict(roi, img_fg)
+        graph = topology.graph()
+        graph_from_voxels(
+            img_fg,
+            img_bg,
+            regional_term=regional_term,
+            boundary_term=boundary_term,
+            regional_term_args=False
+            if img_regional is None
+            else (img_regional,) + tuple(regional_term_args[1:]),
+            boundary_term_args=(img,) + tuple(boundary_term_args) + (spacing,),
+            connectivity=connectivity,
+            graph=graph,
+            roi_mask=roi,
+        )
+        maxflow = graph.maxflow()
+        logger.debug(
+            "Cut {} of {} voxels of shape {} with a maxflow of {}.".format(
+                topology.node_count, img.size, img.shape, maxflow
+            )
+        )
+        img_result = topology.segmentation(graph)
+
+    return img_result
+
+
+def __cut_seams(executor, function, volumes, result, slicers, overlap, dim):
+    """
+    Cuts the overlap bands between neighbouring sub-volumes along dim again, each
+    together with its adjacent voxel layers, which are fixed to the current result.
+    Returns the updated result.
+    """
+    img_region, img_gradient, img_fg, img_bg = volumes
+    seams = [slicer for slicer in slicers if slicer[dim].start > 0]
+    if 0 == len(seams):
+        return result
+
+    # the overlap bands and the sub-volumes covering them plus one voxel layer
+    band = numpy.zeros(result.shape, dtype=numpy.bool_)
+    band_slicers, seam_slicers = [], []
+    for slicer in seams:
+        start = slicer[dim].start
+        band_slicer = list(slicer)
+        band_slicer[dim] = slice(start, start + overlap)
+        band[tuple(band_slicer)] = True
+        band_slicers.append(tuple(band_slicer))
+        seam_slicer = list(slicer)
+        seam_slicer[dim] = slice(start - 1, start + overlap + 1)
+        seam_slicers.append(tuple(seam_slicer))
+
+    # fix all voxels outside of the bands to the current result
+    fixed = ~band & ~img_fg & ~img_bg
+    seam_fg = img_fg | (fixed & result)
+    seam_bg = img_bg | (fixed & ~result)
+    seam_results = __map_shared(
+        executor, function, (img_region, img_gradient, seam_fg, seam_bg), seam_slicers
+    )
+
+    result = result.copy()
+    for band_slicer, seam_result in zip(band_slicers, seam_results):
+        seam_band_slicer = [slice(None)] * result.ndim
+        seam_band_slicer[dim] = slice(1, 1 + overlap)
+        result[band_slicer] = seam_result[tuple(seam_band_slicer)]
+    return result
+
+
+def __map_shared(executor, function, volumes, slicers):
+    """
+    Executes function over the sub-volumes selected by each of the slicers from all
+    volumes in the executor's worker processes. The volumes and the results are
+    exchanged through shared memory, only their names and the slicers are pickled.
+    Returns the boolean results as list.
+    """
+    shms = []
+    try:
+        inputs = []
+        for volume in volumes:
+            volume = numpy.ascontiguousarray(volume)
+            shm = SharedMemory(create=True, size=max(1, volume.nbytes))
+            shms.append(shm)
+            numpy.ndarray(volume.shape, volume.dtype, buffer=shm.buf)[...] = volume
+            inputs.append((shm.name, volume.shape, volume.dtype.str))
+
+        shape = numpy.shape(volumes[0])
+        shapes = [
+            tuple(len(range(*s.indices(n))) for s, n in zip(slicer, shape))
+            for slicer in slicers
+        ]
+        sizes = [int(numpy.prod(s)) for s in shapes]
+        offsets = numpy.cumsum([0] + sizes).tolist()
+        shm = SharedMemory(create=True, size=max(1, offsets[-1]))
+        shms.append(shm)
+
+        executor.map(
+            __execute_shared,
+            [
+                (function, inputs, tuple(slicer), (shm.name, offset, shape))
+                for slicer, offset, shape in zip(slicers, offsets, shapes)
+            ],
+        )
+        results = numpy.ndarray(offsets[-1], numpy.bool_, buffer=shm.buf).copy()
+        return [
+            results[offset : offset + size].reshape(shape)
+            for offset, size, shape in zip(offsets, sizes, shapes)
+        ]
+    finally:
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+
+def __execute_shared(task):
+    """
+    Worker side of __map_shared: attaches to the shared volumes, executes the
+    function over the sub-volumes and writes its result to the shared output.
+    """
+    function, inputs, slicer, (name, offset, shape) = task
+    shms = [SharedMemory(name=input_name) for input_name, _, _ in inputs]
+    output = SharedMemory(name=name)
+    try:
+        subvolumes = tuple(
+            numpy.ndarray(volume_shape, volume_dtype, buffer=shm.buf)[slicer]
+            for shm, (_, volume_shape, volume_dtype) in zip(shms, inputs)
+        )
+        result = function(subvolumes)
+        del subvolumes
+        numpy.ndarray(shape, numpy.bool_, buffer=output.buf, offset=offset)[
+            ...
+        ] = result
+    finally:
+        for shm in shms + [output]:
+            shm.close()
+
+
+def __downsample(image, factor):
+    """
+    Downsamples an image by taking the first voxel of each block of factor voxels
+    along each dimension. Other than averaging, this preserves the contrast of edges.
+    """
+    return image[tuple(slice(None, None, factor) for _ in image.shape)]
+
+
+def __downsample_any(mask, factor):
+    """
+    Downsamples a binary image by marking each block of factor voxels along each
+    dimension that contains at least one marked voxel.
+    """
+    mask = numpy.pad(mask, [(0, -s % factor) for s in mask.shape])
+    blocks = mask.reshape([x for s in mask.shape for x in (s // factor, factor)])
+    return blocks.any(axis=tuple(range(1, blocks.ndim, 2)))
+
+
+def __upsample(mask, factor, shape):
+    """
+    Upsamples a binary image by repeating each voxel factor times along each dimension
+    and cropping the result to shape.
+    """
+    for dim in range(mask.ndim):
+        mask = numpy.repeat(mask, factor, axis=dim)
+    return mask[tuple(slice(0, s) for s in shape)]
@@ -14,29 +14,57 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 # author Oskar Maier
-# version r0.1.0
+# version r0.2.0
 # since 2012-02-06
 # status Release
 
 # build-in modules
+import gzip
+import os
 
 # third-party modules
+import numpy
 
 # own modules
 
 
 # code
-def graph_to_dimacs(g, f):
+def graph_to_dimacs(g, f, chunksize=65536, precision=17, compresslevel=1):
     """
     Persists the supplied graph in valid dimacs format into the file.
 
+    The arcs are formatted in blocks of ``chunksize`` lines, which makes the export
+    of graphs with millions of edges feasible. Read the file back in with
+    `~medpy.graphcut.read.graph_from_dimacs`.
+
     Parameters
     ----------
-    g : `~medpy.graphcut.graph.Graph`
+    g : `~medpy.graphcut.graph.Graph` or `~medpy.graphcut.graph.ArrayGraph`
         A graph object to persist.
-    f : file
-        A file-like object.
+    f : file or str
+        A file-like object or the path of the file to write. Paths ending in
+        ``.gz`` are gzip compressed.
+    chunksize : int
+        The number of arcs to format and write at once.
+    precision : int
+        The number of significant digits to write the weights with. The default of
+        17 digits represents every double exactly and writes integral weights
+        without decimal places.
+    compresslevel : int
+        The gzip compression level from 1 (fastest) to 9 (smallest), used for paths
+        ending in ``.gz``.
     """
+    if isinstance(f, (str, os.PathLike)):
+        if os.fspath(f).endswith(".gz"):
+            fh = gzip.open(f, "wt", compresslevel=compresslevel)
+        else:
+            fh = open(f, "w")
+        with fh:
+            return graph_to_dimacs(g, fh, chunksize, precision)
+
+    nodes_from, nodes_to, weights_there, weights_back = __nweights_arrays(g)
+    nodes, weights_source, weights_sink = __tweights_arrays(g)
+
     # write comments
     f.write("c Created by medpy\n")
     f.write("c Oskar Maier, oskar.maier@googlemail.com\n")
@@ -45,7 +73,7 @@ def graph_to_dimacs(g, f):
     # write problem
     f.write("c problem line\n")
     f.write(
-        "p max {} {}\n".format(g.get_node_count() + 2, len(g.get_edges()))
+        "p max {} {}\n".format(g.get_node_count() + 2, len(nodes_from))
     )  # +2 as terminal nodes also count in dimacs format # no-nodes / no-edges
 
     # denote source and sink
@@ -55,22 +83,94 @@ def graph_to_dimacs(g, f):
     f.write("n 2 t\n")
 
     # write terminal arcs (t-weights)
+    # Note: the nodes ids of the graph start from 1, but 1 and 2 are reserved for source and sink respectively, therefore add 2
     f.write("c terminal arcs (t-weights)\n")
-    for node, weight in list(g.get_tweights().items()):
-        # Note: the nodes ids of the graph start from 1, but 1 and 2 are reserved for source and sink respectively, therefore add 2
-        if not 0 == weight[0]:  # 0 weights are implicit
-            f.write("a 1 {} {}\n".format(node + 2, weight[0]))
-        if not 0 == weight[1]:  # 0 weights are implicit
-            f.write("a {} 2 {}\n".format(node + 2, weight[1]))
+    nodes = nodes + 2
+    __write_arcs(
+        f,
+        __interleave(numpy.ones_like(nodes), nodes),
+        __interleave(nodes, numpy.full_like(nodes, 2)),
+        __interleave(weights_source, weights_sink),
+        chunksize,
+        precision,
+    )
 
     # write inter-node arcs (n-weights)
+    # reversed weights have to follow directly in the next line
     f.write("c inter-node arcs (n-weights)\n")
-    for edge, weight in list(g.get_nweights().items()):
-        if not 0 == weight[0]:  # 0 weights are implicit
-            f.write("a {} {} {}\n".format(edge[0] + 2, edge[1] + 2, weight[0]))
-        # reversed weights have to follow directly in the next line
-        if not 0 == weight[1]:  # 0 weights are implicit
-            f.write("a {} {} {}\n".format(edge[1] + 2, edge[0] + 2, weight[1]))
+    nodes_from, nodes_to = nodes_from + 2, nodes_to + 2
+    __write_arcs(
+        f,
+        __interleave(nodes_from, nodes_to),
+        __interleave(nodes_to, nodes_from),
+        __interleave(weights_there, weights_back),
+        chunksize,
+        precision,
+    )
 
     # end comment
     f.write("c end-of-file")
+
+
+def __write_arcs(f, tails, heads, weights, chunksize, precision):
+    r"""
+    Write the arcs with non-zero weights in blocks of chunksize lines.
+    """
+    mask = weights != 0  # 0 weights are implicit
+    tails, heads, weights = tails[mask], heads[mask], weights[mask]
+    fmt = "a %d %d %.{}g\n".format(int(precision))
+    for start in range(0, len(weights), chunksize):
+        chunk = slice(start, start + chunksize)
+        chunk_weights = weights[chunk]
+        values = [None] * (3 * len(chunk_weights))
+        values[0::3] = tails[chunk].tolist()
+        values[1::3] = heads[chunk].tolist()
+        values[2::3] = chunk_weights.tolist()
+        f.write(fmt * len(chunk_weights) % tuple(values))
+
+
+def __interleave(a, b):
+    r"""
+    Interleave two equally long 1D arrays.
+    """
+    return numpy.stack((a, b), axis=1).ravel()
+
+
+def __nweights_arrays(g):
+    r"""
+    Get the n-weights of a graph as (nodes_from, nodes_to, weights_there, weights_back) arrays.
+    """
+    if hasattr(g, "get_nweights_arrays"):
+        nodes_from, nodes_to, weights_there, weights_back = g.get_nweights_arrays()
+    else:
+        nweights = g.get_nweights()
+        edges = numpy.asarray(list(nweights.keys())).reshape(-1, 2)
+        weights = numpy.asarray(list(nweights.values()), dtype=numpy.float64)
+        weights = weights.reshape(-1, 2)
+        nodes_from, nodes_to = edges[:, 0], edges[:, 1]
+        weights_there, weights_back = weights[:, 0], weights[:, 1]
+    return (
+        numpy.asarray(nodes_from, dtype=numpy.int64),
+        numpy.asarray(nodes_to, dtype=numpy.int64),
+        numpy.asarray(weights_there, dtype=numpy.float64),
+        numpy.asarray(weights_back, dtype=numpy.float64),
+    )
+
+
+def __tweights_arrays(g):
+    r"""
+    Get the t-weights of a graph as (nodes, weights_source, weights_sink) arrays.
+    """
+    if hasattr(g, "get_tweights_arrays"):
+        nodes, weights_source, weights_sink = g.get_tweights_arrays()
+    else:
+        tweights = g.get_tweights()
+        nodes = list(tweights.keys())
+        weights = numpy.asarray(list(tweights.values()), dtype=numpy.float64)
+        weights = weights.reshape(-1, 2)
+        weights_source, weights_sink = weights[:, 0], weights[:, 1]
+    return (
+        numpy.asarray(nodes, dtype=numpy.int64),
+        numpy.asarray(weights_source, dtype=numpy.float64),
+        numpy.asarray(weights_sink, dtype=numpy.float64),
+    )
@@ -33,6 +33,39 @@ Compare two binary objects
     true_negative_rate
     positive_predictive_value
     ravd
+    hd95
+
+Compute all overlap metrics at once
+***********************************
+
+.. autosummary::
+    :toctree: generated/
+
+    confusion_matrix
+    confusion_matrix_packed
+    overlap_report
+    ConfusionMatrix
+
+Compute all surface distance metrics at once
+********************************************
+
+.. autosummary::
+    :toctree: generated/
+
+    surface_distance_cache
+    surface_distance_report
+    SurfaceDistanceCache
+
+Compare all labels of two label images
+**************************************
+
+.. autosummary::
+    :toctree: generated/
+
+    confusion_matrix_multilabel
+    dc_multilabel
+    overlap_report_multilabel
+    surface_metrics_multilabel
 
 Compare two sets of binary objects
 **********************************
@@ -53,6 +86,7 @@ Compare to sequences of binary objects
 
     volume_correlation
     volume_change_correlation
+    VolumeCorrelationAccumulator
 
 Image metrics (:mod:`medpy.metric.image`)
 =========================================
@@ -115,9 +149,16 @@ Histogram metrics (:mod:`medpy.metric.histogram`)
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from .binary import ConfusionMatrix as ConfusionMatrix
+from .binary import SurfaceDistanceCache as SurfaceDistanceCache
+from .binary import VolumeCorrelationAccumulator as VolumeCorrelationAccumulator
 from .binary import asd as asd
 from .binary import assd as assd
+from .binary import confusion_matrix as confusion_matrix
+from .binary import confusion_matrix_multilabel as confusion_matrix_multilabel
+from .binary import confusion_matrix_packed as confusion_matrix_packed
 from .binary import dc as dc
+from .binary import dc_multilabel as dc_multilabel
 from .binary import hd as hd
 from .binary import hd95 as hd95
 from .binary import jc as jc
@@ -125,12 +166,17 @@ from .binary import obj_asd as obj_asd
 from .binary import obj_assd as obj_assd
 from .binary import obj_fpr as obj_fpr
 from .binary import obj_tpr as obj_tpr
+from .binary import overlap_report as overlap_report
+from .binary import overlap_report_multilabel as overlap_report_multilabel
 from .binary import positive_predictive_value as positive_predictive_value
 from .binary import precision as precision
 from .binary import ravd as ravd
 from .binary import recall as recall
 from .binary import sensitivity as sensitivity
 from .binary import specificity as specificity
+from .binary import surface_distance_cache as surface_distance_cache
+from .binary import surface_distance_report as surface_distance_report
+from .binary import surface_metrics_multilabel as surface_metrics_multilabel
 from .binary import true_negative_rate as true_negative_rate
 from .binary import true_positive_rate as true_positive_rate
 from .binary import volume_change_correlation as volume_change_correlation
@@ -181,8 +227,20 @@ __all__ = [
     "obj_assd",
     "obj_fpr",
     "obj_tpr",
+    "ConfusionMatrix",
+    "confusion_matrix",
+    "confusion_matrix_packed",
+    "overlap_report",
+    "SurfaceDistanceCache",
+    "surface_distance_cache",
+    "surface_distance_report",
+    "confusion_matrix_multilabel",
+    "dc_multilabel",
+    "overlap_report_multilabel",
+    "surface_metrics_multilabel",
     "volume_change_correlation",
     "volume_correlation",
+    "VolumeCorrelationAccumulator",
     "chebyshev",
     "chebyshev_neg",
     "chi_square",
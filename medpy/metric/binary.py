@@ -19,20 +19,26 @@
 # status Release
 
 # build-in modules
+import collections
+import heapq
+import os
 
 # third-party modules
 import numpy
 from scipy.ndimage import (
     _ni_support,
-    binary_erosion,
     distance_transform_edt,
     find_objects,
     generate_binary_structure,
     label,
 )
-from scipy.stats import pearsonr
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import maximum_bipartite_matching
+from scipy.spatial import cKDTree
+from scipy.stats import beta, pearsonr
 
 # own modules
+from ..filter.binary import PackedMask
 
 
 # code
@@ -53,10 +59,10 @@ def dc(result, reference):
 
     Parameters
     ----------
-    result : array_like
+    result : array_like or PackedMask
         Input data containing objects. Can be any type but will be converted
         into binary: background where 0, object everywhere else.
-    reference : array_like
+    reference : array_like or PackedMask
         Input data containing objects. Can be any type but will be converted
         into binary: background where 0, object everywhere else.
 
@@ -70,20 +76,7 @@ def dc(result, reference):
     -----
     This is a real metric. The binary images can therefore be supplied in any order.
     """
-    result = numpy.atleast_1d(result.astype(numpy.bool_))
-    reference = numpy.atleast_1d(reference.astype(numpy.bool_))
-
-    intersection = numpy.count_nonzero(result & reference)
-
-    size_i1 = numpy.count_nonzero(result)
-    size_i2 = numpy.count_nonzero(reference)
-
-    try:
-        dc = 2.0 * intersection / float(size_i1 + size_i2)
-    except ZeroDivisionError:
-        dc = 1.0
-
-    return dc
+    return confusion_matrix(result, reference).dc()
 
 
 def jc(result, reference):
@@ -94,10 +87,10 @@ def jc(result, reference):
 
     Parameters
     ----------
-    result: array_like
+    result: array_like or PackedMask
             Input data containing objects. Can be any type but will be converted
             into binary: background where 0, object everywhere else.
-    reference: array_like
+    reference: array_like or PackedMask
             Input data containing objects. Can be any type but will be converted
             into binary: background where 0, object everywhere else.
 
@@ -111,18 +104,7 @@ def jc(result, reference):
     -----
     This is a real metric. The binary images can therefore be supplied in any order.
     """
-    result = numpy.atleast_1d(result.astype(numpy.bool_))
-    reference = numpy.atleast_1d(reference.astype(numpy.bool_))
-
-    intersection = numpy.count_nonzero(result & reference)
-    union = numpy.count_nonzero(result | reference)
-
-    try:
-        jc = float(intersection) / float(union)
-    except ZeroDivisionError:
-        jc = 1.0
-
-    return jc
+    return confusion_matrix(result, reference).jc()
 
 
 def precision(result, reference):
@@ -159,18 +141,7 @@ def precision(result, reference):
     .. [1] http://en.wikipedia.org/wiki/Precision_and_recall
     .. [2] http://en.wikipedia.org/wiki/Confusion_matrix#Table_of_confusion
     """
-    result = numpy.atleast_1d(result.astype(numpy.bool_))
-    reference = numpy.atleast_1d(reference.astype(numpy.bool_))
-
-    tp = numpy.count_nonzero(result & reference)
-    fp = numpy.count_nonzero(result & ~reference)
-
-    try:
-        precision = tp / float(tp + fp)
-    except ZeroDivisionError:
-        precision = 0.0
-
-    return precision
+    return confusion_matrix(result, reference).precision()
 
 
 def recall(result, reference):
@@ -207,18 +178,7 @@ def recall(result, reference):
     .. [1] http://en.wikipedia.org/wiki/Precision_and_recall
     .. [2] http://en.wikipedia.org/wiki/Confusion_matrix#Table_of_confusion
     """
-    result = numpy.atleast_1d(result.astype(numpy.bool_))
-    reference = numpy.atleast_1d(reference.astype(numpy.bool_))
-
-    tp = numpy.count_nonzero(result & reference)
-    fn = numpy.count_nonzero(~result & reference)
-
-    try:
-        recall = tp / float(tp + fn)
-    except ZeroDivisionError:
-        recall = 0.0
-
-    return recall
+    return confusion_matrix(result, reference).recall()
 
 
 def sensitivity(result, reference):
@@ -267,18 +227,7 @@ def specificity(result, reference):
     .. [1] https://en.wikipedia.org/wiki/Sensitivity_and_specificity
     .. [2] http://en.wikipedia.org/wiki/Confusion_matrix#Table_of_confusion
     """
-    result = numpy.atleast_1d(result.astype(numpy.bool_))
-    reference = numpy.atleast_1d(reference.astype(numpy.bool_))
-
-    tn = numpy.count_nonzero(~result & ~reference)
-    fp = numpy.count_nonzero(result & ~reference)
-
-    try:
-        specificity = tn / float(tn + fp)
-    except ZeroDivisionError:
-        specificity = 0.0
-
-    return specificity
+    return confusion_matrix(result, reference).specificity()
 
 
 def true_negative_rate(result, reference):
@@ -320,7 +269,7 @@ def positive_predictive_value(result, reference):
     return precision(result, reference)
 
 
-def hd(result, reference, voxelspacing=None, connectivity=1):
+def hd(result, reference, voxelspacing=None, connectivity=1, method="edt"):
     """
     Hausdorff Distance.
 
@@ -345,6 +294,14 @@ def hd(result, reference, voxelspacing=None, connectivity=1):
         of the binary objects. This value is passed to
         `scipy.ndimage.generate_binary_structure` and should usually be :math:`> 1`.
         Note that the connectivity influences the result in the case of the Hausdorff distance.
+    method : {'edt', 'kdtree', 'auto'}, optional
+        How the nearest surface voxels are found: through a distance transform ('edt'),
+        through a k-d tree over the surface voxels only ('kdtree'), which is
+        considerably faster for thin or small structures, or by choosing between the
+        two based on the ratio of surface to bounding box voxels ('auto'). All methods
+        yield the same distances. The distances are always computed inside the joint
+        bounding box of both surfaces only, which yields the same values as the whole
+        image at a fraction of the costs for small objects in large images.
 
     Returns
     -------
@@ -362,13 +319,12 @@ def hd(result, reference, voxelspacing=None, connectivity=1):
     -----
     This is a real metric. The binary images can therefore be supplied in any order.
     """
-    hd1 = __surface_distances(result, reference, voxelspacing, connectivity).max()
-    hd2 = __surface_distances(reference, result, voxelspacing, connectivity).max()
-    hd = max(hd1, hd2)
-    return hd
+    return surface_distance_cache(
+        result, reference, voxelspacing, connectivity, method
+    ).hd()
 
 
-def hd95(result, reference, voxelspacing=None, connectivity=1):
+def hd95(result, reference, voxelspacing=None, connectivity=1, method="edt"):
     """
     95th percentile of the Hausdorff Distance.
 
@@ -394,6 +350,14 @@ def hd95(result, reference, voxelspacing=None, connectivity=1):
         of the binary objects. This value is passed to
         `scipy.ndimage.generate_binary_structure` and should usually be :math:`> 1`.
         Note that the connectivity influences the result in the case of the Hausdorff distance.
+    method : {'edt', 'kdtree', 'auto'}, optional
+        How the nearest surface voxels are found: through a distance transform ('edt'),
+        through a k-d tree over the surface voxels only ('kdtree'), which is
+        considerably faster for thin or small structures, or by choosing between the
+        two based on the ratio of surface to bounding box voxels ('auto'). All methods
+        yield the same distances. The distances are always computed inside the joint
+        bounding box of both surfaces only, which yields the same values as the whole
+        image at a fraction of the costs for small objects in large images.
 
     Returns
     -------
@@ -410,13 +374,12 @@ def hd95(result, reference, voxelspacing=None, connectivity=1):
     -----
     This is a real metric. The binary images can therefore be supplied in any order.
     """
-    hd1 = __surface_distances(result, reference, voxelspacing, connectivity)
-    hd2 = __surface_distances(reference, result, voxelspacing, connectivity)
-    hd95 = numpy.percentile(numpy.hstack((hd1, hd2)), 95)
-    return hd95
+    return surface_distance_cache(
+        result, reference, voxelspacing, connectivity, method
+    ).hd95()
 
 
-def assd(result, reference, voxelspacing=None, connectivity=1):
+def assd(result, reference, voxelspacing=None, connectivity=1, method="edt"):
     """
     Average symmetric surface distance.
 
@@ -442,6 +405,14 @@ def assd(result, reference, voxelspacing=None, connectivity=1):
         `scipy.ndimage.generate_binary_structure` and should usually be :math:`> 1`.
         The decision on the connectivity is important, as it can influence the results
         strongly. If in doubt, leave it as it is.
+    method : {'edt', 'kdtree', 'auto'}, optional
+        How the nearest surface voxels are found: through a distance transform ('edt'),
+        through a k-d tree over the surface voxels only ('kdtree'), which is
+        considerably faster for thin or small structures, or by choosing between the
+        two based on the ratio of surface to bounding box voxels ('auto'). All methods
+        yield the same distances. The distances are always computed inside the joint
+        bounding box of both surfaces only, which yields the same values as the whole
+        image at a fraction of the costs for small objects in large images.
 
     Returns
     -------
@@ -467,16 +438,12 @@ def assd(result, reference, voxelspacing=None, connectivity=1):
 
     and then averaging the two lists. The binary images can therefore be supplied in any order.
     """
-    assd = numpy.concatenate(
-        [
-            __surface_distances(result, reference, voxelspacing, connectivity),
-            __surface_distances(reference, result, voxelspacing, connectivity),
-        ]
-    ).mean()
-    return assd
+    return surface_distance_cache(
+        result, reference, voxelspacing, connectivity, method
+    ).assd()
 
 
-def asd(result, reference, voxelspacing=None, connectivity=1):
+def asd(result, reference, voxelspacing=None, connectivity=1, method="edt"):
     """
     Average surface distance metric.
 
@@ -501,6 +468,14 @@ def asd(result, reference, voxelspacing=None, connectivity=1):
         `scipy.ndimage.generate_binary_structure` and should usually be :math:`> 1`.
         The decision on the connectivity is important, as it can influence the results
         strongly. If in doubt, leave it as it is.
+    method : {'edt', 'kdtree', 'auto'}, optional
+        How the nearest surface voxels are found: through a distance transform ('edt'),
+        through a k-d tree over the surface voxels only ('kdtree'), which is
+        considerably faster for thin or small structures, or by choosing between the
+        two based on the ratio of surface to bounding box voxels ('auto'). All methods
+        yield the same distances. The distances are always computed inside the joint
+        bounding box of both surfaces only, which yields the same values as the whole
+        image at a fraction of the costs for small objects in large images.
 
     Returns
     -------
@@ -581,7 +556,9 @@ def asd(result, reference, voxelspacing=None, connectivity=1):
     due to the center of the cross being considered surface as well.
 
     """
-    sds = __surface_distances(result, reference, voxelspacing, connectivity)
+    sds = __surface_distances(
+        result, reference, voxelspacing, connectivity, method=method
+    )
     asd = sds.mean()
     return asd
 
@@ -662,18 +639,749 @@ def ravd(result, reference):
     0.0
 
     """
-    result = numpy.atleast_1d(result.astype(numpy.bool_))
-    reference = numpy.atleast_1d(reference.astype(numpy.bool_))
+    return confusion_matrix(result, reference).ravd()
 
-    vol1 = numpy.count_nonzero(result)
-    vol2 = numpy.count_nonzero(reference)
 
-    if 0 == vol2:
-        raise RuntimeError(
-            "The second supplied array does not contain any binary object."
+class ConfusionMatrix(object):
+    r"""
+    Confusion matrix between the binary objects in two images.
+
+    Holds the true positive, false positive, false negative and true negative voxel
+    counts of a result with respect to a reference. All overlap metrics of this
+    module can be derived from these four numbers, hence computing them once and
+    reading all scores from the same object avoids repeated passes over the volumes.
+
+    Usually created through :func:`confusion_matrix` or :func:`confusion_matrix_packed`.
+
+    Parameters
+    ----------
+    tp : int
+        Number of true positives, i.e. object in ``result`` and in ``reference``.
+    fp : int
+        Number of false positives, i.e. object in ``result`` but not in ``reference``.
+    fn : int
+        Number of false negatives, i.e. object in ``reference`` but not in ``result``.
+    tn : int
+        Number of true negatives, i.e. background in both.
+
+    See also
+    --------
+    :func:`confusion_matrix`
+    :func:`overlap_report`
+    """
+
+    def __init__(self, tp, fp, fn, tn):
+        self.tp = int(tp)
+        self.fp = int(fp)
+        self.fn = int(fn)
+        self.tn = int(tn)
+
+    def __repr__(self):
+        return "ConfusionMatrix(tp={}, fp={}, fn={}, tn={})".format(
+            self.tp, self.fp, self.fn, self.tn
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, ConfusionMatrix):
+            return NotImplemented
+        return (self.tp, self.fp, self.fn, self.tn) == (
+            other.tp,
+            other.fp,
+            other.fn,
+            other.tn,
+        )
+
+    @property
+    def size(self):
+        r"""The total number of voxels."""
+        return self.tp + self.fp + self.fn + self.tn
+
+    @property
+    def result_volume(self):
+        r"""The number of object voxels in the result."""
+        return self.tp + self.fp
+
+    @property
+    def reference_volume(self):
+        r"""The number of object voxels in the reference."""
+        return self.tp + self.fn
+
+    def dc(self):
+        r"""
+        Dice coefficient, see :func:`dc`.
+        """
+        try:
+            return 2.0 * self.tp / float(self.result_volume + self.reference_volume)
+        except ZeroDivisionError:
+            return 1.0
+
+    def jc(self):
+        r"""
+        Jaccard coefficient, see :func:`jc`.
+        """
+        try:
+            return float(self.tp) / float(self.tp + self.fp + self.fn)
+        except ZeroDivisionError:
+            return 1.0
+
+    def precision(self):
+        r"""
+        Precision, see :func:`precision`.
+        """
+        try:
+            return self.tp / float(self.tp + self.fp)
+        except ZeroDivisionError:
+            return 0.0
+
+    def recall(self):
+        r"""
+        Recall, see :func:`recall`.
+        """
+        try:
+            return self.tp / float(self.tp + self.fn)
+        except ZeroDivisionError:
+            return 0.0
+
+    def sensitivity(self):
+        r"""
+        Sensitivity, see :func:`sensitivity`.
+        """
+        return self.recall()
+
+    def specificity(self):
+        r"""
+        Specificity, see :func:`specificity`.
+        """
+        try:
+            return self.tn / float(self.tn + self.fp)
+        except ZeroDivisionError:
+            return 0.0
+
+    def ravd(self):
+        r"""
+        Relative absolute volume difference, see :func:`ravd`.
+
+        Raises
+        ------
+        RuntimeError
+            If the reference object is empty.
+        """
+        if 0 == self.reference_volume:
+            raise RuntimeError(
+                "The second supplied array does not contain any binary object."
+            )
+        return (self.result_volume - self.reference_volume) / float(
+            self.reference_volume
         )
 
-    return (vol1 - vol2) / float(vol2)
+
+def confusion_matrix(result, reference):
+    r"""
+    Confusion matrix between the binary objects in two images.
+
+    Both inputs are converted to binary exactly once. The intersection and the two
+    object volumes are counted, from which all four entries of the confusion matrix
+    follow without any further pass over the data. If both inputs are a
+    `~medpy.filter.binary.PackedMask`, the counts are obtained from the packed data
+    directly (see :func:`confusion_matrix_packed`).
+
+    Parameters
+    ----------
+    result : array_like or PackedMask
+        Input data containing objects. Can be any type but will be converted
+        into binary: background where 0, object everywhere else.
+    reference : array_like or PackedMask
+        Input data containing objects. Can be any type but will be converted
+        into binary: background where 0, object everywhere else.
+
+    Returns
+    -------
+    cm : ConfusionMatrix
+        The confusion matrix of ``result`` with respect to ``reference``.
+
+    See also
+    --------
+    :func:`confusion_matrix_packed`
+    :func:`overlap_report`
+
+    Examples
+    --------
+    >>> cm = confusion_matrix([1, 1, 0, 0], [1, 0, 1, 0])
+    >>> cm
+    ConfusionMatrix(tp=1, fp=1, fn=1, tn=1)
+    >>> cm.dc()
+    0.5
+    """
+    if isinstance(result, PackedMask) and isinstance(reference, PackedMask):
+        if not result.shape == reference.shape:
+            raise ValueError(
+                "The packed masks differ in shape: {} vs {}.".format(
+                    result.shape, reference.shape
+                )
+            )
+        return confusion_matrix_packed(result.data, reference.data, result.size)
+
+    result = numpy.atleast_1d(numpy.asarray(result).astype(numpy.bool_, copy=False))
+    reference = numpy.atleast_1d(
+        numpy.asarray(reference).astype(numpy.bool_, copy=False)
+    )
+
+    intersection = result & reference
+    tp = numpy.count_nonzero(intersection)
+    fp = numpy.count_nonzero(result) - tp
+    fn = numpy.count_nonzero(reference) - tp
+    tn = intersection.size - tp - fp - fn
+
+    return ConfusionMatrix(tp, fp, fn, tn)
+
+
+def confusion_matrix_packed(result, reference, size):
+    r"""
+    Confusion matrix between two bit-packed binary images.
+
+    Works on the output of `numpy.packbits`, which holds eight voxels per byte. The
+    counts are obtained by population counts over the packed bytes, hence neither
+    input has to be unpacked.
+
+    Parameters
+    ----------
+    result : array_like
+        Bit-packed binary image as returned by `numpy.packbits`.
+    reference : array_like
+        Bit-packed binary image as returned by `numpy.packbits`. Must have been
+        packed with the same shape and along the same axis as ``result``.
+    size : int
+        The number of voxels in the unpacked images. Required to count the true
+        negatives, as the padding bits of the packed arrays are not voxels.
+
+    Returns
+    -------
+    cm : ConfusionMatrix
+        The confusion matrix of ``result`` with respect to ``reference``.
+
+    Raises
+    ------
+    ValueError
+        If the two packed arrays differ in shape.
+
+    See also
+    --------
+    :func:`confusion_matrix`
+
+    Examples
+    --------
+    >>> a = numpy.asarray([1, 1, 0, 0], dtype=numpy.bool_)
+    >>> b = numpy.asarray([1, 0, 1, 0], dtype=numpy.bool_)
+    >>> confusion_matrix_packed(numpy.packbits(a), numpy.packbits(b), a.size)
+    ConfusionMatrix(tp=1, fp=1, fn=1, tn=1)
+    """
+    result = numpy.asarray(result, dtype=numpy.uint8)
+    reference = numpy.asarray(reference, dtype=numpy.uint8)
+    if not result.shape == reference.shape:
+        raise ValueError(
+            "The packed arrays differ in shape: {} vs {}.".format(
+                result.shape, reference.shape
+            )
+        )
+
+    tp = PackedMask.popcount(result & reference)
+    fp = PackedMask.popcount(result) - tp
+    fn = PackedMask.popcount(reference) - tp
+    tn = int(size) - tp - fp - fn
+
+    return ConfusionMatrix(tp, fp, fn, tn)
+
+
+def overlap_report(result, reference):
+    r"""
+    All overlap metrics between the binary objects in two images at once.
+
+    Computes the :func:`confusion_matrix` a single time and derives every overlap
+    score from it. This is considerably faster than calling the single metric
+    functions one after another, as these each have to pass over both volumes.
+
+    Parameters
+    ----------
+    result : array_like
+        Input data containing objects. Can be any type but will be converted
+        into binary: background where 0, object everywhere else.
+    reference : array_like
+        Input data containing objects. Can be any type but will be converted
+        into binary: background where 0, object everywhere else.
+
+    Returns
+    -------
+    report : dict
+        Dictionary with the keys ``dc``, ``jc``, ``precision``, ``recall``,
+        ``sensitivity``, ``specificity``, ``true_positive_rate``,
+        ``true_negative_rate``, ``positive_predictive_value`` and ``ravd``, each
+        holding the value the function of the same name would return.
+
+    See also
+    --------
+    :func:`confusion_matrix`
+
+    Notes
+    -----
+    Other than :func:`ravd`, the report does not raise an error for an empty
+    reference, but sets ``ravd`` to `nan`.
+    """
+    return __overlap_report(confusion_matrix(result, reference))
+
+
+class SurfaceDistanceCache(object):
+    r"""
+    Surface distances between the binary objects in two images.
+
+    Holds the distances from each surface voxel of the result to the nearest surface
+    voxel of the reference and vice-versa. The Hausdorff distance, its percentiles and
+    the (symmetric) average surface distances are all statistics over these two
+    arrays, hence extracting the surfaces and computing the distance transforms once
+    and reading every distance metric from the same object avoids repeating the most
+    expensive steps.
+
+    Usually created through :func:`surface_distance_cache`.
+
+    Parameters
+    ----------
+    result_distances : array_like
+        The distances of the surface voxels of ``result`` to the surface of
+        ``reference``.
+    reference_distances : array_like
+        The distances of the surface voxels of ``reference`` to the surface of
+        ``result``.
+
+    See also
+    --------
+    :func:`surface_distance_cache`
+    :func:`surface_distance_report`
+    """
+
+    def __init__(self, result_distances, reference_distances):
+        self.result_distances = numpy.asarray(result_distances)
+        self.reference_distances = numpy.asarray(reference_distances)
+        self.__symmetric_distances = None
+
+    @property
+    def symmetric_distances(self):
+        r"""The distances of both directions joined into a single array."""
+        if self.__symmetric_distances is None:
+            self.__symmetric_distances = numpy.concatenate(
+                [self.result_distances, self.reference_distances]
+            )
+        return self.__symmetric_distances
+
+    def hd(self):
+        r"""
+        Hausdorff distance, see :func:`hd`.
+        """
+        return max(self.result_distances.max(), self.reference_distances.max())
+
+    def hd95(self):
+        r"""
+        95th percentile of the Hausdorff distance, see :func:`hd95`.
+        """
+        return self.percentile(95)
+
+    def percentile(self, q):
+        r"""
+        Arbitrary percentile(s) of the symmetric Hausdorff distance.
+
+        Parameters
+        ----------
+        q : float or sequence of floats
+            Percentile(s) to compute, which must be between 0 and 100 inclusive.
+
+        Returns
+        -------
+        percentile : float or ndarray
+            The percentile(s) of the surface distances of both directions.
+        """
+        return numpy.percentile(self.symmetric_distances, q)
+
+    def asd(self):
+        r"""
+        Average surface distance, see :func:`asd`.
+        """
+        return self.result_distances.mean()
+
+    def assd(self):
+        r"""
+        Average symmetric surface distance, see :func:`assd`.
+        """
+        return self.symmetric_distances.mean()
+
+
+def surface_distance_cache(
+    result, reference, voxelspacing=None, connectivity=1, method="edt"
+):
+    r"""
+    Surface distances between the binary objects in two images.
+
+    Extracts the surface of each object and computes the distance transform of each
+    surface exactly once. The returned object serves all distance metrics of this
+    module from these results.
+
+    Parameters
+    ----------
+    result : array_like
+        Input data containing objects. Can be any type but will be converted
+        into binary: background where 0, object everywhere else.
+    reference : array_like
+        Input data containing objects. Can be any type but will be converted
+        into binary: background where 0, object everywhere else.
+    voxelspacing : float or sequence of floats, optional
+        The voxelspacing in a distance unit i.e. spacing of elements
+        along each dimension. If a sequence, must be of length equal to
+        the input rank; if a single number, this is used for all axes. If
+        not specified, a grid spacing of unity is implied.
+    connectivity : int
+        The neighbourhood/connectivity considered when determining the surface
+        of the binary objects. This value is passed to
+        `scipy.ndimage.generate_binary_structure` and should usually be :math:`> 1`.
+    method : {'edt', 'kdtree', 'auto'}, optional
+        How the nearest surface voxels are found: through a distance transform ('edt'),
+        through a k-d tree over the surface voxels only ('kdtree'), which is
+        considerably faster for thin or small structures, or by choosing between the
+        two based on the ratio of surface to bounding box voxels ('auto'). All methods
+        yield the same distances. The distances are always computed inside the joint
+        bounding box of both surfaces only, which yields the same values as the whole
+        image at a fraction of the costs for small objects in large images.
+
+    Returns
+    -------
+    cache : SurfaceDistanceCache
+        The surface distances in both directions.
+
+    Raises
+    ------
+    RuntimeError
+        If any of the two arrays is empty.
+
+    See also
+    --------
+    :func:`surface_distance_report`
+    """
+    # the borders and the window are shared by both directions
+    result_border, reference_border, window, voxelspacing, method = __surface_borders(
+        result, reference, voxelspacing, connectivity, method
+    )
+    return SurfaceDistanceCache(
+        __border_distances(
+            result_border, reference_border, window, voxelspacing, method
+        ),
+        __border_distances(
+            reference_border, result_border, window, voxelspacing, method
+        ),
+    )
+
+
+def surface_distance_report(
+    result, reference, voxelspacing=None, connectivity=1, method="edt", percentiles=()
+):
+    r"""
+    All surface distance metrics between the binary objects in two images at once.
+
+    Computes the :func:`surface_distance_cache` a single time and derives every
+    distance metric from it. Compared to calling :func:`hd`, :func:`hd95`,
+    :func:`asd` and :func:`assd` one after another, this requires only a quarter of
+    the distance transforms.
+
+    Parameters
+    ----------
+    result : array_like
+        Input data containing objects. Can be any type but will be converted
+        into binary: background where 0, object everywhere else.
+    reference : array_like
+        Input data containing objects. Can be any type but will be converted
+        into binary: background where 0, object everywhere else.
+    voxelspacing : float or sequence of floats, optional
+        The voxelspacing in a distance unit i.e. spacing of elements
+        along each dimension. If a sequence, must be of length equal to
+        the input rank; if a single number, this is used for all axes. If
+        not specified, a grid spacing of unity is implied.
+    connectivity : int
+        The neighbourhood/connectivity considered when determining the surface
+        of the binary objects. This value is passed to
+        `scipy.ndimage.generate_binary_structure` and should usually be :math:`> 1`.
+    method : {'edt', 'kdtree', 'auto'}, optional
+        How the nearest surface voxels are found: through a distance transform ('edt'),
+        through a k-d tree over the surface voxels only ('kdtree'), which is
+        considerably faster for thin or small structures, or by choosing between the
+        two based on the ratio of surface to bounding box voxels ('auto'). All methods
+        yield the same distances. The distances are always computed inside the joint
+        bounding box of both surfaces only, which yields the same values as the whole
+        image at a fraction of the costs for small objects in large images.
+    percentiles : sequence of floats, optional
+        Additional percentiles of the Hausdorff distance to compute.
+
+    Returns
+    -------
+    report : dict
+        Dictionary with the keys ``hd``, ``hd95``, ``asd`` and ``assd``, each holding
+        the value the function of the same name would return. For each additionally
+        requested percentile ``q``, the key ``hd<q>`` (e.g. ``hd99`` or ``hd99.5``)
+        holds the ``q``-th percentile of the symmetric surface distances.
+
+    Raises
+    ------
+    RuntimeError
+        If any of the two arrays is empty.
+
+    See also
+    --------
+    :func:`surface_distance_cache`
+    """
+    cache = surface_distance_cache(
+        result, reference, voxelspacing, connectivity, method
+    )
+    report = {
+        "hd": cache.hd(),
+        "hd95": cache.hd95(),
+        "asd": cache.asd(),
+        "assd": cache.assd(),
+    }
+    for q in percentiles:
+        report["hd{:g}".format(q)] = cache.percentile(q)
+    return report
+
+
+def confusion_matrix_multilabel(result, reference, labels=None):
+    r"""
+    Confusion matrices of all labels between two label images.
+
+    Other than computing the :func:`confusion_matrix` of the binary masks of each
+    label, this passes only a fixed number of times over the images, independent of
+    the number of labels: the voxel counts of all labels in both images and the
+    counts of all labels in the agreeing voxels suffice to derive the confusion
+    matrices of every label.
+
+    Parameters
+    ----------
+    result : array_like
+        Label image with non-negative integer labels, where 0 denotes background.
+    reference : array_like
+        Label image with non-negative integer labels, where 0 denotes background.
+        Must be of the same shape as ``result``.
+    labels : sequence of integers, optional
+        The labels for which to compute the confusion matrices. Defaults to all
+        non-zero labels occurring in any of the two images.
+
+    Returns
+    -------
+    cms : dict
+        Dictionary with the labels as keys and their `ConfusionMatrix` as values.
+
+    Raises
+    ------
+    ValueError
+        If the two images differ in shape.
+
+    See also
+    --------
+    :func:`dc_multilabel`
+    :func:`overlap_report_multilabel`
+    """
+    result = numpy.atleast_1d(numpy.asarray(result))
+    reference = numpy.atleast_1d(numpy.asarray(reference))
+    if not result.shape == reference.shape:
+        raise ValueError(
+            "The label images differ in shape: {} vs {}.".format(
+                result.shape, reference.shape
+            )
+        )
+
+    result = result.ravel()
+    reference = reference.ravel()
+    result_volumes = numpy.bincount(result)
+    reference_volumes = numpy.bincount(reference)
+    tps = numpy.bincount(result[result == reference])
+
+    if labels is None:
+        labels = numpy.union1d(
+            numpy.flatnonzero(result_volumes), numpy.flatnonzero(reference_volumes)
+        )
+        labels = labels[labels != 0]
+
+    def count(counts, label):
+        return int(counts[label]) if label < len(counts) else 0
+
+    cms = dict()
+    for label in labels:
+        label = int(label)
+        tp = count(tps, label)
+        fp = count(result_volumes, label) - tp
+        fn = count(reference_volumes, label) - tp
+        cms[label] = ConfusionMatrix(tp, fp, fn, result.size - tp - fp - fn)
+    return cms
+
+
+def dc_multilabel(result, reference, labels=None):
+    r"""
+    Dice coefficients of all labels between two label images.
+
+    Parameters
+    ----------
+    result : array_like
+        Label image with non-negative integer labels, where 0 denotes background.
+    reference : array_like
+        Label image with non-negative integer labels, where 0 denotes background.
+        Must be of the same shape as ``result``.
+    labels : sequence of integers, optional
+        The labels for which to compute the Dice coefficient. Defaults to all
+        non-zero labels occurring in any of the two images.
+
+    Returns
+    -------
+    dcs : dict
+        Dictionary with the labels as keys and the :func:`dc` between the label's
+        binary objects in ``result`` and ``reference`` as values.
+
+    See also
+    --------
+    :func:`confusion_matrix_multilabel`
+
+    Examples
+    --------
+    >>> dc_multilabel([0, 1, 1, 2, 2], [0, 1, 2, 2, 2])
+    {1: 0.6666666666666666, 2: 0.8}
+    """
+    return {
+        label: cm.dc()
+        for label, cm in confusion_matrix_multilabel(result, reference, labels).items()
+    }
+
+
+def overlap_report_multilabel(result, reference, labels=None):
+    r"""
+    All overlap metrics of all labels between two label images at once.
+
+    Parameters
+    ----------
+    result : array_like
+        Label image with non-negative integer labels, where 0 denotes background.
+    reference : array_like
+        Label image with non-negative integer labels, where 0 denotes background.
+        Must be of the same shape as ``result``.
+    labels : sequence of integers, optional
+        The labels for which to compute the metrics. Defaults to all non-zero labels
+        occurring in any of the two images.
+
+    Returns
+    -------
+    reports : dict
+        Dictionary with the labels as keys and the :func:`overlap_report` of the
+        label's binary objects in ``result`` and ``reference`` as values.
+
+    See also
+    --------
+    :func:`confusion_matrix_multilabel`
+    """
+    return {
+        label: __overlap_report(cm)
+        for label, cm in confusion_matrix_multilabel(result, reference, labels).items()
+    }
+
+
+def surface_metrics_multilabel(
+    result,
+    reference,
+    voxelspacing=None,
+    connectivity=1,
+    method="edt",
+    labels=None,
+    percentiles=(),
+):
+    r"""
+    All surface distance metrics of all labels between two label images.
+
+    The bounding boxes of all labels are determined in a single pass over each
+    image. The surface distances of each label are then computed only inside the
+    joint bounding box of the label's objects.
+
+    Parameters
+    ----------
+    result : array_like
+        Label image with non-negative integer labels, where 0 denotes background.
+    reference : array_like
+        Label image with non-negative integer labels, where 0 denotes background.
+        Must be of the same shape as ``result``.
+    voxelspacing : float or sequence of floats, optional
+        The voxelspacing in a distance unit i.e. spacing of elements
+        along each dimension. If a sequence, must be of length equal to
+        the input rank; if a single number, this is used for all axes. If
+        not specified, a grid spacing of unity is implied.
+    connectivity : int
+        The neighbourhood/connectivity considered when determining the surface
+        of the binary objects. This value is passed to
+        `scipy.ndimage.generate_binary_structure` and should usually be :math:`> 1`.
+    method : {'edt', 'kdtree', 'auto'}, optional
+        How the nearest surface voxels are found, see :func:`hd`.
+    labels : sequence of integers, optional
+        The labels for which to compute the metrics. Defaults to all non-zero labels
+        occurring in any of the two images.
+    percentiles : sequence of floats, optional
+        Additional percentiles of the Hausdorff distance to compute.
+
+    Returns
+    -------
+    reports : dict
+        Dictionary with the labels as keys and the :func:`surface_distance_report`
+        of the label's binary objects in ``result`` and ``reference`` as values.
+        Surface distances are not defined for labels missing in one of the two
+        images, hence all their metrics are set to `nan`.
+
+    Raises
+    ------
+    ValueError
+        If the two images differ in shape.
+
+    See also
+    --------
+    :func:`surface_distance_report`
+    """
+    result = numpy.atleast_1d(numpy.asarray(result))
+    reference = numpy.atleast_1d(numpy.asarray(reference))
+    if not result.shape == reference.shape:
+        raise ValueError(
+            "The label images differ in shape: {} vs {}.".format(
+                result.shape, reference.shape
+            )
+        )
+
+    result_slicers = find_objects(result)
+    reference_slicers = find_objects(reference)
+
+    def slicer(slicers, label):
+        return slicers[label - 1] if 0 < label <= len(slicers) else None
+
+    if labels is None:
+        labels = [
+            lid + 1
+            for lid in range(max(len(result_slicers), len(reference_slicers)))
+            if slicer(result_slicers, lid + 1) is not None
+            or slicer(reference_slicers, lid + 1) is not None
+        ]
+
+    metrics = ["hd", "hd95", "asd", "assd"] + ["hd{:g}".format(q) for q in percentiles]
+    reports = dict()
+    for label in labels:
+        label = int(label)
+        result_slicer = slicer(result_slicers, label)
+        reference_slicer = slicer(reference_slicers, label)
+        if result_slicer is None or reference_slicer is None:
+            reports[label] = {metric: float("nan") for metric in metrics}
+            continue
+        window = __combine_windows(result_slicer, reference_slicer)
+        reports[label] = surface_distance_report(
+            result[window] == label,
+            reference[window] == label,
+            voxelspacing,
+            connectivity,
+            method,
+            percentiles,
+        )
+    return reports
 
 
 def volume_correlation(results, references):
@@ -701,10 +1409,16 @@ def volume_correlation(results, references):
     p : float
         The two-side p value.
 
-    """
-    results = numpy.atleast_2d(numpy.array(results).astype(numpy.bool_))
-    references = numpy.atleast_2d(numpy.array(references).astype(numpy.bool_))
+    See also
+    --------
+    :class:`VolumeCorrelationAccumulator`
 
+    Notes
+    -----
+    The cases are processed one after another, hence ``results`` and
+    ``references`` can be generators. To avoid holding the volume counts of a
+    large cohort in memory, use :class:`VolumeCorrelationAccumulator`.
+    """
     results_volumes = [numpy.count_nonzero(r) for r in results]
     references_volumes = [numpy.count_nonzero(r) for r in references]
 
@@ -736,10 +1450,16 @@ def volume_change_correlation(results, references):
     p : float
         The two-side p value.
 
-    """
-    results = numpy.atleast_2d(numpy.array(results).astype(numpy.bool_))
-    references = numpy.atleast_2d(numpy.array(references).astype(numpy.bool_))
+    See also
+    --------
+    :class:`VolumeCorrelationAccumulator`
 
+    Notes
+    -----
+    The cases are processed one after another, hence ``results`` and
+    ``references`` can be generators. To avoid holding the volume counts of a
+    large cohort in memory, use :class:`VolumeCorrelationAccumulator`.
+    """
     results_volumes = numpy.asarray([numpy.count_nonzero(r) for r in results])
     references_volumes = numpy.asarray([numpy.count_nonzero(r) for r in references])
 
@@ -751,7 +1471,142 @@ def volume_change_correlation(results, references):
     )  # returns (Pearson's correlation coefficient, 2-tailed p-value)
 
 
-def obj_assd(result, reference, voxelspacing=None, connectivity=1):
+class VolumeCorrelationAccumulator(object):
+    r"""
+    Streaming volume (change) correlation over a cohort of cases.
+
+    Other than :func:`volume_correlation` and :func:`volume_change_correlation`,
+    which require all cases at once, this accumulator is fed one case at a time.
+    It keeps only the running sufficient statistics of Pearson's product-moment
+    correlation coefficient (means and co-moments, updated numerically stable) for
+    the volumes and the volume changes, and the volumes of the last case. Hence
+    the correlation over a cohort of arbitrary size can be computed from a
+    generator of cases while holding a single case in memory.
+
+    See also
+    --------
+    :func:`volume_correlation`
+    :func:`volume_change_correlation`
+
+    Examples
+    --------
+    >>> accumulator = VolumeCorrelationAccumulator()
+    >>> for result, reference in cases:  # e.g. a generator loading one case at a time
+    ...     accumulator.update(result, reference)
+    >>> r, p = accumulator.finalize()
+    >>> r_change, p_change = accumulator.finalize(change=True)
+    """
+
+    def __init__(self):
+        self.__volumes = [0, 0.0, 0.0, 0.0, 0.0, 0.0]
+        self.__changes = [0, 0.0, 0.0, 0.0, 0.0, 0.0]
+        self.__last = None
+
+    @property
+    def n(self):
+        r"""The number of cases accumulated so far."""
+        return self.__volumes[0]
+
+    def update(self, result, reference):
+        r"""
+        Add a case.
+
+        Parameters
+        ----------
+        result : array_like
+            Input data containing objects. Can be any type but will be converted
+            into binary: background where 0, object everywhere else.
+        reference : array_like
+            Input data containing objects. Can be any type but will be converted
+            into binary: background where 0, object everywhere else.
+        """
+        self.update_volumes(numpy.count_nonzero(result), numpy.count_nonzero(reference))
+
+    def update_volumes(self, result_volume, reference_volume):
+        r"""
+        Add a case by its already computed object volumes.
+
+        Parameters
+        ----------
+        result_volume : number
+            The object volume of the result.
+        reference_volume : number
+            The object volume of the reference.
+        """
+        result_volume = float(result_volume)
+        reference_volume = float(reference_volume)
+        self.__update(self.__volumes, result_volume, reference_volume)
+        if self.__last is not None:
+            self.__update(
+                self.__changes,
+                result_volume - self.__last[0],
+                reference_volume - self.__last[1],
+            )
+        self.__last = (result_volume, reference_volume)
+
+    def finalize(self, change=False):
+        r"""
+        Compute the correlation over all cases added so far.
+
+        Parameters
+        ----------
+        change : bool
+            If True, computes the volume change correlation (see
+            :func:`volume_change_correlation`) instead of the volume correlation
+            (see :func:`volume_correlation`).
+
+        Returns
+        -------
+        r : float
+            The correlation coefficient between -1 and 1.
+        p : float
+            The two-side p value.
+
+        Raises
+        ------
+        ValueError
+            If less than two volumes (respectively volume changes) have been
+            accumulated.
+        """
+        n, _, _, mxx, myy, mxy = self.__changes if change else self.__volumes
+        if n < 2:
+            raise ValueError(
+                "At least two {} are required to compute a correlation.".format(
+                    "volume changes" if change else "volumes"
+                )
+            )
+        if 0 == mxx or 0 == myy:  # constant input
+            return float("nan"), float("nan")
+
+        r = min(max(mxy / numpy.sqrt(mxx * myy), -1.0), 1.0)
+        if 2 == n:
+            return float(round(r)), 1.0
+        # under the null hypothesis, r is beta distributed on (-1, 1) with a = b = n/2 - 1
+        ab = n / 2.0 - 1
+        p = 2 * beta.sf(abs(r), ab, ab, loc=-1, scale=2)
+        return r, min(p, 1.0)
+
+    @staticmethod
+    def __update(stats, x, y):
+        # Welford's online update of the means and co-moments
+        stats[0] += 1
+        dx = x - stats[1]
+        dy = y - stats[2]
+        stats[1] += dx / stats[0]
+        stats[2] += dy / stats[0]
+        stats[3] += dx * (x - stats[1])
+        stats[4] += dy * (y - stats[2])
+        stats[5] += dx * (y - stats[2])
+
+
+def obj_assd(
+    result,
+    reference,
+    voxelspacing=None,
+    connectivity=1,
+    matching="greedy",
+    executor=None,
+):
     """
     Average symmetric surface distance.
 
@@ -778,6 +1633,19 @@ def obj_assd(result, reference, voxelspacing=None, connectivity=1):
         `scipy.ndimage.generate_binary_structure` and should usually be :math:`> 1`.
         The decision on the connectivity is important, as it can influence the results
         strongly. If in doubt, leave it as it is.
+    matching : {'greedy', 'maximum'}, optional
+        How corresponding objects are determined when distinct objects overlap with
+        more than one object of the other image. 'greedy' first pairs all objects
+        overlapping with a single object and then, one after another, the objects
+        with the fewest remaining overlap partners. 'maximum' computes a maximum
+        bipartite matching, i.e. the largest possible number of corresponding
+        object pairs.
+    executor : concurrent.futures.Executor, optional
+        If supplied, the surface distances of the corresponding object pairs are
+        computed in parallel by submitting them to this executor, e.g. a
+        `concurrent.futures.ProcessPoolExecutor`. Each task receives only the
+        joint bounding box of its object pair. If not supplied, the pairs are
+        processed one after another.
 
     Returns
     -------
@@ -804,14 +1672,25 @@ def obj_assd(result, reference, voxelspacing=None, connectivity=1):
     """
     assd = numpy.concatenate(
         [
-            __obj_surface_distances(result, reference, voxelspacing, connectivity),
-            __obj_surface_distances(reference, result, voxelspacing, connectivity),
+            __obj_surface_distances(
+                result, reference, voxelspacing, connectivity, matching, executor
+            ),
+            __obj_surface_distances(
+                reference, result, voxelspacing, connectivity, matching, executor
+            ),
         ]
     ).mean()
     return assd
 
 
-def obj_asd(result, reference, voxelspacing=None, connectivity=1):
+def obj_asd(
+    result,
+    reference,
+    voxelspacing=None,
+    connectivity=1,
+    matching="greedy",
+    executor=None,
+):
     """
     Average surface distance between objects.
 
@@ -839,6 +1718,19 @@ def obj_asd(result, reference, voxelspacing=None, connectivity=1):
         `scipy.ndimage.generate_binary_structure` and should usually be :math:`> 1`.
         The decision on the connectivity is important, as it can influence the results
         strongly. If in doubt, leave it as it is.
+    matching : {'greedy', 'maximum'}, optional
+        How corresponding objects are determined when distinct objects overlap with
+        more than one object of the other image. 'greedy' first pairs all objects
+        overlapping with a single object and then, one after another, the objects
+        with the fewest remaining overlap partners. 'maximum' computes a maximum
+        bipartite matching, i.e. the largest possible number of corresponding
+        object pairs.
+    executor : concurrent.futures.Executor, optional
+        If supplied, the surface distances of the corresponding object pairs are
+        computed in parallel by submitting them to this executor, e.g. a
+        `concurrent.futures.ProcessPoolExecutor`. Each task receives only the
+        joint bounding box of its object pair. If not supplied, the pairs are
+        processed one after another.
 
     Returns
     -------
@@ -941,12 +1833,14 @@ def obj_asd(result, reference, voxelspacing=None, connectivity=1):
     Note that the connectivity also influence the notion of what is considered an object
     surface voxels.
     """
-    sds = __obj_surface_distances(result, reference, voxelspacing, connectivity)
+    sds = __obj_surface_distances(
+        result, reference, voxelspacing, connectivity, matching, executor
+    )
     asd = numpy.mean(sds)
     return asd
 
 
-def obj_fpr(result, reference, connectivity=1):
+def obj_fpr(result, reference, connectivity=1, matching="greedy"):
     """
     The false positive rate of distinct binary object detection.
 
@@ -972,6 +1866,13 @@ def obj_fpr(result, reference, connectivity=1):
         `scipy.ndimage.generate_binary_structure` and should usually be :math:`> 1`.
         The decision on the connectivity is important, as it can influence the results
         strongly. If in doubt, leave it as it is.
+    matching : {'greedy', 'maximum'}, optional
+        How corresponding objects are determined when distinct objects overlap with
+        more than one object of the other image. 'greedy' first pairs all objects
+        overlapping with a single object and then, one after another, the objects
+        with the fewest remaining overlap partners. 'maximum' computes a maximum
+        bipartite matching, i.e. the largest possible number of corresponding
+        object pairs.
 
     Returns
     -------
@@ -1055,12 +1956,12 @@ def obj_fpr(result, reference, connectivity=1):
     0.2
     """
     _, _, _, n_obj_reference, mapping = __distinct_binary_object_correspondences(
-        reference, result, connectivity
+        reference, result, connectivity, matching
     )
     return (n_obj_reference - len(mapping)) / float(n_obj_reference)
 
 
-def obj_tpr(result, reference, connectivity=1):
+def obj_tpr(result, reference, connectivity=1, matching="greedy"):
     """
     The true positive rate of distinct binary object detection.
 
@@ -1086,6 +1987,13 @@ def obj_tpr(result, reference, connectivity=1):
         `scipy.ndimage.generate_binary_structure` and should usually be :math:`> 1`.
         The decision on the connectivity is important, as it can influence the results
         strongly. If in doubt, leave it as it is.
+    matching : {'greedy', 'maximum'}, optional
+        How corresponding objects are determined when distinct objects overlap with
+        more than one object of the other image. 'greedy' first pairs all objects
+        overlapping with a single object and then, one after another, the objects
+        with the fewest remaining overlap partners. 'maximum' computes a maximum
+        bipartite matching, i.e. the largest possible number of corresponding
+        object pairs.
 
     Returns
     -------
@@ -1168,12 +2076,14 @@ def obj_tpr(result, reference, connectivity=1):
     1.0
     """
     _, _, n_obj_result, _, mapping = __distinct_binary_object_correspondences(
-        reference, result, connectivity
+        reference, result, connectivity, matching
     )
     return len(mapping) / float(n_obj_result)
 
 
-def __distinct_binary_object_correspondences(reference, result, connectivity=1):
+def __distinct_binary_object_correspondences(
+    reference, result, connectivity=1, matching="greedy"
+):
     """
     Determines all distinct (where connectivity is defined by the connectivity parameter
     passed to scipy's `generate_binary_structure`) binary objects in both of the input
@@ -1182,11 +2092,23 @@ def __distinct_binary_object_correspondences(reference, result, connectivity=1):
     result.
 
     All stems from the problem, that the relationship is non-surjective many-to-many.
+    The overlapping object pairs are collected in a single pass over the images and
+    then matched either greedily (see __greedy_correspondences) or through a maximum
+    bipartite matching, which yields the largest possible number of 1to1 pairs.
 
     @return (labelmap1, labelmap2, n_lables1, n_labels2, labelmapping2to1)
     """
-    result = numpy.atleast_1d(result.astype(numpy.bool_))
-    reference = numpy.atleast_1d(reference.astype(numpy.bool_))
+    if matching not in ("greedy", "maximum"):
+        raise ValueError(
+            "Unknown matching '{}', must be one of 'greedy' or 'maximum'.".format(
+                matching
+            )
+        )
+
+    result = numpy.atleast_1d(numpy.asarray(result).astype(numpy.bool_, copy=False))
+    reference = numpy.atleast_1d(
+        numpy.asarray(reference).astype(numpy.bool_, copy=False)
+    )
 
     # binary structure
     footprint = generate_binary_structure(result.ndim, connectivity)
@@ -1195,62 +2117,137 @@ def __distinct_binary_object_correspondences(reference, result, connectivity=1):
     labelmap1, n_obj_result = label(result, footprint)
     labelmap2, n_obj_reference = label(reference, footprint)
 
-    # find all overlaps from labelmap2 to labelmap1; collect one-to-one relationships and store all one-two-many for later processing
-    slicers = find_objects(labelmap2)  # get windows of labelled objects
-    mapping = (
-        dict()
-    )  # mappings from labels in labelmap2 to corresponding object labels in labelmap1
-    used_labels = set()  # set to collect all already used labels from labelmap2
-    one_to_many = list()  # list to collect all one-to-many mappings
-    for l1id, slicer in enumerate(
-        slicers
-    ):  # iterate over object in labelmap2 and their windows
-        l1id += 1  # labelled objects have ids sarting from 1
-        bobj = (l1id) == labelmap2[
-            slicer
-        ]  # find binary object corresponding to the label1 id in the segmentation
-        l2ids = numpy.unique(
-            labelmap1[slicer][bobj]
-        )  # extract all unique object identifiers at the corresponding positions in the reference (i.e. the mapping)
-        l2ids = l2ids[0 != l2ids]  # remove background identifiers (=0)
-        if 1 == len(
-            l2ids
-        ):  # one-to-one mapping: if target label not already used, add to final list of object-to-object mappings and mark target label as used
-            l2id = l2ids[0]
-            if not l2id in used_labels:
-                mapping[l1id] = l2id
-                used_labels.add(l2id)
-        elif 1 < len(
-            l2ids
-        ):  # one-to-many mapping: store relationship for later processing
-            one_to_many.append((l1id, set(l2ids)))
-
-    # process one-to-many mappings, always choosing the one with the least labelmap2 correspondences first
-    while True:
-        one_to_many = [
-            (l1id, l2ids - used_labels) for l1id, l2ids in one_to_many
-        ]  # remove already used ids from all sets
-        one_to_many = [x for x in one_to_many if x[1]]  # remove empty sets
-        one_to_many = sorted(one_to_many, key=lambda x: len(x[1]))  # sort by set length
-        if 0 == len(one_to_many):
-            break
-        l2id = one_to_many[0][
-            1
-        ].pop()  # select an arbitrary target label id from the shortest set
-        mapping[one_to_many[0][0]] = l2id  # add to one-to-one mappings
-        used_labels.add(l2id)  # mark target label as used
-        one_to_many = one_to_many[1:]  # delete the processed set from all sets
+    # find all pairs of overlapping objects at once, encoded as single integer keys
+    overlap = (labelmap1 != 0) & (labelmap2 != 0)
+    pairs = numpy.unique(
+        labelmap2[overlap].astype(numpy.int64) * (n_obj_result + 1) + labelmap1[overlap]
+    )
+    l2ids, l1ids = numpy.divmod(pairs, n_obj_result + 1)
+
+    if 0 == len(pairs):
+        mapping = dict()
+    elif "maximum" == matching:
+        graph = csr_matrix(
+            (numpy.ones(len(pairs), dtype=numpy.int8), (l2ids - 1, l1ids - 1)),
+            shape=(n_obj_reference, n_obj_result),
+        )
+        matches = maximum_bipartite_matching(graph, perm_type="column")
+        mapping = {
+            int(l2id) + 1: int(matches[l2id]) + 1
+            for l2id in numpy.flatnonzero(matches >= 0)
+        }
+    else:
+        mapping = __greedy_correspondences(l2ids, l1ids)
 
     return labelmap1, labelmap2, n_obj_result, n_obj_reference, mapping
 
 
-def __surface_distances(result, reference, voxelspacing=None, connectivity=1):
+def __greedy_correspondences(l2ids, l1ids):
+    """
+    Greedy 1to1 matching of the overlapping object pairs (l2ids[i], l1ids[i]), which
+    must be sorted by l2ids. First all objects with a single partner are matched (if
+    that is still free), then the remaining objects, always choosing the one with the
+    least free partners next.
+    """
+    splits = numpy.flatnonzero(numpy.diff(l2ids)) + 1
+    mapping = dict()  # mappings from labels in labelmap2 to labels in labelmap1
+    used_labels = set()  # set to collect all already used labels from labelmap1
+    one_to_many = dict()  # all one-to-many mappings for later processing
+    for l2id, candidates in zip(
+        l2ids[numpy.r_[0, splits]].tolist(), numpy.split(l1ids, splits)
+    ):
+        if 1 == len(candidates):
+            l1id = int(candidates[0])
+            if not l1id in used_labels:
+                mapping[l2id] = l1id
+                used_labels.add(l1id)
+        else:
+            one_to_many[l2id] = set(candidates.tolist())
+
+    # process one-to-many mappings, always choosing the one with the least free
+    # correspondences first; outdated queue entries are skipped when popped
+    sharing = dict()  # labels in labelmap1 to all one-to-many mappings containing them
+    for l2id, candidates in one_to_many.items():
+        candidates -= used_labels
+        for l1id in candidates:
+            sharing.setdefault(l1id, []).append(l2id)
+    queue = [(len(candidates), l2id) for l2id, candidates in one_to_many.items()]
+    heapq.heapify(queue)
+    while queue:
+        n_candidates, l2id = heapq.heappop(queue)
+        if (
+            not l2id in one_to_many
+            or 0 == n_candidates
+            or n_candidates != len(one_to_many[l2id])
+        ):
+            continue
+        l1id = min(one_to_many.pop(l2id))
+        mapping[l2id] = l1id  # add to one-to-one mappings
+        used_labels.add(l1id)  # mark target label as used
+        for other in sharing[l1id]:  # remove from all other one-to-many mappings
+            if other in one_to_many:
+                one_to_many[other].discard(l1id)
+                heapq.heappush(queue, (len(one_to_many[other]), other))
+
+    return mapping
+
+
+def __surface_distances(
+    result, reference, voxelspacing=None, connectivity=1, method="edt"
+):
     """
     The distances between the surface voxel of binary objects in result and their
     nearest partner surface voxel of a binary object in reference.
+
+    The border voxels are extracted inside the bounding box of each object only and
+    the distance transform is furthermore restricted to the joint bounding box of
+    both objects, which yields the exact same distances at a fraction of the costs
+    for small objects in large images.
+
+    The method selects how the nearest partner voxels are found: "edt" computes a
+    distance transform over the whole joint bounding box, "kdtree" queries a k-d tree
+    built over the reference surface voxels only and "auto" selects the cheaper one
+    by the ratio of surface to image voxels.
+    """
+    result_border, reference_border, window, voxelspacing, method = __surface_borders(
+        result, reference, voxelspacing, connectivity, method
+    )
+    return __border_distances(
+        result_border, reference_border, window, voxelspacing, method
+    )
+
+
+def __surface_borders(result, reference, voxelspacing, connectivity, method):
+    """
+    The shared preparation of the surface distances in both directions: the border
+    voxels of result and reference, the window the distances are computed in, the
+    normalized voxel spacing and the resolved method.
     """
-    result = numpy.atleast_1d(result.astype(numpy.bool_))
-    reference = numpy.atleast_1d(reference.astype(numpy.bool_))
+    if method not in ("edt", "kdtree", "auto"):
+        raise ValueError(
+            "Unknown method '{}', must be one of 'edt', 'kdtree' or 'auto'.".format(
+                method
+            )
+        )
+
+    # unpack packed masks only along the rows of the first axis holding objects
+    if isinstance(result, PackedMask) and isinstance(reference, PackedMask):
+        extents = [
+            extent
+            for extent in (result.row_extent(), reference.row_extent())
+            if extent is not None
+        ]
+        rows = slice(
+            min([extent.start for extent in extents], default=0),
+            max([extent.stop for extent in extents], default=0),
+        )
+        result = result.unpack((rows,))
+        reference = reference.unpack((rows,))
+
+    result = numpy.atleast_1d(numpy.asarray(result).astype(numpy.bool_, copy=False))
+    reference = numpy.atleast_1d(
+        numpy.asarray(reference).astype(numpy.bool_, copy=False)
+    )
     if voxelspacing is not None:
         voxelspacing = _ni_support._normalize_sequence(voxelspacing, result.ndim)
         voxelspacing = numpy.asarray(voxelspacing, dtype=numpy.float64)
@@ -1270,40 +2267,178 @@ def __surface_distances(result, reference, voxelspacing=None, connectivity=1):
             "The second supplied array does not contain any binary object."
         )
 
-    # extract only 1-pixel border line of objects
-    result_border = result ^ binary_erosion(result, structure=footprint, iterations=1)
-    reference_border = reference ^ binary_erosion(
-        reference, structure=footprint, iterations=1
+    # extract only 1-pixel border line of objects, as voxel coordinates
+    result_border = __border_voxels(result, footprint)
+    reference_border = __border_voxels(reference, footprint)
+
+    # restrict the distance transform to the joint bounding box of both objects
+    # Note: all border voxels lie inside the box, hence so does the nearest partner
+    #       border voxel of each border voxel, in both directions
+    window = __combine_windows(
+        tuple(slice(c.min(), c.max() + 1) for c in result_border),
+        tuple(slice(c.min(), c.max() + 1) for c in reference_border),
     )
 
+    if "auto" == method:
+        n_border = len(result_border[0]) + len(reference_border[0])
+        n_window = numpy.prod([w.stop - w.start for w in window])
+        method = "kdtree" if n_border * __KDTREE_SURFACE_RATIO < n_window else "edt"
+
+    return result_border, reference_border, window, voxelspacing, method
+
+
+def __border_distances(border, partner_border, window, voxelspacing, method):
+    """
+    The distances between the border voxels and their nearest partner border voxel,
+    found by method "edt" or "kdtree" inside the window.
+    """
+    if "kdtree" == method:
+        # find the nearest partner border voxel of each border voxel in physical
+        # space, then compute the distances the same way as scipys distance
+        # transform does to obtain the exact same values
+        physical_spacing = (
+            numpy.ones(len(border)) if voxelspacing is None else voxelspacing
+        )
+        tree = cKDTree(numpy.stack(partner_border, axis=1) * physical_spacing)
+        _, nearest = tree.query(numpy.stack(border, axis=1) * physical_spacing)
+        dt = numpy.stack(
+            [pc[nearest] - c for pc, c in zip(partner_border, border)]
+        ).astype(numpy.float64)
+        if voxelspacing is not None:
+            for ii in range(len(voxelspacing)):
+                dt[ii] *= voxelspacing[ii]
+        numpy.multiply(dt, dt, dt)
+        return numpy.sqrt(numpy.add.reduce(dt, axis=0))
+
     # compute average surface distance
     # Note: scipys distance transform is calculated only inside the borders of the
     #       foreground objects, therefore the input has to be reversed
-    dt = distance_transform_edt(~reference_border, sampling=voxelspacing)
-    sds = dt[result_border]
+    partner_surface = numpy.ones(
+        tuple(w.stop - w.start for w in window), dtype=numpy.bool_
+    )
+    partner_surface[tuple(c - w.start for c, w in zip(partner_border, window))] = False
+    dt = distance_transform_edt(partner_surface, sampling=voxelspacing)
+    return dt[tuple(c - w.start for c, w in zip(border, window))]
 
-    return sds
+
+def __border_voxels(mask, footprint):
+    """
+    The coordinates of the border voxels of the binary objects in mask, i.e. the
+    object voxels with at least one background neighbour under the footprint.
+
+    Equals ``numpy.nonzero(mask ^ binary_erosion(mask, footprint))``, but works by
+    neighbour-shift comparisons inside the objects bounding box only, such that no
+    intermediate volumes of the size of mask are allocated.
+    """
+    window = find_objects(mask.view(numpy.uint8))[0]
+    objects = mask[window]
+    padded = numpy.pad(objects, 1)
+
+    # a voxel is interior, if all its neighbours are object voxels
+    interior = objects.copy()
+    for offset in numpy.argwhere(footprint):
+        interior &= padded[
+            tuple(slice(o, o + n) for o, n in zip(offset, objects.shape))
+        ]
+
+    numpy.logical_xor(objects, interior, out=interior)
+    return tuple(c + w.start for c, w in zip(numpy.nonzero(interior), window))
 
 
-def __obj_surface_distances(result, reference, voxelspacing=None, connectivity=1):
+def __obj_surface_distances(
+    result,
+    reference,
+    voxelspacing=None,
+    connectivity=1,
+    matching="greedy",
+    executor=None,
+):
     """
     The distances between the surface voxel between all corresponding binary
     objects in result and reference. Correspondence is defined as unique and at least one voxel overlap.
+
+    If an executor is passed, the object pairs are submitted to it as independent
+    tasks. At most a fixed number of tasks is pending at any time, hence memory use
+    stays bounded by the joint windows of these object pairs.
+
+    The distances are written into a single array allocated up front, as the number
+    of distances of each object pair equals the number of border voxels of its
+    first object, which are counted in one pass over labelmap1.
     """
-    sds = list()
     labelmap1, labelmap2, _a, _b, mapping = __distinct_binary_object_correspondences(
-        result, reference, connectivity
+        result, reference, connectivity, matching
     )
     slicers1 = find_objects(labelmap1)
     slicers2 = find_objects(labelmap2)
-    for lid2, lid1 in list(mapping.items()):
-        window = __combine_windows(slicers1[lid1 - 1], slicers2[lid2 - 1])
-        object1 = labelmap1[window] == lid1
-        object2 = labelmap2[window] == lid2
-        sds.extend(__surface_distances(object1, object2, voxelspacing, connectivity))
+    pairs = list(mapping.items())
+
+    # count the border voxels per object; the objects are connected components
+    # under the same connectivity, hence no two of them are neighbours
+    sizes = numpy.zeros(len(slicers1) + 1, dtype=numpy.intp)
+    if 0 != len(pairs):
+        footprint = generate_binary_structure(labelmap1.ndim, connectivity)
+        border = __border_voxels(labelmap1.astype(numpy.bool_), footprint)
+        sizes = numpy.bincount(labelmap1[border], minlength=len(slicers1) + 1)
+    stops = numpy.cumsum([sizes[lid1] for _, lid1 in pairs], dtype=numpy.intp)
+    starts = stops - [sizes[lid1] for _, lid1 in pairs]
+    sds = numpy.empty(stops[-1] if 0 != len(pairs) else 0, dtype=numpy.float64)
+
+    def object_pairs():
+        for lid2, lid1 in pairs:
+            window = __combine_windows(slicers1[lid1 - 1], slicers2[lid2 - 1])
+            yield labelmap1[window] == lid1, labelmap2[window] == lid2
+
+    if executor is None:
+        for idx, (object1, object2) in enumerate(object_pairs()):
+            sds[starts[idx] : stops[idx]] = __surface_distances(
+                object1, object2, voxelspacing, connectivity
+            )
+    else:
+        pending = collections.deque()
+        for idx, (object1, object2) in enumerate(object_pairs()):
+            pending.append(
+                (
+                    idx,
+                    executor.submit(
+                        __surface_distances,
+                        object1,
+                        object2,
+                        voxelspacing,
+                        connectivity,
+                    ),
+                )
+            )
+            if len(pending) >= __MAX_PENDING_TASKS:
+                done, future = pending.popleft()
+                sds[starts[done] : stops[done]] = future.result()
+        for done, future in pending:
+            sds[starts[done] : stops[done]] = future.result()
+
     return sds
 
 
+def __overlap_report(cm):
+    """
+    All overlap metrics of a confusion matrix as dictionary.
+    """
+    report = {
+        "dc": cm.dc(),
+        "jc": cm.jc(),
+        "precision": cm.precision(),
+        "recall": cm.recall(),
+        "sensitivity": cm.sensitivity(),
+        "specificity": cm.specificity(),
+        "true_positive_rate": cm.recall(),
+        "true_negative_rate": cm.specificity(),
+        "positive_predictive_value": cm.precision(),
+    }
+    try:
+        report["ravd"] = cm.ravd()
+    except RuntimeError:
+        report["ravd"] = float("nan")
+    return report
+
+
 def __combine_windows(w1, w2):
     """
     Joins two windows (defined by tuple of slices) such that their maximum
@@ -1313,3 +2448,10 @@ def __combine_windows(w1, w2):
     for s1, s2 in zip(w1, w2):
         res.append(slice(min(s1.start, s2.start), max(s1.stop, s2.stop)))
     return tuple(res)
+
+
+# maximum number of object pairs submitted to an executor at the same time
+__MAX_PENDING_TASKS = 2 * (os.cpu_count() or 1)
+
+# surface voxels are queried by k-d tree when less than one in this many image voxels
+__KDTREE_SURFACE_RATIO = 16
@@ -1,6 +1,13 @@
+from .binary import TestPackedMask as TestPackedMask
 from .houghtransform import TestHoughTransform as TestHoughTransform
 from .IntensityRangeStandardization import (
     TestIntensityRangeStandardization as TestIntensityRangeStandardization,
 )
+from .label import TestLabel as TestLabel
 
-__all__ = ["TestHoughTransform", "TestIntensityRangeStandardization"]
+__all__ = [
+    "TestPackedMask",
+    "TestHoughTransform",
+    "TestIntensityRangeStandardization",
+    "TestLabel",
+]
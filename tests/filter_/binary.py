@@ -0,0 +1,71 @@
+"""
+Unittest for medpy.filter.binary
+
+@author Oskar Maier
+@version r0.1.0
+@since 2024-08-01
+@status Release
+"""
+
+# build-in modules
+import unittest
+
+# third-party modules
+import numpy
+
+# own modules
+from medpy.filter import PackedMask, largest_connected_component, size_threshold
+
+
+# code
+class TestPackedMask(unittest.TestCase):
+    def setUp(self):
+        self.mask = numpy.random.default_rng(0).random((9, 7, 5)) > 0.6
+
+    def test_roundtrip(self):
+        packed = PackedMask(self.mask)
+        self.assertEqual(packed.nbytes, (self.mask.size + 7) // 8)
+        numpy.testing.assert_array_equal(packed.unpack(), self.mask)
+        numpy.testing.assert_array_equal(numpy.asarray(packed), self.mask)
+        self.assertEqual(
+            PackedMask.from_packed(numpy.packbits(self.mask), self.mask.shape), packed
+        )
+
+    def test_unpack_window(self):
+        packed = PackedMask(self.mask)
+        for window in [(slice(2, 5),), (slice(3, 4), slice(1, 6)), (slice(0, 9),)]:
+            numpy.testing.assert_array_equal(packed.unpack(window), self.mask[window])
+
+    def test_count_and_operators(self):
+        other = numpy.random.default_rng(1).random((9, 7, 5)) > 0.3
+        packed, packed_other = PackedMask(self.mask), PackedMask(other)
+        self.assertEqual(packed.count_nonzero(), numpy.count_nonzero(self.mask))
+        self.assertEqual(
+            (packed & packed_other).count_nonzero(),
+            numpy.count_nonzero(self.mask & other),
+        )
+        numpy.testing.assert_array_equal(
+            (packed | packed_other).unpack(), self.mask | other
+        )
+        numpy.testing.assert_array_equal(
+            (packed ^ packed_other).unpack(), self.mask ^ other
+        )
+        self.assertEqual((~packed).count_nonzero(), numpy.count_nonzero(~self.mask))
+
+    def test_row_extent(self):
+        mask = numpy.zeros((10, 3), numpy.bool_)
+        self.assertIsNone(PackedMask(mask).row_extent())
+        mask[4:6, 1] = True
+        extent = PackedMask(mask).row_extent()
+        self.assertFalse(mask[: extent.start].any() or mask[extent.stop :].any())
+
+    def test_filters_accept_packed(self):
+        packed = PackedMask(self.mask)
+        result = size_threshold(packed, 3)
+        self.assertIsInstance(result, PackedMask)
+        numpy.testing.assert_array_equal(result.unpack(), size_threshold(self.mask, 3))
+        result = largest_connected_component(packed)
+        self.assertIsInstance(result, PackedMask)
+        numpy.testing.assert_array_equal(
+            result.unpack(), largest_connected_component(self.mask)
+        )
@@ -0,0 +1,50 @@
+"""
+Unittest for medpy.filter.label
+
+@author Oskar Maier
+@version r0.1.0
+@since 2026-10-16
+@status Release
+"""
+
+# build-in modules
+import unittest
+
+# third-party modules
+import numpy
+
+# own modules
+from medpy.core import ArgumentError
+from medpy.filter import relabel, relabel_map, relabel_non_zero
+
+
+# code
+class TestLabel(unittest.TestCase):
+    def setUp(self):
+        self.label_image = numpy.asarray([[7, 7, 0], [3, 0, 12], [12, 3, 3]])
+
+    def test_relabel(self):
+        original = self.label_image.copy()
+        result = relabel(self.label_image)
+        numpy.testing.assert_array_equal(result, [[1, 1, 2], [3, 2, 4], [4, 3, 3]])
+        self.assertEqual(result.dtype, self.label_image.dtype)
+        numpy.testing.assert_array_equal(self.label_image, original)
+        numpy.testing.assert_array_equal(relabel(self.label_image, start=5), result + 4)
+
+    def test_relabel_non_zero(self):
+        numpy.testing.assert_array_equal(
+            relabel_non_zero(self.label_image, start=2),
+            [[3, 3, 0], [2, 0, 4], [4, 2, 2]],
+        )
+        self.assertRaises(ArgumentError, relabel_non_zero, self.label_image, 0)
+
+    def test_relabel_map(self):
+        mapping = {0: 0, 3: 1, 7: 1, 12: 0}
+        numpy.testing.assert_array_equal(
+            relabel_map(self.label_image, mapping),
+            [[1, 1, 0], [1, 0, 0], [0, 1, 1]],
+        )
+        calls = []
+        relabel_map(self.label_image, mapping, lambda m, x: calls.append(x) or m[x])
+        self.assertEqual(calls, [0, 3, 7, 12])
+        self.assertRaises(ArgumentError, relabel_map, self.label_image, {0: 0})
@@ -1,6 +1,18 @@
 # from cut import TestCut # deactivated since faulty
+from .benchmark import TestBenchmark as TestBenchmark
+from .dimacs import TestDimacs as TestDimacs
 from .energy_label import TestEnergyLabel as TestEnergyLabel
 from .energy_voxel import TestEnergyVoxel as TestEnergyVoxel
 from .graph import TestGraph as TestGraph
+from .topology import TestTopology as TestTopology
+from .wrapper import TestWrapper as TestWrapper
 
-__all__ = ["TestEnergyLabel", "TestEnergyVoxel", "TestGraph"]
+__all__ = [
+    "TestBenchmark",
+    "TestDimacs",
+    "TestEnergyLabel",
+    "TestEnergyVoxel",
+    "TestGraph",
+    "TestTopology",
+    "TestWrapper",
+]
@@ -0,0 +1,92 @@
+"""
+Unittest for the medpy.graphcut.benchmark methods.
+
+@author Oskar Maier
+@version r0.1.0
+@since 2026-10-16
+@status Release
+"""
+
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+# third-party modules
+import numpy
+
+# own modules
+from medpy.graphcut.benchmark import (
+    StageRecorder,
+    benchmark_label_graphcut,
+    benchmark_voxel_graphcut,
+    run_benchmarks,
+    synthetic_label_image,
+)
+from medpy.graphcut.topology import voxel_topology
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_StageRecorder(self):
+        recorder = StageRecorder(memory=True)
+        tracemalloc.start()
+        try:
+            recorder.measure(
+                "outer",
+                lambda: [
+                    numpy.ones(100000),
+                    recorder.measure("inner", numpy.ones, 200000),
+                ],
+            )
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(set(recorder.stages), {"outer", "inner"})
+        self.assertEqual(recorder.stages["inner"]["calls"], 1)
+        # the peak memory of the outer stage includes the nested stage
+        self.assertGreaterEqual(recorder.stages["inner"]["peak_memory"], 1600000)
+        self.assertGreaterEqual(recorder.stages["outer"]["peak_memory"], 2400000)
+
+    def test_synthetic_label_image(self):
+        image, label_image, fg_markers, bg_markers = synthetic_label_image(
+            (10, 8, 6), region_size=4
+        )
+        self.assertEqual(label_image.shape, image.shape)
+        self.assertEqual(label_image.min(), 1)
+        self.assertEqual(len(numpy.unique(label_image)), 3 * 2 * 2)
+        self.assertEqual(label_image.max(), 3 * 2 * 2)
+        self.assertTrue(fg_markers.any() and bg_markers.any())
+        self.assertFalse((fg_markers & bg_markers).any())
+
+    def test_benchmark_label_graphcut(self):
+        result = benchmark_label_graphcut((12, 12, 12), region_size=3, repeat=2)
+        self.assertEqual(result["nodes"], 64)
+        self.assertEqual(result["edges"], 3 * 4 * 4 * 3)
+        self.assertEqual(set(result["stages"]), {"construction", "energy", "maxflow"})
+        for stage in result["stages"].values():
+            self.assertGreater(stage["time"], 0)
+            self.assertGreaterEqual(stage["peak_memory"], 0)
+
+    def test_benchmark_voxel_graphcut(self):
+        shape = (10, 10, 10)
+        voxel_topology(shape, cache=True)
+        result = benchmark_voxel_graphcut(shape, repeat=2)
+        self.assertEqual(result["nodes"], 1000)
+        # the cached topology is not reused, i.e. its construction is measured
+        self.assertEqual(voxel_topology.cache_info().hits, 0)
+        self.assertGreaterEqual(
+            result["stages"]["construction"]["peak_memory"],
+            voxel_topology(shape).nodes_from[0].nbytes * 6,
+        )
+
+    def test_run_benchmarks(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fn = os.path.join(tmpdir, "benchmark.json")
+            report = run_benchmarks(
+                shapes=[(8, 8, 8)], repeat=1, memory=False, filename=fn
+            )
+            with open(fn) as f:
+                self.assertEqual(json.load(f), report)
+        self.assertEqual([r["problem"] for r in report["results"]], ["voxel", "label"])
+        self.assertEqual(report["results"][0]["edges"], 3 * 8 * 8 * 7)
+        self.assertIsNone(report["results"][0]["stages"]["maxflow"]["peak_memory"])
@@ -0,0 +1,141 @@
+"""
+Unittest for the medpy.graphcut.write and medpy.graphcut.read methods.
+
+@author Oskar Maier
+@version r0.1.0
+@since 2026-10-16
+@status Release
+"""
+
+import gzip
+import io
+import os
+import tempfile
+import unittest
+
+# third-party modules
+import numpy
+
+# own modules
+from medpy.graphcut import ArrayGraph, Graph, graph_from_dimacs, graph_to_dimacs
+
+
+class TestDimacs(unittest.TestCase):
+    def __graph(self, cls):
+        graph = cls()
+        graph.set_nodes(4)
+        graph.set_source_nodes([1])
+        graph.set_sink_nodes([4])
+        graph.set_nweights({(1, 2): (1.5, 2), (2, 3): (0.25, 0), (4, 3): (3, 3)})
+        graph.add_tweights({3: (0.5, 0)})
+        return graph
+
+    def test_graph_to_dimacs(self):
+        f = io.StringIO()
+        graph_to_dimacs(self.__graph(Graph), f, chunksize=2)
+        lines = f.getvalue().splitlines()
+        self.assertIn("p max 6 3", lines)
+        self.assertEqual(
+            [line for line in lines if line.startswith("a")],
+            [
+                "a 1 3 65535",
+                "a 6 2 65535",
+                "a 1 5 0.5",
+                "a 3 4 1.5",
+                "a 4 3 2",
+                "a 4 5 0.25",
+                "a 6 5 3",
+                "a 5 6 3",
+            ],
+        )
+        self.assertEqual(lines[-1], "c end-of-file")
+
+        # both graph implementations are persisted equally
+        f_array = io.StringIO()
+        graph_to_dimacs(self.__graph(ArrayGraph), f_array, chunksize=2)
+        self.assertEqual(sorted(f_array.getvalue().splitlines()), sorted(lines))
+
+        # weights can be written with a fixed precision
+        f = io.StringIO()
+        graph_to_dimacs(self.__graph(Graph), f, precision=2)
+        self.assertIn("a 1 3 6.6e+04", f.getvalue().splitlines())
+        self.assertIn("a 4 5 0.25", f.getvalue().splitlines())
+
+        # by default, weights are written exactly
+        graph = Graph()
+        graph.set_nodes(2)
+        graph.set_nweights({(1, 2): (0.1, 1e20)})
+        f = io.StringIO()
+        graph_to_dimacs(graph, f)
+        self.assertIn("a 3 4 0.10000000000000001", f.getvalue().splitlines())
+        self.assertIn("a 4 3 1e+20", f.getvalue().splitlines())
+
+    def test_graph_from_dimacs(self):
+        f = io.StringIO()
+        graph_to_dimacs(self.__graph(Graph), f)
+        f.seek(0)
+        graph = graph_from_dimacs(f, buffersize=16)
+        self.assertIsInstance(graph, ArrayGraph)
+        self.assertEqual(graph.get_node_count(), 4)
+        self.assertEqual(
+            graph.get_nweights(),
+            {(1, 2): (1.5, 2.0), (2, 3): (0.25, 0.0), (3, 4): (3.0, 3.0)},
+        )
+        self.assertEqual(
+            graph.get_tweights(),
+            {1: (65535.0, 0.0), 3: (0.5, 0.0), 4: (0.0, 65535.0)},
+        )
+        self.assertRaises(ValueError, graph_from_dimacs, io.StringIO("c empty\n"))
+        self.assertRaises(
+            ValueError,
+            graph_from_dimacs,
+            io.StringIO("p max 3 1\nn 1 s\nn 2 t\na 1 x 1\n"),
+        )
+
+    def test_graph_from_dimacs_terminal_arcs(self):
+        # terminals on either end of arcs, with the terminals first resp. last
+        content = (
+            "p max 4 7\nn {s} s\nn {t} t\n"
+            "a {s} {a} 5\na {a} {b} 2\na {b} {t} 4\na {a} {s} 7\n"
+            "a {t} {b} 9\na {s} {t} 3\na {b} {a} 1\n"
+        )
+        for ids in (dict(s=1, t=2, a=3, b=4), dict(a=1, b=2, s=3, t=4)):
+            graph = graph_from_dimacs(io.StringIO(content.format(**ids)))
+            self.assertEqual(graph.get_node_count(), 2)
+            self.assertEqual(graph.get_nweights(), {(1, 2): (2.0, 1.0)})
+            # arcs into the source or out of the sink are dropped, while an arc
+            # from the source to the sink adds to both t-weights
+            self.assertEqual(graph.get_tweights(), {1: (8.0, 3.0), 2: (0.0, 4.0)})
+            self.assertEqual(graph.to_gcgraph().maxflow(), 5)
+
+            # the max-flow survives a round-trip
+            f = io.StringIO()
+            graph_to_dimacs(graph, f)
+            f.seek(0)
+            restored = graph_from_dimacs(f)
+            self.assertEqual(restored.get_tweights(), graph.get_tweights())
+            self.assertEqual(restored.get_nweights(), graph.get_nweights())
+            self.assertEqual(restored.to_gcgraph().maxflow(), 5)
+
+    def test_dimacs_roundtrip(self):
+        rng = numpy.random.default_rng(0)
+        graph = ArrayGraph(100)
+        nodes_from = rng.integers(1, 100, 500)
+        graph.add_nweights(nodes_from, nodes_from + 1, rng.random(500), 1)
+        graph.add_tweights_array(numpy.arange(1, 11), 10, rng.random(10))
+        graph.add_tweights_array(numpy.arange(90, 101), rng.random(11), 10)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fn = os.path.join(tmpdir, "graph.max.gz")
+            graph_to_dimacs(graph, fn, chunksize=64)
+            fn9 = os.path.join(tmpdir, "graph9.max.gz")
+            graph_to_dimacs(graph, fn9, chunksize=64, compresslevel=9)
+            self.assertLessEqual(os.path.getsize(fn9), os.path.getsize(fn))
+            with gzip.open(fn, "rt") as f:
+                self.assertTrue(f.readline().startswith("c"))
+            restored = graph_from_dimacs(fn)
+            gcgraph = graph_from_dimacs(fn, gcgraph=True)
+
+        self.assertEqual(restored.get_tweights(), graph.get_tweights())
+        self.assertEqual(graph.to_gcgraph().maxflow(), restored.to_gcgraph().maxflow())
+        self.assertAlmostEqual(gcgraph.maxflow(), restored.to_gcgraph().maxflow())
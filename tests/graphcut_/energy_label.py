@@ -17,13 +17,18 @@ import unittest
 import numpy
 from numpy.testing import assert_raises
 
+from medpy.filter import relabel
+
 # own modules
 from medpy.graphcut.energy_label import (
     boundary_difference_of_means,
+    boundary_statistics,
     boundary_stawiaski,
     boundary_stawiaski_directed,
+    region_adjacency,
     regional_atlas,
 )
+from medpy.graphcut.generate import graph_from_labels
 from medpy.graphcut.graph import GCGraph
 
 
@@ -133,6 +138,92 @@ class TestEnergyLabel(unittest.TestCase):
         for bt in self.BOUNDARY_TERMS_2ARG:
             assert_raises(AttributeError, bt, None, label, (None, None))
 
+    def test_graph_from_labels_arbitrary_labels(self):
+        rng = numpy.random.default_rng(0)
+        image = rng.random((12, 12))
+        image[:, 6:] += 1
+        label = numpy.repeat(numpy.repeat(numpy.arange(16).reshape(4, 4), 3, 0), 3, 1)
+        fg_markers = numpy.zeros(label.shape, numpy.bool_)
+        fg_markers[6, 0] = True
+        bg_markers = numpy.zeros(label.shape, numpy.bool_)
+        bg_markers[6, -1] = True
+
+        # arbitrary, unordered region ids lead to the same graph
+        arbitrary = rng.permutation(numpy.arange(16) * 1000 + 7)[label]
+        results = []
+        for label_image in (label + 1, arbitrary, relabel(arbitrary)):
+            graph = graph_from_labels(
+                label_image,
+                fg_markers,
+                bg_markers,
+                boundary_term=boundary_difference_of_means,
+                boundary_term_args=image,
+            )
+            maxflow = graph.maxflow()
+            labels = numpy.unique(label_image)
+            segments = [graph.what_segment(n) for n in range(len(labels))]
+            results.append((maxflow, dict(zip(labels.tolist(), segments)), label_image))
+        for maxflow, segments, label_image in results[1:]:
+            self.assertAlmostEqual(maxflow, results[0][0])
+            for region in range(16):
+                self.assertEqual(
+                    segments[label_image[label == region][0]],
+                    results[0][1][region + 1],
+                )
+
+    def test_region_adjacency(self):
+        label = [[1, 3, 4], [1, 2, 5], [1, 2, 5]]
+        edges, counts = region_adjacency(label, return_counts=True)
+        numpy.testing.assert_array_equal(
+            edges, [[1, 2], [1, 3], [2, 3], [2, 5], [3, 4], [4, 5]]
+        )
+        numpy.testing.assert_array_equal(counts, [2, 1, 1, 2, 1, 1])
+
+        edges, counts = region_adjacency(label, connectivity=2, return_counts=True)
+        numpy.testing.assert_array_equal(
+            edges, [[1, 2], [1, 3], [2, 3], [2, 4], [2, 5], [3, 4], [3, 5], [4, 5]]
+        )
+        numpy.testing.assert_array_equal(counts, [5, 2, 1, 1, 4, 1, 1, 1])
+
+        # arbitrary labels and F-ordered images
+        label = numpy.asarray([[-7, 1000], [-7, 3]], order="F")
+        numpy.testing.assert_array_equal(
+            region_adjacency(label), [[-7, 3], [-7, 1000], [3, 1000]]
+        )
+        self.assertEqual(region_adjacency(numpy.ones((3, 3))).shape, (0, 2))
+        assert_raises(ValueError, region_adjacency, label, 0)
+
+    def test_boundary_statistics(self):
+        label = [[1, 3, 4], [1, 2, 5], [1, 2, 5]]
+        gradient = [[1.0, -4.0, 0.0], [2.0, 3.0, 0.5], [0.0, -1.0, 2.0]]
+        edges, statistics = boundary_statistics(label, gradient)
+        numpy.testing.assert_array_equal(edges, region_adjacency(label))
+        # region pair (1, 2) with voxel pairs (2.0, 3.0) and (0.0, -1.0)
+        self.assertEqual(statistics["sum"][0], 4.0)
+        self.assertEqual(statistics["mean"][0], 2.0)
+        self.assertEqual(statistics["min"][0], 1.0)
+        self.assertEqual(statistics["max"][0], 3.0)
+        self.assertEqual(statistics["count"][0], 2)
+        # region pair (2, 5) with voxel pairs (3.0, 0.5) and (-1.0, 2.0)
+        edges, statistics = boundary_statistics(
+            label, gradient, pair_function=lambda a, b: a - b
+        )
+        self.assertEqual(statistics["sum"][3], -0.5)
+        assert_raises(ValueError, boundary_statistics, label, [[1.0]])
+
+    def test_boundary_stawiaski_directed(self):
+        label = [[1, 2]]
+        gradient = [[1.0, 0.0]]
+        for directedness, expected_result in (
+            (0.1, {(0, 1): (0.35, 0.25)}),
+            (-0.1, {(0, 1): (0.25, 0.35)}),
+        ):
+            graph = GCGraphTest(2, 1)
+            boundary_stawiaski_directed(
+                graph, numpy.asarray(label), (numpy.asarray(gradient), directedness)
+            )
+            graph.validate_nweights(self, expected_result, str(directedness))
+
     def test_boundary_difference_of_means_borders(self):
         label = [[[1, 1], [1, 1]], [[1, 2], [2, 2]], [[2, 2], [2, 2]]]
         expected_result = {(0, 1): (sys.float_info.min, sys.float_info.min)}
@@ -213,6 +304,14 @@ class GCGraphTest(GCGraph):
                 weight_back_old + weight_back,
             )
 
+    def set_nweights_array(self, nodes_from, nodes_to, weights_there, weights_back):
+        """Original graph passes the edges to the C++ implementation at once."""
+        nodes_from, nodes_to, weights_there, weights_back = numpy.broadcast_arrays(
+            nodes_from, nodes_to, weights_there, weights_back
+        )
+        for edge in zip(nodes_from, nodes_to, weights_there, weights_back):
+            self.set_nweight(*edge)
+
     def get_nweights(self):
         return self.__nweights
 
@@ -11,12 +11,14 @@ Unittest for the medpy.graphcut.graph classes.
 """
 
 # build-in modules
+import pickle
 import unittest
 
-# own modules
-from medpy.graphcut import GCGraph
-
 # third-party modules
+import numpy
+
+# own modules
+from medpy.graphcut import ArrayGraph, GCGraph, Graph, voxel_topology
 
 
 # code
@@ -25,6 +27,66 @@ class TestGraph(unittest.TestCase):
         """Test the @link medpy.graphcut.graph.Graph implementation."""
         pass
 
+    def test_ArrayGraph(self):
+        """Test the @link medpy.graphcut.graph.ArrayGraph implementation."""
+        nweights = {(1, 2): (1.0, 2.0), (2, 3): (0.5, 0.0), (1, 4): (3.0, 3.0)}
+        tweights = {3: (1.0, 2.0), 2: (0.0, 4.0)}
+        graph = Graph()
+        agraph = ArrayGraph(edges=1)
+        for g in (graph, agraph):
+            g.set_nodes(4)
+            g.set_source_nodes([1])
+            g.set_sink_nodes([4])
+            g.set_nweights(nweights)
+            g.add_tweights(tweights)
+
+        # the same public interface returns the same results
+        self.assertEqual(agraph.get_node_count(), graph.get_node_count())
+        self.assertEqual(agraph.get_nodes(), graph.get_nodes())
+        self.assertEqual(agraph.get_source_nodes(), graph.get_source_nodes())
+        self.assertEqual(agraph.get_sink_nodes(), graph.get_sink_nodes())
+        self.assertEqual(agraph.get_edges(), graph.get_edges())
+        self.assertEqual(agraph.get_nweights(), graph.get_nweights())
+        self.assertEqual(agraph.get_tweights(), graph.get_tweights())
+        self.assertFalse(agraph.inconsistent())
+        self.assertFalse(hasattr(agraph, "__dict__"))
+
+        # appending edges grows the arrays, set_nweights replaces them
+        agraph.add_nweights(numpy.arange(2, 5), numpy.arange(1, 4), 1, [1, 2, 3])
+        self.assertEqual(agraph.get_edge_count(), 6)
+        self.assertEqual(len(agraph.inconsistent()), 4)
+        # the messages match those of Graph
+        inconsistent = {(1, 2): (1, 1), (2, 1): (1, 1), (3, 6): (1, 1), (7, 5): (1, 1)}
+        for g in (graph, agraph):
+            g.set_nweights(inconsistent)
+        self.assertEqual(agraph.inconsistent(), graph.inconsistent())
+        self.assertEqual(len(agraph.inconsistent()), 5)
+        self.assertRaises(ValueError, agraph.add_nweights, [0], [1], 1, 1)
+        agraph.set_nweights(nweights)
+        self.assertEqual(agraph.get_nweights(), nweights)
+        self.assertEqual(agraph.get_nweights_arrays()[0].dtype, numpy.int32)
+
+        # pickling preserves the graph
+        restored = pickle.loads(pickle.dumps(agraph))
+        self.assertEqual(restored.get_nweights(), agraph.get_nweights())
+        self.assertEqual(restored.get_tweights(), agraph.get_tweights())
+        self.assertEqual(restored.get_source_nodes(), agraph.get_source_nodes())
+
+        # to_gcgraph shifts the node ids and keeps the weights
+        gcgraph = agraph.to_gcgraph()
+        self.assertEqual(gcgraph.get_node_count(), 4)
+        self.assertEqual(gcgraph.get_graph().get_edge(0, 1), 1.0)
+        self.assertEqual(gcgraph.get_graph().get_edge(1, 0), 2.0)
+        self.assertEqual(gcgraph.get_graph().get_edge(0, 3), 3.0)
+        gcgraph.maxflow()
+        self.assertEqual(
+            [gcgraph.get_graph().what_segment(n) for n in range(4)],
+            [gcgraph.get_graph().termtype.SOURCE]
+            + [gcgraph.get_graph().termtype.SINK] * 3,
+        )
+        agraph.add_nweights([1], [5], 1, 1)
+        self.assertRaises(ValueError, agraph.to_gcgraph)
+
     def test_GCGraph(self):
         """Test the @link medpy.graphcut.graph.GCGraph implementation."""
         # set test parmeters
@@ -63,6 +125,27 @@ class TestGraph(unittest.TestCase):
         self.assertRaises(
             ValueError, graph.set_nweights, {(0, nodes - 1): (-0.5, -1.5)}
         )
+        # set_nweights_array works as set_nweight but takes arrays as arguments
+        graph.set_nweights_array([0, 1], [nodes - 1, 2], [1, 2], 0.5)
+        self.assertEqual(graph.get_graph().get_edge(1, 2), 2)
+        self.assertEqual(graph.get_graph().get_edge(2, 1), 0.5)
+        self.assertRaises(ValueError, graph.set_nweights_array, [-1], [0], 1, 1)
+        self.assertRaises(ValueError, graph.set_nweights_array, [0], [nodes], 1, 1)
+        self.assertRaisesRegex(
+            ValueError,
+            r"Invalid node id {} in nodes_to\.".format(nodes),
+            graph.set_nweights_array,
+            [0, 1],
+            [1, nodes],
+            1,
+            1,
+        )
+        self.assertRaises(ValueError, graph.set_nweights_array, [0, 1], [1, 1], 1, 1)
+        self.assertRaises(ValueError, graph.set_nweights_array, [0], [1], [0], [1])
+        self.assertRaises(ValueError, graph.set_nweights_array, [0], [1], 1, -1)
+        self.assertRaises(
+            ValueError, graph.set_nweights_array, [0, 1], [2], [1, 2, 3], 1
+        )
         # set_tweight should accept integers resp. floats and raise an error if an invalid node id was passed or the weight is zero or negative
         graph.set_tweight(0, 1, 2)
         graph.set_tweight(nodes - 1, 0.5, 1.5)
@@ -78,11 +161,67 @@ class TestGraph(unittest.TestCase):
         self.assertRaises(ValueError, graph.set_tweights, {-1: (1, 1)})
         self.assertRaises(ValueError, graph.set_tweights, {nodes: (1, 1)})
 
+        # set_tweights_array works as set_tweight but takes arrays as arguments
+        graph = GCGraph(nodes, edges)
+        graph.set_tweights_array([0, nodes - 1], [1, -2], 0.5)
+        self.assertEqual(graph.get_graph().get_trcap(0), 0.5)
+        self.assertEqual(graph.get_graph().get_trcap(nodes - 1), -2.5)
+        self.assertRaises(ValueError, graph.set_tweights_array, [-1], 1, 1)
+        self.assertRaises(ValueError, graph.set_tweights_array, [nodes], 1, 1)
+        self.assertRaisesRegex(
+            ValueError,
+            r"Invalid node id -1 in",
+            graph.set_tweights_array,
+            [0, -1],
+            1,
+            1,
+        )
+        self.assertRaises(ValueError, graph.set_tweights_array, [0, 1], [1, 2, 3], 1)
+        # set_tweights_all sets the t-weights of all nodes in order
+        graph.set_tweights_all([(1, 0)] * nodes)
+        self.assertEqual(graph.get_graph().get_trcap(1), 1)
+        self.assertRaises(ValueError, graph.set_tweights_all, [(1, 0)] * (nodes + 1))
+
         # SOME MINOR GETTERS
         self.assertEqual(graph.get_node_count(), nodes)
         self.assertEqual(graph.get_edge_count(), edges)
         self.assertSequenceEqual(graph.get_nodes(), list(range(0, nodes)))
 
+    def test_GCGraph_reuse_trees(self):
+        """Test incremental re-cuts of the @link medpy.graphcut.graph.GCGraph."""
+        rng = numpy.random.default_rng(0)
+        topology = voxel_topology((12, 12))
+        nweights = [rng.random(len(nodes)) + 0.1 for nodes in topology.nodes_from]
+        tweights = rng.random((2, topology.node_count)) * 2
+        changed = rng.choice(topology.node_count, 10, replace=False)
+        tweights_changed = rng.random((2, 10)) * 5
+
+        def build(tweights):
+            graph = topology.graph()
+            for nodes_from, nodes_to, weights in zip(
+                topology.nodes_from, topology.nodes_to, nweights
+            ):
+                graph.set_nweights_array(nodes_from, nodes_to, weights, weights)
+            graph.set_tweights_array(
+                numpy.arange(topology.node_count), tweights[0], tweights[1]
+            )
+            return graph
+
+        # reuse_trees is ignored in the first cut
+        graph = build(tweights)
+        graph.maxflow(reuse_trees=True)
+        graph.update_tweights(changed, tweights_changed[0], tweights_changed[1])
+        flow = graph.maxflow(reuse_trees=True)
+
+        tweights[:, changed] += tweights_changed
+        expected_graph = build(tweights)
+        self.assertAlmostEqual(flow, expected_graph.maxflow())
+        self.assertSequenceEqual(
+            [graph.get_graph().what_segment(i) for i in graph.get_nodes()],
+            [expected_graph.get_graph().what_segment(i) for i in graph.get_nodes()],
+        )
+        self.assertRaises(ValueError, graph.update_tweights, [-1], 1, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
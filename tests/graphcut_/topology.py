@@ -0,0 +1,304 @@
+"""
+Unittest for the medpy.graphcut.topology methods.
+
+@author Oskar Maier
+@version r0.1.0
+@since 2026-10-16
+@status Release
+"""
+
+import tracemalloc
+import unittest
+from unittest import mock
+
+# third-party modules
+import numpy
+from numpy.testing import assert_array_equal
+
+# own modules
+from medpy.graphcut import graph_from_voxels, neighbour_slicers, voxel_topology
+from medpy.graphcut.energy_voxel import (
+    boundary_difference_exponential,
+    boundary_difference_linear,
+)
+from medpy.graphcut.topology import VoxelTopology
+
+
+class TestTopology(unittest.TestCase):
+    def test_voxel_topology(self):
+        topology = voxel_topology((2, 3))
+        self.assertEqual(topology.node_count, 6)
+        self.assertEqual(topology.edge_count, 7)
+        self.assertEqual(topology.offsets, [(1, 0), (0, 1)])
+        assert_array_equal(topology.nodes_from[0], [0, 1, 2])
+        assert_array_equal(topology.nodes_to[0], [3, 4, 5])
+        assert_array_equal(topology.nodes_from[1], [0, 1, 3, 4])
+        assert_array_equal(topology.nodes_to[1], [1, 2, 4, 5])
+        self.assertEqual(neighbour_slicers((2, 3)), topology.slicers)
+
+        # full neighbourhood covers each voxel pair once
+        topology = voxel_topology((3, 4, 5), connectivity=3)
+        self.assertEqual(len(topology.offsets), 13)
+        pairs = set()
+        for nodes_from, nodes_to in zip(topology.nodes_from, topology.nodes_to):
+            pairs.update(zip(nodes_from.tolist(), nodes_to.tolist()))
+        self.assertEqual(len(pairs), topology.edge_count)
+        self.assertFalse(any((b, a) in pairs for a, b in pairs))
+
+        self.assertRaises(ValueError, voxel_topology, (2, 3), 0)
+
+    def test_voxel_topology_stencil(self):
+        topology = voxel_topology((3, 4), [(0, 2), (-1, 0), (1, 0), (1, -1)])
+        self.assertEqual(topology.offsets, [(0, 2), (1, 0), (1, -1)])
+        self.assertEqual(topology.edge_count, 3 * 2 + 2 * 4 + 2 * 3)
+        assert_array_equal(topology.nodes_from[2], [1, 2, 3, 5, 6, 7])
+        assert_array_equal(topology.nodes_to[2], [4, 5, 6, 8, 9, 10])
+        self.assertEqual(topology.distances(), [2, 1, numpy.sqrt(2)])
+        self.assertEqual(topology.distances((2, 0.5)), [1, 2, numpy.sqrt(4.25)])
+        self.assertEqual(topology.distances(None), topology.distances())
+        self.assertEqual(
+            topology.offsets, voxel_topology((3, 4), [[0, 2], [1, 0], [1, -1]]).offsets
+        )
+
+        # offsets exceeding the image extent connect no voxels
+        topology = voxel_topology((3, 5), [(4, 0), (0, -5), (0, 1)])
+        self.assertEqual(topology.edge_count, 3 * 4)
+        for nodes_from, nodes_to in zip(topology.nodes_from, topology.nodes_to):
+            self.assertEqual(len(nodes_from), len(nodes_to))
+        self.assertEqual(len(topology.nodes_from[0]), 0)
+        gcgraph = graph_from_voxels(
+            numpy.eye(3, 5, dtype=numpy.bool_),
+            numpy.eye(3, 5, 3, dtype=numpy.bool_),
+            boundary_term=boundary_difference_linear,
+            boundary_term_args=(numpy.zeros((3, 5)), False),
+            connectivity=[(4, 0), (0, -5), (0, 1)],
+        )
+        self.assertEqual(gcgraph.get_arc_num(), 2 * 3 * 4)
+
+        self.assertRaises(ValueError, voxel_topology, (3, 4), [(0, 0)])
+        self.assertRaises(ValueError, voxel_topology, (3, 4), [(1, 0, 0)])
+
+    def test_graph_from_voxels_connectivity(self):
+        image = numpy.zeros((6, 6, 6))
+        image[1:5, 1:5, 1:5] = 1
+        fgmarkers = numpy.zeros(image.shape, numpy.bool_)
+        fgmarkers[2, 2, 2] = True
+        bgmarkers = numpy.zeros(image.shape, numpy.bool_)
+        bgmarkers[0, 0, 0] = True
+
+        for connectivity, edges in ((1, 540), (2, 1440), (3, 1940)):
+            graph = voxel_topology(image.shape, connectivity).graph()
+            gcgraph = graph_from_voxels(
+                fgmarkers,
+                bgmarkers,
+                boundary_term=boundary_difference_linear,
+                boundary_term_args=(image, (1, 1, 2)),
+                connectivity=connectivity,
+                graph=graph,
+            )
+            self.assertEqual(graph.get_edge_count(), edges)
+            # diagonal edges are weighted by the physical distance
+            if connectivity > 1:
+                self.assertAlmostEqual(gcgraph.get_edge(0, 42), 1 / numpy.sqrt(2))
+                self.assertAlmostEqual(gcgraph.get_edge(0, 7), 1 / numpy.sqrt(5))
+            gcgraph.maxflow()
+            result = [
+                gcgraph.termtype.SOURCE == gcgraph.what_segment(idx)
+                for idx in range(image.size)
+            ]
+            assert_array_equal(numpy.reshape(result, image.shape), image)
+
+        # without spacing, diagonal edges are weighted by their unit length
+        gcgraph = graph_from_voxels(
+            numpy.eye(5, dtype=numpy.bool_),
+            numpy.eye(5, k=3, dtype=numpy.bool_),
+            boundary_term=boundary_difference_exponential,
+            boundary_term_args=(numpy.zeros((5, 5)), 1.0, False),
+            connectivity=2,
+        )
+        self.assertAlmostEqual(gcgraph.get_edge(0, 1), 1)
+        self.assertAlmostEqual(gcgraph.get_edge(0, 6), 1 / numpy.sqrt(2))
+        # as does a spacing of None
+        gcgraph = graph_from_voxels(
+            numpy.eye(5, dtype=numpy.bool_),
+            numpy.eye(5, k=3, dtype=numpy.bool_),
+            boundary_term=boundary_difference_exponential,
+            boundary_term_args=(numpy.zeros((5, 5)), 1.0, None),
+            connectivity=2,
+        )
+        self.assertAlmostEqual(gcgraph.get_edge(0, 1), 1)
+        self.assertAlmostEqual(gcgraph.get_edge(0, 6), 1 / numpy.sqrt(2))
+
+        self.assertRaises(
+            AttributeError,
+            graph_from_voxels,
+            fgmarkers,
+            bgmarkers,
+            connectivity=2,
+            graph=voxel_topology(image.shape).graph(),
+        )
+
+    def test_voxel_topology_restrict(self):
+        roi = numpy.asarray([[0, 1, 1], [1, 1, 0]], dtype=numpy.bool_)
+        foreground = numpy.asarray([[1, 0, 0], [0, 0, 0]], dtype=numpy.bool_)
+        topology = voxel_topology((2, 3)).restrict(roi, foreground)
+        self.assertEqual(topology.node_count, 4)
+        self.assertEqual(topology.edge_count, 3)
+        assert_array_equal(topology.nodes_from[0], [0])
+        assert_array_equal(topology.nodes_to[0], [3])
+        assert_array_equal(topology.nodes_from[1], [0, 2])
+        assert_array_equal(topology.nodes_to[1], [1, 3])
+        voxels_from, voxels_to, nodes, exterior = topology.borders[1]
+        assert_array_equal(voxels_from, [4, 0])
+        assert_array_equal(voxels_to, [5, 1])
+        assert_array_equal(nodes, [3, 0])
+        assert_array_equal(exterior, [False, True])
+        assert_array_equal(topology.node_values([[0, 1, 2], [3, 4, 5]]), [1, 2, 3, 4])
+
+        # the memory required grows with the region, not with the image
+        band = numpy.zeros((100, 100, 100), dtype=numpy.bool_)
+        band[40:50, 40:50, 40:50] = True
+        topology = voxel_topology(band.shape)
+        tracemalloc.start()
+        try:
+            restricted = topology.restrict(band)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(restricted.edge_count, 3 * 10 * 10 * 9)
+        self.assertLess(peak, 4 * band.size)
+
+        self.assertRaises(ValueError, voxel_topology((2, 3)).restrict, roi[:1])
+        self.assertRaises(ValueError, voxel_topology((2, 3)).restrict, ~roi & roi)
+
+    def test_graph_from_voxels_roi(self):
+        image = numpy.zeros((10, 10, 10))
+        image[2:8, 2:8, 2:8] = 1
+        fgmarkers = numpy.zeros(image.shape, numpy.bool_)
+        fgmarkers[4:6, 4:6, 4:6] = True
+        bgmarkers = numpy.zeros(image.shape, numpy.bool_)
+        bgmarkers[0, 0, 0] = True
+        # a band around the object boundary
+        roi = numpy.zeros(image.shape, numpy.bool_)
+        roi[1:9, 1:9, 1:9] = True
+        roi[4:6, 4:6, 4:6] = False
+
+        topology = voxel_topology(image.shape, 2).restrict(roi, fgmarkers)
+        graph = topology.graph()
+        # the restricted topology of the graph is used as is
+        with mock.patch.object(VoxelTopology, "restrict", side_effect=AssertionError):
+            graph_from_voxels(
+                fgmarkers,
+                bgmarkers,
+                boundary_term=boundary_difference_linear,
+                boundary_term_args=(image, (1, 1, 1)),
+                connectivity=2,
+                graph=graph,
+                roi_mask=roi,
+            )
+        self.assertEqual(graph.get_node_count(), 8**3 - 2**3)
+        # the weights inside the region equal those of the unrestricted graph
+        full_graph = graph_from_voxels(
+            fgmarkers,
+            bgmarkers,
+            boundary_term=boundary_difference_linear,
+            boundary_term_args=(image, (1, 1, 1)),
+            connectivity=2,
+        )
+        node_ids = numpy.full(image.shape, -1)
+        node_ids[roi] = numpy.arange(topology.node_count)
+        for voxel, neighbour in (((1, 1, 1), (1, 2, 2)), ((3, 3, 3), (3, 4, 3))):
+            self.assertAlmostEqual(
+                graph.get_graph().get_edge(
+                    int(node_ids[voxel]), int(node_ids[neighbour])
+                ),
+                full_graph.get_edge(
+                    int(numpy.ravel_multi_index(voxel, image.shape)),
+                    int(numpy.ravel_multi_index(neighbour, image.shape)),
+                ),
+            )
+        graph.maxflow()
+        assert_array_equal(topology.segmentation(graph), image)
+
+        # the region of interest has to match the graph
+        self.assertRaises(
+            AttributeError,
+            graph_from_voxels,
+            fgmarkers,
+            bgmarkers,
+            connectivity=2,
+            graph=graph,
+            roi_mask=~roi,
+        )
+
+    def test_what_segments(self):
+        image = numpy.zeros((6, 7), numpy.bool_)
+        image[1:4, 2:6] = True
+        graph = graph_from_voxels(
+            image,
+            numpy.pad(numpy.zeros((4, 5), numpy.bool_), 1, constant_values=True),
+            boundary_term=boundary_difference_exponential,
+            boundary_term_args=(image.astype(numpy.float64), 1.0, False),
+        )
+        graph.maxflow()
+        segments = numpy.empty(graph.get_node_num(), numpy.uint8)
+        graph.what_segments(segments)
+        assert_array_equal(
+            segments, [graph.what_segment(i) for i in range(graph.get_node_num())]
+        )
+        assert_array_equal(voxel_topology(image.shape).segmentation(graph), image)
+        # the buffer must be writable, of dtype uint8 and not exceed the nodes
+        self.assertRaises(ValueError, graph.what_segments, numpy.empty(43, numpy.uint8))
+        self.assertRaises(TypeError, graph.what_segments, numpy.empty(42, bool))
+
+    def test_voxel_topology_cache(self):
+        voxel_topology.cache_clear()
+        # caching is opt-in
+        self.assertIsNot(voxel_topology((4, 5)), voxel_topology((4, 5)))
+        graph_from_voxels(numpy.eye(4, 5, dtype=bool), numpy.eye(4, 5, 1, dtype=bool))
+        self.assertEqual(voxel_topology.cache_info().currsize, 0)
+        topology = voxel_topology((4, 5), cache=True)
+        self.assertIs(topology, voxel_topology([4, 5], cache=True))
+        self.assertIsNot(topology, voxel_topology((4, 5), 2, cache=True))
+        # only the most recent topology is kept
+        self.assertEqual(voxel_topology.cache_info().currsize, 1)
+        voxel_topology.cache_clear()
+        # shared node ids can not be modified
+        self.assertFalse(topology.nodes_from[0].flags.writeable)
+        self.assertFalse(topology.nodes_to[1].flags.writeable)
+
+    def test_graph_from_voxels_reuse(self):
+        image = numpy.asarray(
+            [[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 1, 1], [0, 0, 1, 1]], dtype=float
+        )
+        fgmarkers = numpy.zeros(image.shape, numpy.bool_)
+        fgmarkers[-1, -1] = True
+        bgmarkers = numpy.zeros(image.shape, numpy.bool_)
+        bgmarkers[0, 0] = True
+        expected = image.astype(numpy.bool_)
+
+        graph = voxel_topology(image.shape).graph()
+        for _ in range(2):
+            gcgraph = graph_from_voxels(
+                fgmarkers,
+                bgmarkers,
+                boundary_term=boundary_difference_linear,
+                boundary_term_args=(image, False),
+                graph=graph,
+            )
+            self.assertIs(gcgraph, graph.get_graph())
+            gcgraph.maxflow()
+            result = numpy.zeros(image.size, dtype=numpy.bool_)
+            for idx in range(len(result)):
+                result[idx] = (
+                    0 if gcgraph.termtype.SINK == gcgraph.what_segment(idx) else 1
+                )
+            assert_array_equal(result.reshape(image.shape), expected)
+
+        self.assertRaises(
+            AttributeError,
+            graph_from_voxels,
+            fgmarkers[:-1],
+            bgmarkers[:-1],
+            graph=graph,
+        )
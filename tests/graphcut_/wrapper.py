@@ -0,0 +1,145 @@
+"""
+Unittest for the medpy.graphcut.wrapper methods.
+
+@author Oskar Maier
+@version r0.1.0
+@since 2026-10-16
+@status Release
+"""
+
+import unittest
+
+# third-party modules
+import numpy
+import scipy.ndimage
+from numpy.testing import assert_array_equal
+
+# own modules
+from medpy.core import ArgumentError
+from medpy.graphcut import graph_from_voxels, voxel_topology
+from medpy.graphcut.energy_voxel import boundary_difference_exponential
+from medpy.graphcut.wrapper import (
+    GraphcutExecutor,
+    graphcut_multiresolution,
+    graphcut_split,
+    graphcut_stawiaski,
+    graphcut_subprocesses,
+)
+
+
+class TestWrapper(unittest.TestCase):
+    def setUp(self):
+        rng = numpy.random.default_rng(0)
+        z, y, x = numpy.ogrid[:40, :40, :40]
+        self.image = (
+            (z - 20) ** 2 / 150.0 + (y - 18) ** 2 / 80.0 + (x - 21) ** 2 / 120.0 < 1
+        ).astype(float) + rng.normal(0, 0.1, (40, 40, 40))
+        self.fgmarkers = numpy.zeros(self.image.shape, numpy.bool_)
+        self.fgmarkers[18:22, 17:19, 20:22] = True
+        self.bgmarkers = numpy.zeros(self.image.shape, numpy.bool_)
+        self.bgmarkers[0] = True
+
+    def test_graphcut_multiresolution(self):
+        topology = voxel_topology(self.image.shape)
+        graph = topology.graph()
+        graph_from_voxels(
+            self.fgmarkers,
+            self.bgmarkers,
+            boundary_term=boundary_difference_exponential,
+            boundary_term_args=(self.image, 0.3, (1, 1, 1)),
+            graph=graph,
+        )
+        graph.maxflow()
+        expected = topology.segmentation(graph)
+
+        for levels in (0, 1, 2):
+            result = graphcut_multiresolution(
+                self.image,
+                self.fgmarkers,
+                self.bgmarkers,
+                boundary_difference_exponential,
+                (0.3,),
+                spacing=(1, 1, 1),
+                levels=levels,
+            )
+            assert_array_equal(result, expected)
+
+    def test_graphcut_multiresolution_arguments(self):
+        args = (self.image, self.fgmarkers, self.bgmarkers)
+        term = boundary_difference_exponential
+        self.assertRaises(
+            ArgumentError, graphcut_multiresolution, *args, term, (0.3,), levels=-1
+        )
+        self.assertRaises(
+            ArgumentError, graphcut_multiresolution, *args, term, (0.3,), factor=1
+        )
+        self.assertRaises(
+            ArgumentError,
+            graphcut_multiresolution,
+            self.image[1:],
+            self.fgmarkers,
+            self.bgmarkers,
+            term,
+            (0.3,),
+        )
+
+    def test_graphcut_split_executor(self):
+        regions = numpy.arange(self.image.size).reshape(self.image.shape) // 2 + 1
+        gradient = scipy.ndimage.gaussian_gradient_magnitude(self.image, 1) + 0.01
+        # each sub-volume requires background markers
+        bgmarkers = numpy.ones(self.image.shape, numpy.bool_)
+        bgmarkers[1:-1, 1:-1, 1:-1] = False
+        expected = graphcut_stawiaski((regions, gradient, self.fgmarkers, bgmarkers))
+
+        with GraphcutExecutor(2) as executor:
+            for _ in range(2):
+                result = graphcut_split(
+                    graphcut_stawiaski,
+                    regions,
+                    gradient,
+                    self.fgmarkers,
+                    bgmarkers,
+                    minimal_edge_length=20,
+                    overlap=4,
+                    executor=executor,
+                )
+                assert_array_equal(result, expected)
+            results = graphcut_subprocesses(
+                graphcut_stawiaski,
+                [(regions, gradient, self.fgmarkers, bgmarkers)],
+                executor=executor,
+            )
+            assert_array_equal(results[0], expected)
+
+        self.assertRaises(ArgumentError, GraphcutExecutor, -1)
+
+    def test_graphcut_split_seam_cut(self):
+        obj = self.image > 0.5
+        regions = numpy.arange(self.image.size).reshape(self.image.shape) + 1
+        gradient = scipy.ndimage.gaussian_gradient_magnitude(self.image, 0.7) + 0.01
+        fgmarkers = scipy.ndimage.binary_erosion(obj, iterations=3)
+        bgmarkers = ~scipy.ndimage.binary_dilation(obj, iterations=3)
+        expected = graphcut_stawiaski((regions, gradient, fgmarkers, bgmarkers))
+
+        with GraphcutExecutor(2) as executor:
+            results = [
+                graphcut_split(
+                    graphcut_stawiaski,
+                    regions,
+                    gradient,
+                    fgmarkers,
+                    bgmarkers,
+                    minimal_edge_length=20,
+                    overlap=12,
+                    executor=executor,
+                    seam_cut=seam_cut,
+                )
+                for seam_cut in (False, True)
+            ]
+        errors = [numpy.count_nonzero(result != expected) for result in results]
+        # the seams follow the image content instead of the sub-volume borders
+        self.assertLess(errors[1], errors[0] / 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
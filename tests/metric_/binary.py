@@ -7,9 +7,47 @@ Unittest for medpy.features.histogram.
 @status Release
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
 import numpy as np
+from scipy.ndimage import (
+    binary_erosion,
+    distance_transform_edt,
+    generate_binary_structure,
+)
 
-from medpy.metric import asd, assd, obj_asd, obj_assd
+from medpy.filter import PackedMask
+from medpy.metric import (
+    VolumeCorrelationAccumulator,
+    asd,
+    assd,
+)
+from medpy.metric import binary as binary_module
+from medpy.metric import (
+    confusion_matrix,
+    confusion_matrix_packed,
+    dc,
+    dc_multilabel,
+    hd,
+    hd95,
+    jc,
+    obj_asd,
+    obj_assd,
+    obj_fpr,
+    obj_tpr,
+    overlap_report,
+    overlap_report_multilabel,
+    precision,
+    ravd,
+    recall,
+    specificity,
+    surface_distance_cache,
+    surface_distance_report,
+    surface_metrics_multilabel,
+    volume_change_correlation,
+    volume_correlation,
+)
 
 result_min = np.asarray([1, 0]).astype(bool)
 reference_min = np.asarray([0, 1]).astype(bool)
@@ -75,3 +113,186 @@ def test_obj_assd_is_symetric():
     assd_1 = obj_assd(result_sym, reference_sym)
     assd_2 = obj_assd(reference_sym, result_sym)
     assert assd_1 == assd_2
+
+
+def test_confusion_matrix_counts():
+    cm = confusion_matrix(result_sym, reference_sym)
+    assert cm.tp == np.count_nonzero(result_sym & reference_sym)
+    assert cm.fp == np.count_nonzero(result_sym & ~reference_sym)
+    assert cm.fn == np.count_nonzero(~result_sym & reference_sym)
+    assert cm.tn == np.count_nonzero(~result_sym & ~reference_sym)
+
+
+def test_confusion_matrix_packed():
+    cm = confusion_matrix_packed(
+        np.packbits(result_sym), np.packbits(reference_sym), result_sym.size
+    )
+    assert cm == confusion_matrix(result_sym, reference_sym)
+
+
+def test_overlap_report_matches_single_metrics():
+    report = overlap_report(result_sym, reference_sym)
+    assert report["dc"] == dc(result_sym, reference_sym)
+    assert report["jc"] == jc(result_sym, reference_sym)
+    assert report["precision"] == precision(result_sym, reference_sym)
+    assert report["recall"] == recall(result_sym, reference_sym)
+    assert report["specificity"] == specificity(result_sym, reference_sym)
+    assert report["ravd"] == ravd(result_sym, reference_sym)
+
+
+def test_overlap_report_empty():
+    empty = np.zeros(4, dtype=bool)
+    report = overlap_report(empty, empty)
+    assert report["dc"] == 1.0
+    assert report["jc"] == 1.0
+    assert report["precision"] == 0.0
+    assert np.isnan(report["ravd"])
+
+
+def test_surface_distance_report_matches_single_metrics():
+    report = surface_distance_report(
+        result_sym, reference_sym, voxelspacing=(1, 2), percentiles=(50, 99.5)
+    )
+    assert report["hd"] == hd(result_sym, reference_sym, voxelspacing=(1, 2))
+    assert report["hd95"] == hd95(result_sym, reference_sym, voxelspacing=(1, 2))
+    assert report["asd"] == asd(result_sym, reference_sym, voxelspacing=(1, 2))
+    assert report["assd"] == assd(result_sym, reference_sym, voxelspacing=(1, 2))
+    assert report["hd50"] <= report["hd95"] <= report["hd99.5"] <= report["hd"]
+
+
+def test_surface_distance_cache_percentile():
+    cache = surface_distance_cache(result_sym, reference_sym)
+    assert cache.percentile(100) == cache.hd()
+    assert cache.percentile(95) == cache.hd95()
+
+
+def test_surface_distances_independent_of_image_extent():
+    padded_result = np.pad(result_sym, ((5, 20), (30, 2)))
+    padded_reference = np.pad(reference_sym, ((5, 20), (30, 2)))
+    assert surface_distance_report(
+        padded_result, padded_reference, voxelspacing=(1, 2)
+    ) == surface_distance_report(result_sym, reference_sym, voxelspacing=(1, 2))
+
+
+def test_surface_distance_methods_are_equal():
+    for method in ("kdtree", "auto"):
+        assert surface_distance_report(
+            result_sym, reference_sym, voxelspacing=(1, 2.5), method=method
+        ) == surface_distance_report(
+            result_sym, reference_sym, voxelspacing=(1, 2.5), method="edt"
+        )
+        assert asd(result_min, reference_min, method=method) == 1.0
+
+
+labels_result = np.asarray([[0, 1, 1, 0], [0, 1, 1, 0], [3, 3, 0, 0], [3, 3, 0, 7]])
+labels_reference = np.asarray([[1, 1, 0, 0], [1, 1, 0, 0], [3, 3, 0, 0], [0, 3, 3, 0]])
+
+
+def test_dc_multilabel_matches_binary_dc():
+    dcs = dc_multilabel(labels_result, labels_reference)
+    assert sorted(dcs) == [1, 3, 7]
+    for lid, value in dcs.items():
+        assert value == dc(labels_result == lid, labels_reference == lid)
+
+
+def test_overlap_report_multilabel_matches_binary_report():
+    reports = overlap_report_multilabel(labels_result, labels_reference, labels=[3, 5])
+    assert reports[3] == overlap_report(labels_result == 3, labels_reference == 3)
+    assert reports[5]["dc"] == 1.0
+
+
+def test_surface_metrics_multilabel_matches_binary_report():
+    reports = surface_metrics_multilabel(
+        labels_result, labels_reference, voxelspacing=(1, 2)
+    )
+    for lid in (1, 3):
+        assert reports[lid] == surface_distance_report(
+            labels_result == lid, labels_reference == lid, voxelspacing=(1, 2)
+        )
+    assert np.isnan(reports[7]["hd"])
+
+
+def test_obj_tpr_fpr_multiple_overlaps():
+    result = np.asarray([1, 0, 1, 0, 1, 1, 1])
+    reference = np.asarray([1, 1, 1, 0, 1, 0, 1])
+    for matching in ("greedy", "maximum"):
+        assert obj_tpr(result, reference, matching=matching) == 2 / 3.0
+        assert obj_fpr(result, reference, matching=matching) == 1 / 3.0
+
+
+def test_obj_maximum_matching_is_at_least_greedy():
+    rng = np.random.default_rng(0)
+    result = rng.random((20, 20)) > 0.6
+    reference = rng.random((20, 20)) > 0.6
+    assert obj_tpr(result, reference, matching="maximum") >= obj_tpr(
+        result, reference, matching="greedy"
+    )
+
+
+def test_obj_assd_executor():
+    with ThreadPoolExecutor(2) as executor:
+        assert obj_assd(result_sym, reference_sym, executor=executor) == obj_assd(
+            result_sym, reference_sym
+        )
+        assert obj_asd(result_sym, reference_sym, executor=executor) == obj_asd(
+            result_sym, reference_sym
+        )
+
+
+def test_volume_correlation_accumulator():
+    rng = np.random.default_rng(0)
+    results = [rng.random((8, 8)) > rng.random() for _ in range(12)]
+    references = [rng.random((8, 8)) > rng.random() for _ in range(12)]
+    accumulator = VolumeCorrelationAccumulator()
+    for result, reference in zip(results, references):
+        accumulator.update(result, reference)
+    assert accumulator.n == 12
+    np.testing.assert_allclose(
+        accumulator.finalize(), volume_correlation(results, references)
+    )
+    np.testing.assert_allclose(
+        accumulator.finalize(change=True),
+        volume_change_correlation(iter(results), iter(references)),
+    )
+
+
+def test_metrics_accept_packed_masks():
+    packed_result = PackedMask(result_sym)
+    packed_reference = PackedMask(reference_sym)
+    assert confusion_matrix(packed_result, packed_reference) == confusion_matrix(
+        result_sym, reference_sym
+    )
+    assert dc(packed_result, packed_reference) == dc(result_sym, reference_sym)
+    assert surface_distance_report(
+        packed_result, packed_reference
+    ) == surface_distance_report(result_sym, reference_sym)
+
+
+def test_surface_distances_match_erosion_borders():
+    rng = np.random.default_rng(0)
+    result = rng.random((6, 7, 5)) > 0.4
+    reference = rng.random((6, 7, 5)) > 0.4
+    footprint = generate_binary_structure(3, 2)
+    result_border = result ^ binary_erosion(result, structure=footprint)
+    reference_border = reference ^ binary_erosion(reference, structure=footprint)
+    sds = distance_transform_edt(~reference_border, sampling=(1, 2, 3))[result_border]
+    for method in ("edt", "kdtree"):
+        assert (
+            asd(
+                result, reference, voxelspacing=(1, 2, 3), connectivity=2, method=method
+            )
+            == sds.mean()
+        )
+
+
+def test_surface_distance_cache_extracts_borders_once():
+    border_voxels = vars(binary_module)["__border_voxels"]
+    with mock.patch.dict(
+        vars(binary_module), {"__border_voxels": mock.Mock(wraps=border_voxels)}
+    ):
+        cache = surface_distance_cache(result_sym, reference_sym, voxelspacing=(1, 2))
+        assert 2 == vars(binary_module)["__border_voxels"].call_count
+    assert cache.asd() == asd(result_sym, reference_sym, voxelspacing=(1, 2))
+    assert cache.reference_distances.mean() == asd(
+        reference_sym, result_sym, voxelspacing=(1, 2)
+    )